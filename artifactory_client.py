@@ -0,0 +1,268 @@
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+
+from structure import REPO_CONFIGS, RepositoryStructure
+from translator import Translator
+
+# Status codes worth another attempt after a backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods resent after a read timeout, when the server may have applied the
+# first attempt. POST replaces a repo's whole configuration, so applying it
+# twice is harmless; a second PUT of a created repo would fail.
+RESEND_AFTER_READ_TIMEOUT = frozenset({"GET", "HEAD", "POST", "DELETE"})
+
+
+class RateLimiter:
+    """Token bucket shared by every worker; acquire() blocks until a request may start."""
+
+    def __init__(self, rps: Optional[float], burst: Optional[int] = None):
+        self.rps = rps
+        self.capacity = burst or max(1, int(rps or 1))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.rps:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rps)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rps
+            time.sleep(wait_for)
+
+
+class PushResult(NamedTuple):
+    section: str
+    package_type: str
+    key: str
+    # "PUT" to create, "POST" to update
+    method: str
+    status: Optional[int]
+    attempts: int
+    elapsed_ms: float
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ArtifactoryClient:
+    """Repositories REST API client with one pooled session shared by a bounded worker pool.
+
+    Every request passes the shared rate limiter, and 429/5xx responses or
+    connection errors are retried with exponential backoff and jitter,
+    honouring Retry-After when the server sends it. Read timeouts are only
+    retried for the methods in RESEND_AFTER_READ_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        max_workers: int = 16,
+        rps: Optional[float] = None,
+        retries: int = 4,
+        backoff: float = 0.25,
+        timeout: float = 30.0,
+        session: Optional[requests.Session] = None,
+        max_delay: float = 60.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        # Longest sleep between attempts, whatever Retry-After asks for
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.limiter = RateLimiter(rps)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        if token:
+            session.headers["Authorization"] = f"Bearer {token}"
+        self.session = session
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "ArtifactoryClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_delay)
+            except ValueError:
+                pass
+        return min(self.backoff * (2 ** attempt) * (0.5 + random.random() / 2), self.max_delay)
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Tuple[requests.Response, int]:
+        """Send one request with rate limiting and retries; returns the last response and attempt count.
+
+        Raises the last requests.RequestException if every attempt failed to connect,
+        or the first read timeout of a method not in RESEND_AFTER_READ_TIMEOUT;
+        its `attempts` attribute holds the number of requests sent.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.ReadTimeout as e:
+                if method not in RESEND_AFTER_READ_TIMEOUT or attempt == self.retries:
+                    e.attempts = attempt + 1
+                    raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    e.attempts = attempt + 1
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response, attempt + 1
+                response.close()
+            time.sleep(self._delay(attempt, response))
+        raise AssertionError("unreachable")
+
+    def repository_keys(self) -> Set[str]:
+        response, _ = self.request("GET", "/api/repositories")
+        response.raise_for_status()
+        return {repo["key"] for repo in response.json()}
+
+    def get_repository(self, key: str) -> Dict[str, Any]:
+        response, _ = self.request("GET", f"/api/repositories/{key}")
+        response.raise_for_status()
+        return response.json()
+
+    def _push_one(self, section: str, package_type: str, key: str, method: str,
+                  payload: Dict[str, Any]) -> PushResult:
+        start = time.perf_counter()
+        try:
+            response, attempts = self.request(method, f"/api/repositories/{key}", json=payload)
+        except requests.RequestException as e:
+            elapsed = (time.perf_counter() - start) * 1000
+            return PushResult(section, package_type, key, method, None, getattr(e, "attempts", 1), elapsed,
+                              type(e).__name__)
+        elapsed = (time.perf_counter() - start) * 1000
+        error = None
+        if response.status_code >= 400:
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            # An attempt answered with a 5xx may still have created the repo
+            if method == "PUT" and attempts > 1 and response.status_code == 400 and "already exists" in response.text:
+                error = None
+        response.close()
+        return PushResult(section, package_type, key, method, response.status_code, attempts, elapsed, error)
+
+    def push(
+        self,
+        repos: Iterable[Tuple[str, str, BaseModel]],
+        translator: Optional[Translator] = None,
+        existing: Optional[Set[str]] = None,
+    ) -> Iterator[PushResult]:
+        """Create or update (section, package_type, repo) entries, yielding results as they finish.
+
+        Repos whose key is in `existing` are updated with POST and the rest are
+        created with PUT. `existing` defaults to one listing of the instance.
+        At most 2 x max_workers requests are queued at a time, so `repos` may be
+        a lazy iterator over a large inventory.
+        """
+        if translator is None:
+            translator = Translator.from_file()
+        if existing is None:
+            existing = self.repository_keys()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = set()
+            for section, package_type, repo in repos:
+                payload = translator.model_to_rest(repo, section, package_type).values
+                payload["key"] = repo.key
+                method = "POST" if repo.key in existing else "PUT"
+                pending.add(pool.submit(self._push_one, section, package_type, repo.key, method, payload))
+                if len(pending) >= 2 * self.max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def push_structure(self, structure: RepositoryStructure, **options: Any) -> Iterator[PushResult]:
+        """push() every repo of a structure; locals and remotes go before the virtuals that include them."""
+        if options.get("existing") is None:
+            # One listing for both passes
+            options["existing"] = self.repository_keys()
+        def repos() -> Iterator[Tuple[str, str, BaseModel]]:
+            for section in ("local_repositories", "remote_repositories"):
+                container = getattr(structure, section)
+                for package_type in REPO_CONFIGS[section]:
+                    for repo in getattr(container, package_type).values():
+                        yield section, package_type, repo
+
+        yield from self.push(repos(), **options)
+        virtuals = [
+            ("virtual_repositories", package_type, repo)
+            for package_type in REPO_CONFIGS["virtual_repositories"]
+            for repo in getattr(structure.virtual_repositories, package_type).values()
+        ]
+        yield from self.push(virtuals, **options)
+
+
+def summarize(results: Iterable[PushResult]) -> Dict[str, Any]:
+    results = list(results)
+    failed: List[PushResult] = [r for r in results if not r.ok]
+    return {
+        "pushed": len(results) - len(failed),
+        "failed": len(failed),
+        "retried": sum(1 for r in results if r.attempts > 1),
+        "errors": [f"{r.key}: {r.error}" for r in failed],
+    }
+
+
+if __name__ == "__main__":
+    import os
+
+    from loader import load_repository_structure
+
+    parser = argparse.ArgumentParser(description="Create or update every repository of an export")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--url", required=True, help="Artifactory base URL, e.g. https://host/artifactory")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=None, help="requests per second cap")
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        structure = load_repository_structure(fp)
+    start = time.perf_counter()
+    results = []
+    with ArtifactoryClient(args.url, token=os.environ.get("ARTIFACTORY_TOKEN"),
+                           max_workers=args.workers, rps=args.rps) as client:
+        for result in client.push_structure(structure):
+            results.append(result)
+            if not result.ok:
+                print(f"{result.method} {result.key}: {result.error}")
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+    print(f"{summary['pushed']} pushed, {summary['failed']} failed, {summary['retried']} retried "
+          f"in {elapsed:.1f}s ({len(results) / elapsed:.0f} repos/s)")
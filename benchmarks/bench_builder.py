@@ -0,0 +1,66 @@
+"""Throughput of RepositoryStructureBuilder vs looping over the create_*_repo_json factories.
+
+Run from the repository root:  python -m benchmarks.bench_builder [count ...]
+"""
+import sys
+import time
+
+import structure
+from structure import RepositoryStructure, RepositoryStructureBuilder
+
+# (rclass, package_type, factory) covering every factory structure.py has
+FACTORIES = (
+    ("local", "docker", structure.create_docker_repo_json),
+    ("local", "maven", structure.create_maven_repo_json),
+    ("local", "npm", structure.create_npm_repo_json),
+    ("local", "generic", structure.create_generic_repo_json),
+    ("local", "helm", structure.create_helm_repo_json),
+    ("local", "pypi", structure.create_pypi_repo_json),
+    ("local", "nuget", structure.create_nuget_repo_json),
+    ("local", "alpine", structure.create_alpine_repo_json),
+    ("local", "rpm", structure.create_rpm_repo_json),
+    ("local", "debian", structure.create_debian_repo_json),
+    ("virtual", "chef", structure.create_chef_virtual_repo_json),
+    ("virtual", "docker", structure.create_docker_virtual_repo_json),
+)
+
+
+def _rows(count):
+    for i in range(count):
+        rclass, package_type, factory = FACTORIES[i % len(FACTORIES)]
+        yield rclass, package_type, factory, {"key": f"{package_type}-{rclass}-{i}", "description": "bench"}
+
+
+def run_factories(count: int) -> RepositoryStructure:
+    merged = RepositoryStructure()
+    for rclass, package_type, factory, fields in _rows(count):
+        single = factory(repo_name=fields["key"], **fields)
+        section = "local_repositories" if rclass == "local" else "virtual_repositories"
+        getattr(getattr(merged, section), package_type).update(getattr(getattr(single, section), package_type))
+    return merged
+
+
+def run_builder(count: int) -> RepositoryStructure:
+    builder = RepositoryStructureBuilder()
+    builder.add_rows(
+        dict(fields, rclass=rclass, package_type=package_type)
+        for rclass, package_type, _, fields in _rows(count)
+    )
+    return builder.build()
+
+
+def main(counts) -> None:
+    print(f"{'repos':>7} {'factories/s':>12} {'builder/s':>10} {'speedup':>8}")
+    for count in counts:
+        start = time.perf_counter()
+        expected = run_factories(count)
+        factories = time.perf_counter() - start
+        start = time.perf_counter()
+        built = run_builder(count)
+        builder = time.perf_counter() - start
+        assert built == expected
+        print(f"{count:>7} {count / factories:>12.0f} {count / builder:>10.0f} {factories / builder:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(c) for c in sys.argv[1:]] or [1000, 10000])
@@ -0,0 +1,56 @@
+"""Repeated exports through ConfigCache against a local stub server.
+
+Run from the repository root:  python -m benchmarks.bench_cache [factor] [latency_ms]
+
+Runs a cold export, a warm one inside the TTL, one past the TTL where every
+config is revalidated with If-None-Match, and one after 5% of the configs
+changed on the server.
+"""
+import io
+import os
+import sys
+import tempfile
+
+from artifactory_client import ArtifactoryClient
+from benchmarks.bench_exporter import _seed
+from benchmarks.common import read_export, scaled_export_file
+from benchmarks.stub_artifactory import running_stub
+from config_cache import ConfigCache
+from exporter import export_inventory
+from translator import Translator
+
+
+def main(factor: int, latency_ms: float) -> None:
+    translator = Translator.from_file()
+    with scaled_export_file(factor) as (path, _):
+        export = read_export(path)
+    fd, db_path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    runs = [("cold", 3600), ("within ttl", 3600), ("past ttl", 0), ("5% changed", 0)]
+    try:
+        with running_stub(latency_ms=latency_ms) as stub:
+            _seed(stub, export, translator)
+            print(f"{len(stub.repos)} repos, stub latency {latency_ms:.0f} ms/request")
+            print(f"{'run':<12} {'seconds':>8} {'hit rate':>9} {'MiB saved':>10} {'MiB fetched':>12} {'changed':>8}")
+            for name, ttl in runs:
+                if name == "5% changed":
+                    for key in list(stub.repos)[::20]:
+                        stub.repos[key]["description"] = "changed"
+                cache = ConfigCache(db_path, ttl=ttl)
+                with ArtifactoryClient(stub.url, max_workers=32) as client:
+                    stats = export_inventory(client, io.StringIO(), translator, cache=cache)
+                cache.close()
+                s = cache.stats
+                print(f"{name:<12} {stats.seconds:>8.2f} {s.hit_rate:>9.1%} {s.bytes_saved / 2**20:>10.2f} "
+                      f"{s.bytes_fetched / 2**20:>12.2f} {s.changed:>8}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20.0,
+    )
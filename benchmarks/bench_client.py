@@ -0,0 +1,45 @@
+"""Bulk create/update throughput of ArtifactoryClient against a local stub server.
+
+Run from the repository root:  python -m benchmarks.bench_client [factor] [latency_ms]
+
+Each stub request sleeps `latency_ms` to stand in for a real instance, and 2%
+of requests are throttled with 429 to exercise the retry path.
+"""
+import sys
+import time
+
+import loader
+from artifactory_client import ArtifactoryClient, summarize
+from benchmarks.common import scaled_export_file
+from benchmarks.stub_artifactory import running_stub
+
+
+def _push(structure, url: str, workers: int):
+    start = time.perf_counter()
+    with ArtifactoryClient(url, max_workers=workers, backoff=0.05) as client:
+        results = list(client.push_structure(structure))
+    return results, time.perf_counter() - start
+
+
+def main(factor: int, latency_ms: float) -> None:
+    with scaled_export_file(factor) as (path, _):
+        with open(path) as fp:
+            structure = loader.load_repository_structure(fp)
+    print(f"stub latency {latency_ms:.0f} ms/request, 2% throttled")
+    print(f"{'workers':>8} {'method':>7} {'repos':>6} {'seconds':>8} {'repos/s':>8} {'retried':>8} {'failed':>7}")
+    for workers in (1, 8, 32):
+        with running_stub(latency_ms=latency_ms, throttle_rate=0.02, seed=0) as stub:
+            # First pass creates every repo, the second updates them
+            for method in ("PUT", "POST"):
+                results, elapsed = _push(structure, stub.url, workers)
+                summary = summarize(results)
+                assert all(r.method == method for r in results)
+                print(f"{workers:>8} {method:>7} {len(results):>6} {elapsed:>8.2f} {len(results) / elapsed:>8.0f} "
+                      f"{summary['retried']:>8} {summary['failed']:>7}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20.0,
+    )
@@ -0,0 +1,38 @@
+"""Memory per repo of RepositoryStructure models vs CompactInventory.
+
+Run from the repository root:  python -m benchmarks.bench_compact [factor]
+"""
+import gc
+import sys
+import tracemalloc
+
+import loader
+from benchmarks.common import scaled_export_file
+from compact import CompactInventory
+
+
+def _retained(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained
+
+
+def main(factor: int) -> None:
+    with scaled_export_file(factor) as (path, _):
+        with open(path) as fp:
+            structure, model_bytes = _retained(lambda: loader.load_repository_structure(fp))
+        del structure
+        with open(path) as fp:
+            inventory, compact_bytes = _retained(lambda: CompactInventory.from_export(fp))
+    repos = len(inventory)
+    print(f"{repos} repos (nonprod export x{factor}), {inventory.profile_count} shared profiles")
+    print(f"{'pydantic models':>16} {model_bytes / repos:>7.0f} B/repo {model_bytes / 2**20:>7.1f} MiB")
+    print(f"{'compact':>16} {compact_bytes / repos:>7.0f} B/repo {compact_bytes / 2**20:>7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
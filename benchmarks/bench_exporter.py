@@ -0,0 +1,56 @@
+"""Full-inventory export time against a local stub server, and a round-trip check.
+
+Run from the repository root:  python -m benchmarks.bench_exporter [factor] [latency_ms]
+
+The stub is seeded with the REST payloads of the nonprod export scaled by
+`factor`; each exported file must parse back to exactly the seeded export.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from artifactory_client import ArtifactoryClient
+from benchmarks.common import read_export, scaled_export_file
+from benchmarks.stub_artifactory import running_stub
+from exporter import export_inventory
+from translator import Translator
+
+
+def _seed(stub, export, translator: Translator) -> int:
+    for section, types in export.items():
+        for package_type, repos in types.items():
+            for repo in repos.values():
+                stub.repos[repo["key"]] = translator.model_to_rest(repo, section, package_type).values
+    return len(stub.repos)
+
+
+def main(factor: int, latency_ms: float) -> None:
+    translator = Translator.from_file()
+    with scaled_export_file(factor) as (path, _):
+        export = read_export(path)
+    print(f"stub latency {latency_ms:.0f} ms/request")
+    print(f"{'workers':>8} {'repos':>6} {'seconds':>8} {'repos/s':>8} {'round trip':>11}")
+    for workers in (1, 8, 32, 64):
+        with running_stub(latency_ms=latency_ms) as stub:
+            _seed(stub, export, translator)
+            fd, out_path = tempfile.mkstemp(suffix=".json")
+            try:
+                start = time.perf_counter()
+                with ArtifactoryClient(stub.url, max_workers=workers) as client, os.fdopen(fd, "w") as out:
+                    stats = export_inventory(client, out, translator)
+                elapsed = time.perf_counter() - start
+                with open(out_path) as fp:
+                    same = json.load(fp) == export
+            finally:
+                os.remove(out_path)
+        print(f"{workers:>8} {stats.repos:>6} {elapsed:>8.2f} {stats.repos / elapsed:>8.0f} "
+              f"{'identical' if same else 'DIFFERS':>11}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20.0,
+    )
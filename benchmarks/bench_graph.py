@@ -0,0 +1,50 @@
+"""Round trips and time to resolve onboarding owners and groups against a local Graph stub.
+
+Run from the repository root:  python -m benchmarks.bench_graph [owners] [latency_ms]
+
+Compares one GET per owner with GraphResolver's $batch lookups, then repeats
+the batched run to show the cache. 2% of batched sub-requests are throttled.
+"""
+import sys
+import time
+
+import requests
+
+from benchmarks.stub_graph import FakeCredential, running_stub
+from graph_resolver import USER_FIELDS, GraphResolver
+
+
+def main(owners: int, latency_ms: float) -> None:
+    with running_stub(users=max(owners, 100), groups=50, latency_ms=latency_ms, throttle_rate=0.02) as stub:
+        upns = [f"user{i}@example.com" for i in range(owners)]
+        groups = [f"team-{i}" for i in range(50)]
+        print(f"{owners} owners + {len(groups)} groups and their members, stub latency {latency_ms:.0f} ms")
+        print(f"{'run':<18} {'round trips':>12} {'seconds':>8} {'tokens':>7}")
+
+        session = requests.Session()
+        start = time.perf_counter()
+        before = stub.requests
+        for upn in upns:
+            session.get(f"{stub.url}/users/{upn}?$select={USER_FIELDS}",
+                        headers={"Authorization": "Bearer t"}).raise_for_status()
+        print(f"{'one GET per owner':<18} {stub.requests - before:>12} {time.perf_counter() - start:>8.2f} {'-':>7}")
+        session.close()
+
+        credential = FakeCredential()
+        with GraphResolver(credential, base_url=stub.url, max_workers=8) as resolver:
+            for run in ("batched, cold", "batched, cached"):
+                start = time.perf_counter()
+                before = stub.requests
+                users = resolver.resolve_users(upns)
+                found = resolver.resolve_groups(groups)
+                resolver.group_members(group["id"] for group in found.values() if group)
+                assert all(users.values())
+                print(f"{run:<18} {stub.requests - before:>12} {time.perf_counter() - start:>8.2f} "
+                      f"{credential.calls:>7}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20.0,
+    )
@@ -0,0 +1,37 @@
+"""Cold import and first-use times of structure.py, each in a fresh interpreter.
+
+Run from the repository root:  python -m benchmarks.bench_import [runs]
+
+Reports the median of `runs` interpreters per case, so class creation done
+at import and class creation deferred to first use can be told apart.
+"""
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import ROOT
+
+CASES = (
+    ("import pydantic", "import pydantic"),
+    ("import structure", "import structure"),
+    ("one config class", "import structure; structure.MavenRepoConfig(key='a')"),
+    ("factory", "import structure; structure.create_maven_repo_json(repo_name='a', key='a')"),
+    ("RepositoryStructure()", "import structure; structure.RepositoryStructure()"),
+    ("import loader", "import loader"),
+)
+
+
+def _time(code: str) -> float:
+    script = f"import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1])
+
+
+def main(runs: int) -> None:
+    print(f"{'case':<24} {'median ms':>10}")
+    for name, code in CASES:
+        print(f"{name:<24} {statistics.median(_time(code) for _ in range(runs)) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 9)
@@ -0,0 +1,73 @@
+"""API calls per polling cycle of GitHubIntake against a local GitHub stub.
+
+Run from the repository root:  python -m benchmarks.bench_intake [repos] [issues_per_repo]
+
+Each cycle polls every intake repo; before the fourth, ten requests are
+updated. The first poll after a repo changes lists from its new cursor, and
+later idle polls of that URL are 304s that are not charged. A naive poller that lists every issue page each cycle is shown for
+comparison.
+"""
+import json
+import os
+import sys
+import tempfile
+
+import requests
+
+from benchmarks.stub_github import running_stub
+from github_intake import CursorStore, GitHubIntake, _next_link
+from structure import RepositoryStructureBuilder
+
+
+def _body(repo_index: int, issue_index: int) -> str:
+    row = {"rclass": "local", "package_type": "generic", "key": f"team{repo_index}-generic-{issue_index}"}
+    return f"Please create:\n\n```json\n{json.dumps(row)}\n```\n"
+
+
+def _naive_cycle(url: str, repos) -> int:
+    calls = 0
+    with requests.Session() as session:
+        for repo in repos:
+            next_url = f"{url}/repos/{repo}/issues?labels=onboarding&state=all&per_page=100"
+            while next_url:
+                response = session.get(next_url)
+                calls += 1
+                next_url = _next_link(response)
+    return calls
+
+
+def main(repo_count: int, issues_per_repo: int) -> None:
+    with running_stub() as stub:
+        repos = [f"org/intake-{r}" for r in range(repo_count)]
+        for r, repo in enumerate(repos):
+            for i in range(issues_per_repo):
+                stub.add_issue(repo, f"Onboard repo {i}", _body(r, i))
+        fd, cursor_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(cursor_path)
+        try:
+            print(f"{repo_count} intake repos x {issues_per_repo} requests")
+            print(f"{'cycle':<22} {'calls':>6} {'charged':>8} {'rows':>6} {'naive calls':>12}")
+            for name in ("first poll", "idle", "idle", "10 updated", "idle", "idle"):
+                if name == "10 updated":
+                    for n in range(10):
+                        stub.update_issue(repos[n % repo_count], n + 1, _body(n % repo_count, n))
+                # A fresh intake per cycle, as in separate runs sharing the cursor file
+                intake = GitHubIntake(repos, CursorStore(cursor_path), base_url=stub.url)
+                builder = RepositoryStructureBuilder()
+                before, charged = stub.requests, stub.charged
+                rows = [item.row for item in intake.rows() if item.row is not None]
+                builder.add_rows(rows)
+                calls, charged = stub.requests - before, stub.charged - charged
+                naive = _naive_cycle(stub.url, repos)
+                print(f"{name:<22} {calls:>6} {charged:>8} {len(rows):>6} {naive:>12}")
+        finally:
+            if os.path.exists(cursor_path):
+                os.remove(cursor_path)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 250,
+    )
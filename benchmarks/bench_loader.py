@@ -0,0 +1,51 @@
+"""Peak RSS and wall time of the full-load path vs the streaming loader.
+
+Run from the repository root:  python -m benchmarks.bench_loader [factor ...]
+
+Each measurement runs in a fresh interpreter so ru_maxrss reflects only that
+load path.
+"""
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ROOT, scaled_export_file
+
+MODES = ("full", "stream-structure", "stream-iter")
+
+
+def _measure(mode: str, path: str) -> None:
+    import loader
+
+    start = time.perf_counter()
+    with open(path) as fp:
+        if mode == "full":
+            loader.load_repository_structure_full(fp)
+        elif mode == "stream-structure":
+            loader.load_repository_structure(fp)
+        else:
+            for _ in loader.iter_repositories(fp):
+                pass
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is KiB on Linux
+    print(f"{elapsed:.3f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}")
+
+
+def main(factors) -> None:
+    print(f"{'factor':>6} {'repos':>8} {'mode':>17} {'seconds':>8} {'peak MiB':>9}")
+    for factor in factors:
+        with scaled_export_file(factor) as (path, repos):
+            for mode in MODES:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_loader", "--measure", mode, path],
+                    cwd=ROOT, check=True, capture_output=True, text=True,
+                ).stdout.split()
+                print(f"{factor:>6} {repos:>8} {mode:>17} {float(out[0]):>8.3f} {float(out[1]):>9.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        _measure(sys.argv[2], sys.argv[3])
+    else:
+        main([int(f) for f in sys.argv[1:]] or [1, 10, 50])
@@ -0,0 +1,41 @@
+"""Old (.dict() + stdlib json) vs new (serialization module) load and dump times.
+
+Run from the repository root:  python -m benchmarks.bench_serialization [factor] [rounds]
+"""
+import json
+import sys
+import warnings
+
+import serialization
+from benchmarks.common import scaled_export_file, timer
+from structure import RepositoryStructure
+
+
+def main(factor: int, rounds: int) -> None:
+    warnings.simplefilter("ignore", DeprecationWarning)
+    best = {}
+    with scaled_export_file(factor) as (path, repos):
+        with open(path, "rb") as fp:
+            raw = fp.read()
+        for _ in range(rounds):
+            results = {}
+            with timer(results, "load old"):
+                structure = RepositoryStructure(**json.loads(raw))
+            with timer(results, "load new"):
+                loaded = serialization.load_json(raw)
+            with timer(results, "dump old"):
+                old = json.dumps(structure.dict()).encode()
+            with timer(results, "dump new"):
+                new = serialization.dump_json(structure)
+            assert loaded == structure and json.loads(old) == json.loads(new)
+            for name, seconds in results.items():
+                best[name] = min(seconds, best.get(name, seconds))
+    print(f"nonprod export x{factor} ({repos} repos, {len(raw) / 2**20:.1f} MiB), "
+          f"pydantic {'2' if serialization.PYDANTIC_V2 else '1'}, best of {rounds}")
+    for op in ("load", "dump"):
+        old, new = best[f"{op} old"], best[f"{op} new"]
+        print(f"{op}: old {old:.3f}s  new {new:.3f}s  {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -0,0 +1,157 @@
+"""Timings of the structure.py hot paths on synthetic inventories, written as JSON.
+
+Run from the repository root:
+    python -m benchmarks.bench_suite [--sizes 1000 10000 100000] [--out results.json] [--compare old.json]
+
+Results go to benchmarks/bench_results.json by default.
+
+Every benchmark runs on the same deterministic synthetic inventory per size
+(see benchmarks/synthetic.py) and reports the best of --repeat runs. With
+--compare, each result is printed next to the matching one of an earlier
+results file.
+"""
+import argparse
+import inspect
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pydantic
+
+import loader
+import serialization
+import structure
+from benchmarks.common import ROOT
+from benchmarks.synthetic import InventoryProfile, generate
+from translator import MODEL_FIELD_ALIASES
+
+# Written inside the tree but git-ignored, so runs never show up as changes; --out overrides it
+DEFAULT_OUT = os.path.join(ROOT, "benchmarks", "bench_results.json")
+
+
+def _factories() -> Dict[Tuple[str, str], Tuple[Callable, frozenset]]:
+    # (section, package_type) -> (create_*_repo_json, its parameter names)
+    found = {}
+    for name, factory in vars(structure).items():
+        if not (name.startswith("create_") and name.endswith("_repo_json")):
+            continue
+        package_type = name[len("create_"):-len("_repo_json")]
+        section = "local_repositories"
+        if package_type.endswith("_virtual"):
+            package_type, section = package_type[:-len("_virtual")], "virtual_repositories"
+        found[(section, package_type)] = (factory, frozenset(inspect.signature(factory).parameters))
+    return found
+
+
+def _best(repeat: int, run: Callable[[], Any]) -> Tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_size(size: int, repeat: int, profile: InventoryProfile) -> List[Dict[str, Any]]:
+    export = generate(size, seed=size, profile=profile)
+    text = json.dumps(export)
+    results = []
+    # Import and build every model class before timing, so the first factory
+    # does not pay for class creation
+    structure.RepositoryStructure()
+
+    def record(name: str, seconds: float, repos: int) -> None:
+        results.append({
+            "size": size,
+            "benchmark": name,
+            "repos": repos,
+            "seconds": round(seconds, 6),
+            "us_per_repo": round(seconds / repos * 1e6, 3) if repos else None,
+        })
+
+    for (section, package_type), (factory, params) in sorted(_factories().items()):
+        rows = []
+        for repo in export.get(section, {}).get(package_type, {}).values():
+            fields = {MODEL_FIELD_ALIASES.get(k, k): v for k, v in repo.items()}
+            rows.append({k: v for k, v in fields.items() if k in params})
+        if not rows:
+            continue
+        seconds, _ = _best(repeat, lambda: [factory(repo_name=row["key"], **row) for row in rows])
+        record(f"factory.{factory.__name__}", seconds, len(rows))
+
+    seconds, loaded = _best(repeat, lambda: loader.load_repository_structure(io.StringIO(text)))
+    repos = sum(
+        len(getattr(getattr(loaded, section), package_type))
+        for section, types in structure.REPO_CONFIGS.items() for package_type in types
+    )
+    record("load.stream", seconds, repos)
+    seconds, _ = _best(repeat, lambda: loader.load_repository_structure_full(io.StringIO(text)))
+    record("load.full", seconds, repos)
+
+    to_dict = loaded.model_dump if hasattr(loaded, "model_dump") else loaded.dict
+    seconds, _ = _best(repeat, to_dict)
+    record("serialize.dict", seconds, repos)
+    seconds, _ = _best(repeat, lambda: structure.to_json(loaded, indent=None))
+    record("serialize.to_json", seconds, repos)
+    seconds, data = _best(repeat, lambda: serialization.dump_json(loaded))
+    record("serialize.dump_json", seconds, repos)
+
+    seconds, restored = _best(repeat, lambda: serialization.load_json(serialization.dump_json(loaded)))
+    assert restored == loaded, "round trip changed the structure"
+    record("roundtrip.json", seconds, repos)
+    return results
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    profile = InventoryProfile.from_file()
+    previous = {}
+    if args.compare:
+        with open(args.compare) as fp:
+            previous = {(r["size"], r["benchmark"]): r for r in json.load(fp)["results"]}
+
+    results = []
+    print(f"{'size':>7} {'benchmark':<42} {'seconds':>9} {'us/repo':>9}" + (f" {'before':>9} {'ratio':>6}" if previous else ""))
+    for size in args.sizes:
+        # A 100k inventory is slow enough that one run is representative
+        for result in run_size(size, args.repeat if size < 100000 else 1, profile):
+            results.append(result)
+            line = f"{size:>7} {result['benchmark']:<42} {result['seconds']:>9.4f} {result['us_per_repo']:>9.2f}"
+            before = previous.get((size, result["benchmark"]))
+            if before is not None:
+                line += f" {before['us_per_repo']:>9.2f} {result['us_per_repo'] / before['us_per_repo']:>6.2f}"
+            print(line)
+    with open(args.out, "w") as fp:
+        json.dump({"metadata": _metadata(), "results": results}, fp, indent=1)
+    print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
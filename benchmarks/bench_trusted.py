@@ -0,0 +1,40 @@
+"""Validated vs trusted vs sampled loads of the nonprod export scaled up.
+
+The "parse only" rows are the JSON decoding cost each load path pays before
+any model is built.
+
+Run from the repository root:  python -m benchmarks.bench_trusted [factor]
+"""
+import json
+import sys
+
+import loader
+from benchmarks.common import scaled_export_file, timer
+
+
+def main(factor: int) -> None:
+    results = {}
+    with scaled_export_file(factor) as (path, repos):
+        with open(path) as fp, timer(results, "json.load only"):
+            json.load(fp)
+        with open(path) as fp, timer(results, "stream parse only"):
+            for _ in loader.iter_repositories(fp, typed=False):
+                pass
+        with open(path) as fp, timer(results, "json.load full"):
+            validated = loader.load_repository_structure_full(fp)
+        for mode in ("sampled", "trusted"):
+            with open(path) as fp, timer(results, f"json.load {mode}"):
+                loaded = loader.load_repository_structure_full(fp, validation=mode, seed=0)
+            assert loaded == validated
+        for mode in ("full", "sampled", "trusted"):
+            with open(path) as fp, timer(results, f"stream {mode}"):
+                loaded = loader.load_repository_structure(fp, validation=mode, seed=0)
+            assert loaded == validated
+    print(f"{repos} repos (nonprod export x{factor})")
+    baseline = results["json.load full"]
+    for name, seconds in results.items():
+        print(f"{name:>22} {seconds:>7.3f}s {baseline / seconds:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,56 @@
+"""Validation time of validation.py on synthetic exports.
+
+Run from the repository root:  python -m benchmarks.bench_validation [sizes...] [--processes N]
+
+Each size is validated from the export text in one pass (parse included),
+once in-process and once sharded over --processes workers. For sizes up to
+10k a nested-scan check of virtual members, looking each member up in the
+list of every repo, is timed for comparison.
+"""
+import argparse
+import io
+import json
+import time
+from collections import Counter
+
+from benchmarks.synthetic import InventoryProfile, generate
+from validation import validate_export
+
+
+def _nested_scan(export) -> int:
+    repos = [(section, package_type, repo["key"]) for section, types in export.items()
+             for package_type, configs in types.items() for repo in configs.values()]
+    missing = 0
+    for configs in export.get("virtual_repositories", {}).values():
+        for repo in configs.values():
+            for member in repo.get("repositories") or ():
+                if not any(key == member for _, _, key in repos):
+                    missing += 1
+    return missing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    profile = InventoryProfile.from_file()
+    print(f"{'repos':>7} {'processes':>9} {'seconds':>8} {'violations':>10}  by rule")
+    for size in args.sizes:
+        export = generate(size, seed=size, profile=profile)
+        text = json.dumps(export)
+        for processes in (1, args.processes):
+            start = time.perf_counter()
+            violations = validate_export(io.StringIO(text), processes=processes)
+            seconds = time.perf_counter() - start
+            rules = Counter(v.rule for v in violations)
+            print(f"{size:>7} {processes:>9} {seconds:>8.2f} {len(violations):>10}  {dict(rules)}")
+        if size <= 10000:
+            start = time.perf_counter()
+            _nested_scan(export)
+            print(f"{size:>7} {'nested':>9} {time.perf_counter() - start:>8.2f}  (member lookups only)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NONPROD_EXPORT = os.path.join(ROOT, "repos_data_full_nonprod.json")
+
+
+def read_export(path: str = NONPROD_EXPORT) -> Dict[str, Any]:
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def write_scaled_export(out: IO[str], factor: int, source: str = NONPROD_EXPORT) -> int:
+    """Write `source` repeated `factor` times with unique keys; returns the repo count.
+
+    Copies are written one repo at a time so generating a large export does
+    not need it in memory.
+    """
+    export = read_export(source)
+    count = 0
+    out.write("{")
+    for s, (section, types) in enumerate(export.items()):
+        out.write(("," if s else "") + json.dumps(section) + ":{")
+        for t, (package_type, repos) in enumerate(types.items()):
+            out.write(("," if t else "") + json.dumps(package_type) + ":{")
+            first = True
+            for copy in range(factor):
+                for name, repo in repos.items():
+                    suffix = f"-{copy}" if copy else ""
+                    repo = dict(repo, key=repo["key"] + suffix)
+                    if "repositories" in repo:
+                        repo["repositories"] = [member + suffix for member in repo["repositories"]]
+                    out.write(("" if first else ",") + json.dumps(name + suffix) + ":" + json.dumps(repo))
+                    first = False
+                    count += 1
+            out.write("}")
+        out.write("}")
+    out.write("}")
+    return count
+
+
+@contextmanager
+def scaled_export_file(factor: int) -> Iterator[Tuple[str, int]]:
+    """Yield (path, repo count) of a temporary export scaled by `factor`."""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as out:
+            count = write_scaled_export(out, factor)
+        yield path, count
+    finally:
+        os.remove(path)
+
+
+@contextmanager
+def timer(results: Dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional
+
+PREFIX = "/api/repositories"
+
+
+class StubArtifactory(ThreadingHTTPServer):
+    """In-memory stand-in for the Artifactory repositories REST API.
+
+    Serves GET/PUT/POST on /api/repositories[/key] over keep-alive HTTP/1.1,
+    with an optional per-request latency and a share of requests answered
+    with 429 to exercise client retries. Repo GETs carry an ETag and answer
+    a matching If-None-Match with 304 unless etags=False.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, latency_ms: float = 0.0, throttle_rate: float = 0.0, seed: Optional[int] = None,
+                 etags: bool = True):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency_ms = latency_ms
+        self.etags = etags
+        self.throttle_rate = throttle_rate
+        self.repos: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                self.throttled += 1
+                return True
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    server: StubArtifactory
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _begin(self) -> Optional[str]:
+        # Common prelude: latency, throttling and routing; returns the repo key ("" for the list)
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        if not self.path.startswith(PREFIX):
+            self._read_body()
+            self._send(404, {"errors": [{"status": 404, "message": "Not Found"}]})
+            return None
+        if self.server.throttle():
+            self._read_body()
+            self._send(429, {"errors": [{"status": 429, "message": "Too Many Requests"}]}, {"Retry-After": "0.05"})
+            return None
+        return self.path[len(PREFIX):].strip("/").split("?")[0]
+
+    def do_GET(self) -> None:
+        key = self._begin()
+        if key is None:
+            return
+        if not key:
+            self._send(200, [
+                {"key": k, "type": repo.get("rclass", "local").upper(), "packageType": repo.get("packageType")}
+                for k, repo in list(self.server.repos.items())
+            ])
+        elif key in self.server.repos:
+            repo = self.server.repos[key]
+            etag = '"' + hashlib.sha1(json.dumps(repo, sort_keys=True).encode()).hexdigest() + '"'
+            if self.server.etags and self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+            else:
+                self._send(200, repo, {"ETag": etag} if self.server.etags else None)
+        else:
+            self._send(400, {"errors": [{"status": 400, "message": f"Bad request, repository {key} not found"}]})
+
+    def do_PUT(self) -> None:
+        key = self._begin()
+        if key is None:
+            return
+        payload = self._read_body()
+        if key in self.server.repos:
+            self._send(400, {"errors": [{"status": 400, "message": f"Repository {key} already exists"}]})
+            return
+        self.server.repos[key] = dict(payload, key=key)
+        self._send(200)
+
+    def do_POST(self) -> None:
+        key = self._begin()
+        if key is None:
+            return
+        payload = self._read_body()
+        if key not in self.server.repos:
+            self._send(400, {"errors": [{"status": 400, "message": f"Repository {key} does not exist"}]})
+            return
+        self.server.repos[key].update(payload)
+        self._send(200)
+
+
+@contextmanager
+def running_stub(**options: Any) -> Iterator[StubArtifactory]:
+    server = StubArtifactory(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+from urllib.parse import parse_qs, urlsplit
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(seconds: int) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StubGitHub(ThreadingHTTPServer):
+    """In-memory GitHub issues API for intake repos.
+
+    Lists support labels, since, sort=updated, per_page/page with Link
+    headers, ETags with 304 answers, and X-RateLimit headers; 304s are not
+    charged against the limit, like on github.com.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, limit: int = 5000):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.issues: Dict[str, List[Dict[str, Any]]] = {}
+        self.remaining = limit
+        self.requests = 0
+        self.charged = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def tick(self) -> str:
+        with self._lock:
+            self._clock += 1
+            return _timestamp(self._clock)
+
+    def add_issue(self, repo: str, title: str, body: str, labels=("onboarding",)) -> Dict[str, Any]:
+        issues = self.issues.setdefault(repo, [])
+        number = len(issues) + 1
+        issue = {
+            "number": number,
+            "title": title,
+            "body": body,
+            "labels": [{"name": label} for label in labels],
+            "updated_at": self.tick(),
+            "html_url": f"https://github.example/{repo}/issues/{number}",
+        }
+        issues.append(issue)
+        return issue
+
+    def update_issue(self, repo: str, number: int, body: str) -> None:
+        issue = self.issues[repo][number - 1]
+        issue["body"] = body
+        issue["updated_at"] = self.tick()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: StubGitHub
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        path = parts.path.strip("/").split("/")
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if len(path) != 4 or path[0] != "repos" or path[3] != "issues":
+            self._send(404, {"message": "Not Found"}, {})
+            return
+        issues = self.server.issues.get(f"{path[1]}/{path[2]}", [])
+        if "labels" in query:
+            wanted = set(query["labels"].split(","))
+            issues = [i for i in issues if wanted <= {label["name"] for label in i["labels"]}]
+        if "since" in query:
+            issues = [i for i in issues if i["updated_at"] >= query["since"]]
+        issues = sorted(issues, key=lambda i: i["updated_at"], reverse=query.get("direction") != "asc")
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        body = issues[(page - 1) * per_page:page * per_page]
+        headers = {}
+        if page * per_page < len(issues):
+            next_query = "&".join(f"{k}={v}" for k, v in dict(query, page=page + 1).items())
+            headers["Link"] = f'<{self.server.url}{parts.path}?{next_query}>; rel="next"'
+        data = json.dumps(body).encode()
+        etag = '"' + hashlib.sha1(data + self.path.encode()).hexdigest() + '"'
+        headers["ETag"] = etag
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, None, headers, charged=False)
+        else:
+            self._send(200, data, headers)
+
+    def _send(self, status: int, data: Any, headers: Dict[str, str], charged: bool = True) -> None:
+        server = self.server
+        with server._lock:
+            server.requests += 1
+            if charged:
+                server.charged += 1
+                server.remaining -= 1
+            remaining = server.remaining
+        if not isinstance(data, (bytes, type(None))):
+            data = json.dumps(data).encode()
+        data = data or b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@contextmanager
+def running_stub(**options: Any) -> Iterator[StubGitHub]:
+    server = StubGitHub(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
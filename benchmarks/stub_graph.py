@@ -0,0 +1,165 @@
+import json
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+PREFIX = "/v1.0"
+
+
+class FakeToken(NamedTuple):
+    token: str
+    expires_on: int
+
+
+class FakeCredential:
+    # Stands in for an azure-identity credential and counts token acquisitions
+    def __init__(self, lifetime: int = 3600):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def get_token(self, *scopes: str) -> FakeToken:
+        self.calls += 1
+        return FakeToken(f"token-{self.calls}", int(time.time()) + self.lifetime)
+
+
+class StubGraph(ThreadingHTTPServer):
+    """In-memory Microsoft Graph serving users, groups, group members and JSON $batch.
+
+    `users` users and `groups` groups of `members_per_group` users are
+    generated from `seed`. A share of sub-requests inside a batch can be
+    answered 429 to exercise the resolver's retry path.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, users: int = 2000, groups: int = 200, members_per_group: int = 25,
+                 latency_ms: float = 0.0, throttle_rate: float = 0.0, seed: int = 0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        rng = random.Random(seed)
+        self.latency_ms = latency_ms
+        self.throttle_rate = throttle_rate
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.users_by_upn: Dict[str, Dict[str, Any]] = {}
+        for i in range(users):
+            user_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            upn = f"user{i}@example.com"
+            user = {"id": user_id, "displayName": f"User {i}", "mail": upn, "userPrincipalName": upn}
+            self.users[user_id] = user
+            self.users_by_upn[upn.lower()] = user
+        user_list = list(self.users.values())
+        self.groups: Dict[str, Dict[str, Any]] = {}
+        self.members: Dict[str, List[Dict[str, Any]]] = {}
+        for i in range(groups):
+            group_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            self.groups[group_id] = {"id": group_id, "displayName": f"team-{i}", "mail": f"team-{i}@example.com"}
+            self.members[group_id] = rng.sample(user_list, min(members_per_group, len(user_list)))
+        self.requests = 0
+        self.sub_requests = 0
+        self._lock = threading.Lock()
+        self._random = rng
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{PREFIX}"
+
+    def count(self, sub_requests: int = 0) -> None:
+        with self._lock:
+            self.requests += 1
+            self.sub_requests += sub_requests
+
+    def throttled(self) -> bool:
+        with self._lock:
+            return bool(self.throttle_rate) and self._random.random() < self.throttle_rate
+
+    def resolve(self, url: str) -> Tuple[int, Any]:
+        # Answer one relative GET URL such as /users/{id}?$select=...
+        parts = urlsplit(url)
+        path = [unquote(p) for p in parts.path.strip("/").split("/")]
+        query = parse_qs(parts.query)
+        if path[0] == "users" and len(path) == 2:
+            user = self.users.get(path[1]) or self.users_by_upn.get(path[1].lower())
+            return (200, user) if user else (404, _error("Request_ResourceNotFound"))
+        if path[0] == "groups" and len(path) == 1:
+            name = query.get("$filter", [""])[0].split("eq ", 1)[-1].strip("'").replace("''", "'")
+            return 200, {"value": [g for g in self.groups.values() if g["displayName"] == name]}
+        if path[0] == "groups" and len(path) == 2:
+            group = self.groups.get(path[1])
+            return (200, group) if group else (404, _error("Request_ResourceNotFound"))
+        if path[0] == "groups" and len(path) >= 3 and path[2] == "members":
+            if path[1] not in self.members:
+                return 404, _error("Request_ResourceNotFound")
+            return 200, {"value": self.members[path[1]]}
+        return 400, _error("BadRequest")
+
+
+def _error(code: str) -> Dict[str, Any]:
+    return {"error": {"code": code, "message": code}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    server: StubGraph
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send(401, _error("InvalidAuthenticationToken"))
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        self.server.count()
+        if self._authorized():
+            self._send(*self.server.resolve(self.path[len(PREFIX):]))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        requests: Optional[List[Dict[str, Any]]] = body.get("requests")
+        self.server.count(len(requests or ()))
+        if not self._authorized():
+            return
+        if self.path != f"{PREFIX}/$batch" or not requests or len(requests) > 20:
+            self._send(400, _error("BadRequest"))
+            return
+        responses = []
+        for request in requests:
+            if self.server.throttled():
+                responses.append({"id": request["id"], "status": 429, "headers": {"Retry-After": "0"},
+                                  "body": _error("TooManyRequests")})
+                continue
+            status, result = self.server.resolve(request["url"])
+            responses.append({"id": request["id"], "status": status, "body": result})
+        self._send(200, {"responses": responses})
+
+
+@contextmanager
+def running_stub(**options: Any) -> Iterator[StubGraph]:
+    server = StubGraph(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
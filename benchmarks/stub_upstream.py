@@ -0,0 +1,75 @@
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+
+class StubUpstream(ThreadingHTTPServer):
+    """Local stand-in for remote repository upstreams, healthy, slow and failing.
+
+    The first path segment picks the behaviour, so each simulated host is
+    just a URL on the one server:
+        /ok/...            answers at once
+        /slow/<ms>/...     answers after <ms> milliseconds
+        /status/<code>/... answers with that HTTP status
+        /drop/...          closes the connection without answering
+    Every request is counted per behaviour in `hits`.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.hits = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, behaviour: str) -> None:
+        with self._lock:
+            self.hits[behaviour] = self.hits.get(behaviour, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: StubUpstream
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _answer(self) -> None:
+        parts = self.path.strip("/").split("/")
+        behaviour = parts[0]
+        self.server.count(behaviour)
+        status = 200
+        if behaviour == "slow":
+            time.sleep(int(parts[1]) / 1000)
+        elif behaviour == "status":
+            status = int(parts[1])
+        elif behaviour == "drop":
+            self.close_connection = True
+            return
+        elif behaviour != "ok":
+            status = 404
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_HEAD = _answer
+
+
+@contextmanager
+def running_stub() -> Iterator[StubUpstream]:
+    server = StubUpstream()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,119 @@
+"""Deterministic synthetic inventories shaped like repos_data_full_nonprod.json.
+
+The package-type mix of each section, the value distribution of every field
+per (section, package type), the member counts of virtuals and the upstream
+URLs of remotes are taken from the nonprod export. `size` repos are then
+drawn from those distributions with a seeded RNG, so the same size and seed
+always give the same inventory.
+"""
+import json
+import random
+from collections import Counter
+from typing import IO, Any, Dict, List, Tuple
+
+from benchmarks.common import NONPROD_EXPORT, read_export
+from virtual_graph import types_compatible
+
+# Fields generated rather than sampled
+_GENERATED = frozenset({"key", "repositories", "default_deployment_repo"})
+
+
+class _Distribution:
+    # Categorical distribution of JSON values, sampled by cumulative weight
+    __slots__ = ("values", "weights")
+
+    def __init__(self, counts: Counter):
+        self.values = [json.loads(value) for value in counts]
+        self.weights = list(counts.values())
+
+    def sample(self, rng: random.Random) -> Any:
+        return rng.choices(self.values, self.weights)[0]
+
+
+class InventoryProfile:
+    """Distributions learnt from an export, per section and package type."""
+
+    def __init__(self, export: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]):
+        self.type_mix: Dict[str, _Distribution] = {}
+        self.section_mix = _Distribution(Counter({
+            json.dumps(section): len([r for repos in types.values() for r in repos]) for section, types in export.items()
+        }))
+        # (section, package_type) -> ordered field names, field -> distribution
+        self.fields: Dict[Tuple[str, str], List[str]] = {}
+        self.values: Dict[Tuple[str, str], Dict[str, _Distribution]] = {}
+        self.fan_out: Dict[str, _Distribution] = {}
+        for section, types in export.items():
+            self.type_mix[section] = _Distribution(Counter({json.dumps(t): len(repos) for t, repos in types.items()}))
+            for package_type, repos in types.items():
+                counts: Dict[str, Counter] = {}
+                members = Counter()
+                for repo in repos.values():
+                    for field, value in repo.items():
+                        if field not in _GENERATED:
+                            counts.setdefault(field, Counter())[json.dumps(value, sort_keys=True)] += 1
+                    if "repositories" in repo:
+                        members[json.dumps(len(repo["repositories"]))] += 1
+                fields: Dict[str, None] = {}
+                for repo in repos.values():
+                    fields.update(dict.fromkeys(repo))
+                self.fields[(section, package_type)] = list(fields)
+                self.values[(section, package_type)] = {f: _Distribution(c) for f, c in counts.items()}
+                if members:
+                    self.fan_out[package_type] = _Distribution(members)
+
+    @classmethod
+    def from_file(cls, path: str = NONPROD_EXPORT) -> "InventoryProfile":
+        return cls(read_export(path))
+
+
+def generate(size: int, seed: int = 0, profile: InventoryProfile = None) -> Dict[str, Any]:
+    """An export dict of `size` repos drawn from `profile` (the nonprod export by default).
+
+    Locals and remotes are drawn first so every virtual can pick its members,
+    in number following the export's fan-out, among already generated repos
+    of a compatible package type.
+    """
+    if profile is None:
+        profile = InventoryProfile.from_file()
+    rng = random.Random(seed)
+    sections = [profile.section_mix.sample(rng) for _ in range(size)]
+    export: Dict[str, Dict[str, Dict[str, Any]]] = {section: {} for section in profile.type_mix}
+    # package type -> keys of generated locals and remotes, for virtual members
+    memberable: Dict[str, List[str]] = {}
+    # virtual package type -> compatible member keys, built once the virtuals start
+    candidates_of: Dict[str, List[str]] = {}
+    order = ("local_repositories", "remote_repositories", "virtual_repositories")
+    index = 0
+    for section in order:
+        for _ in range(sections.count(section)):
+            package_type = profile.type_mix[section].sample(rng)
+            key = f"syn-{package_type}-{section.split('_')[0]}-{index}"
+            index += 1
+            distributions = profile.values[(section, package_type)]
+            repo: Dict[str, Any] = {}
+            for field in profile.fields[(section, package_type)]:
+                if field == "key":
+                    repo[field] = key
+                elif field == "repositories":
+                    candidates = candidates_of.get(package_type)
+                    if candidates is None:
+                        candidates = candidates_of[package_type] = [
+                            k for t, keys in memberable.items() if types_compatible(package_type, t) for k in keys
+                        ]
+                    count = min(profile.fan_out[package_type].sample(rng), len(candidates))
+                    repo[field] = rng.sample(candidates, count)
+                elif field == "default_deployment_repo":
+                    locals_ = [m for m in repo.get("repositories", ()) if "-local-" in m]
+                    repo[field] = locals_[0] if locals_ else None
+                else:
+                    repo[field] = distributions[field].sample(rng)
+            export[section].setdefault(package_type, {})[key] = repo
+            if section != "virtual_repositories":
+                memberable.setdefault(package_type, []).append(key)
+    return export
+
+
+def write_synthetic(out: IO[str], size: int, seed: int = 0, profile: InventoryProfile = None) -> int:
+    """Write a synthetic export to `out`; returns the repo count."""
+    json.dump(generate(size, seed, profile), out)
+    return size
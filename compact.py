@@ -0,0 +1,175 @@
+import sys
+from functools import lru_cache
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from loader import iter_repositories
+from structure import REPO_CONFIGS, field_is_required, model_fields
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+
+# Default value of every optional field of a config class; factories are called once
+@lru_cache(maxsize=None)
+def class_defaults(config_cls: Type[BaseModel]) -> Dict[str, Any]:
+    defaults = {}
+    for name, field in model_fields(config_cls).items():
+        if field_is_required(field):
+            continue
+        defaults[name] = field.default_factory() if field.default_factory is not None else field.default
+    return defaults
+
+
+@lru_cache(maxsize=None)
+def class_field_names(config_cls: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model_fields(config_cls))
+
+
+# Hashable stand-in for a nested model such as ContentSynchronisation
+class _FrozenModel(NamedTuple):
+    model_cls: Type[BaseModel]
+    items: Tuple[Tuple[str, Any], ...]
+
+
+def _thaw(value: Any, as_dict: bool = False) -> Any:
+    if isinstance(value, _FrozenModel):
+        fields = {name: _thaw(item, as_dict) for name, item in value.items}
+        return fields if as_dict else value.model_cls(**fields)
+    if isinstance(value, tuple):
+        return [_thaw(item, as_dict) for item in value]
+    if as_dict and isinstance(value, BaseModel):
+        return {name: _thaw(item, True) for name, item in value.__dict__.items()}
+    return value
+
+
+# Everything about a repo config except its key: the class and the fields that
+# differ from the class defaults. Repos with the same settings share one profile.
+class RepoProfile:
+    __slots__ = ("config_cls", "overrides")
+
+    def __init__(self, config_cls: Type[BaseModel], overrides: Tuple[Tuple[str, Any], ...]):
+        self.config_cls = config_cls
+        self.overrides = overrides
+
+    def to_dict(self, key: str) -> Dict[str, Any]:
+        values = {name: _thaw(value, True) for name, value in class_defaults(self.config_cls).items()}
+        values.update((name, _thaw(value, True)) for name, value in self.overrides)
+        values["key"] = key
+        # Field order of the model itself
+        return {name: values[name] for name in class_field_names(self.config_cls) if name in values}
+
+    def to_model(self, key: str) -> BaseModel:
+        return self.config_cls(key=key, **{name: _thaw(value) for name, value in self.overrides})
+
+
+class CompactRepo:
+    __slots__ = ("key", "profile")
+
+    def __init__(self, key: str, profile: RepoProfile):
+        self.key = key
+        self.profile = profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.profile.to_dict(self.key)
+
+    def to_model(self) -> BaseModel:
+        return self.profile.to_model(self.key)
+
+
+class CompactInventory:
+    """Memory-lean store of repo configs for large inventories.
+
+    Only fields that differ from the class defaults are kept, strings and
+    lists are interned (lists as shared tuples), and repos with identical
+    settings share a single RepoProfile. Each repo costs one small CompactRepo
+    plus its key.
+    """
+
+    def __init__(self):
+        self.repos: Dict[str, Dict[str, Dict[str, CompactRepo]]] = {
+            section: {package_type: {} for package_type in config_classes}
+            for section, config_classes in REPO_CONFIGS.items()
+        }
+        self._values: Dict[Any, Any] = {}
+        self._profiles: Dict[Tuple[Type[BaseModel], Tuple[Tuple[str, Any], ...]], RepoProfile] = {}
+
+    def _intern(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return sys.intern(value)
+        if isinstance(value, list):
+            value = tuple(self._intern(item) for item in value)
+        elif isinstance(value, BaseModel):
+            value = _FrozenModel(type(value), tuple((k, self._intern(v)) for k, v in value.__dict__.items()))
+        try:
+            # Keyed by type too: 0 == False and 1 == True hash alike but must not share an entry
+            kinds = tuple(map(type, value)) if isinstance(value, tuple) else type(value)
+            return self._values.setdefault((kinds, value), value)
+        except TypeError:
+            # Unhashable values are kept as they are
+            return value
+
+    def profile_for(self, repo: BaseModel) -> RepoProfile:
+        config_cls = type(repo)
+        defaults = class_defaults(config_cls)
+        overrides = []
+        for name in class_field_names(config_cls):
+            if name == "key":
+                continue
+            value = getattr(repo, name)
+            if name not in defaults or value != defaults[name]:
+                overrides.append((name, self._intern(value)))
+        signature = (config_cls, tuple(overrides))
+        profile = self._profiles.get(signature)
+        if profile is None:
+            profile = self._profiles[signature] = RepoProfile(config_cls, signature[1])
+        return profile
+
+    def add(self, section: str, package_type: str, name: str, repo: BaseModel) -> CompactRepo:
+        compact = CompactRepo(sys.intern(repo.key), self.profile_for(repo))
+        self.repos[section][package_type][sys.intern(name)] = compact
+        return compact
+
+    def items(self) -> Iterator[Tuple[str, str, str, CompactRepo]]:
+        for section, types in self.repos.items():
+            for package_type, repos in types.items():
+                for name, repo in repos.items():
+                    yield section, package_type, name, repo
+
+    def __len__(self) -> int:
+        return sum(len(repos) for types in self.repos.values() for repos in types.values())
+
+    @property
+    def profile_count(self) -> int:
+        return len(self._profiles)
+
+    def get(self, section: str, package_type: str, name: str) -> Optional[CompactRepo]:
+        return self.repos[section][package_type].get(name)
+
+    def to_structure(self) -> "RepositoryStructure":
+        from structure import RepositoryStructure
+
+        structure = RepositoryStructure()
+        for section, package_type, name, repo in self.items():
+            getattr(getattr(structure, section), package_type)[name] = repo.to_model()
+        return structure
+
+    @classmethod
+    def from_structure(cls, structure: "RepositoryStructure") -> "CompactInventory":
+        inventory = cls()
+        for section in REPO_CONFIGS:
+            container = getattr(structure, section)
+            for package_type in REPO_CONFIGS[section]:
+                for name, repo in getattr(container, package_type).items():
+                    inventory.add(section, package_type, name, repo)
+        return inventory
+
+    @classmethod
+    def from_export(cls, fp: IO[str], **validation_options: Any) -> "CompactInventory":
+        """Stream an export straight into a CompactInventory without a full RepositoryStructure."""
+        inventory = cls()
+        for entry in iter_repositories(fp, sections=REPO_CONFIGS, **validation_options):
+            if isinstance(entry.config, BaseModel):
+                inventory.add(entry.section, entry.package_type, entry.name, entry.config)
+        return inventory
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from artifactory_client import ArtifactoryClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    instance TEXT NOT NULL,
+    key TEXT NOT NULL,
+    body BLOB NOT NULL,
+    digest TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    used REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    PRIMARY KEY (instance, key)
+)
+"""
+
+
+class CacheStats:
+    # Counters of one run; fresh hits and 304s both count as hits
+    __slots__ = ("fresh", "revalidated", "refetched", "misses", "changed", "bytes_saved", "bytes_fetched")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    @property
+    def lookups(self) -> int:
+        return self.fresh + self.revalidated + self.refetched + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.fresh + self.revalidated) / self.lookups if self.lookups else 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.lookups} lookups, hit rate {self.hit_rate:.1%} "
+            f"({self.fresh} fresh, {self.revalidated} revalidated, {self.refetched} refetched "
+            f"of which {self.changed} changed, {self.misses} misses), "
+            f"{self.bytes_saved / 2**20:.1f} MiB saved, {self.bytes_fetched / 2**20:.1f} MiB fetched"
+        )
+
+
+class ConfigCache:
+    """Persistent cache of repository configs, keyed by instance URL and repo key.
+
+    Each entry keeps the config body, its content hash, when it was fetched
+    and the ETag/Last-Modified validators the server sent. Entries younger
+    than `ttl` seconds are served without a request; older ones are
+    revalidated with a conditional GET and only downloaded again when the
+    server answers 200. Servers without validators fall back to the TTL
+    alone. close() evicts entries unused for `max_age` seconds and then the
+    least recently used ones until at most `max_entries`/`max_bytes` remain.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600,
+        max_age: float = 7 * 86400,
+        max_entries: int = 200_000,
+        max_bytes: int = 512 * 2**20,
+    ):
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # One small commit per fetched config; WAL keeps those from syncing the whole file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def close(self) -> None:
+        self.evict()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "ConfigCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _row(self, instance: str, key: str):
+        with self._lock:
+            return self._db.execute(
+                "SELECT body, digest, fetched, etag, last_modified FROM configs WHERE instance = ? AND key = ?",
+                (instance, key),
+            ).fetchone()
+
+    def _store(self, instance: str, key: str, body: bytes, response: requests.Response) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO configs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (instance, key, body, digest, now, now,
+                 response.headers.get("ETag"), response.headers.get("Last-Modified")),
+            )
+            self._db.commit()
+        return digest
+
+    def _touch(self, instance: str, key: str, revalidated: bool) -> None:
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._db.execute("UPDATE configs SET used = ?, fetched = ? WHERE instance = ? AND key = ?",
+                                 (now, now, instance, key))
+            else:
+                self._db.execute("UPDATE configs SET used = ? WHERE instance = ? AND key = ?", (now, instance, key))
+            self._db.commit()
+
+    def _record(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + count)
+
+    def fetch(self, client: ArtifactoryClient, key: str) -> Optional[Dict[str, Any]]:
+        """Config of `key` from the cache or the server; None if the server has no such repo."""
+        instance = client.base_url
+        row = self._row(instance, key)
+        if row is not None:
+            body, digest, fetched, etag, last_modified = row
+            if time.time() - fetched < self.ttl:
+                self._touch(instance, key, revalidated=False)
+                self._record(fresh=1, bytes_saved=len(body))
+                return json.loads(body)
+        headers = {}
+        if row is not None:
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        response, _ = client.request("GET", f"/api/repositories/{key}", headers=headers)
+        if response.status_code == 304 and row is not None:
+            response.close()
+            self._touch(instance, key, revalidated=True)
+            self._record(revalidated=1, bytes_saved=len(body))
+            return json.loads(body)
+        if response.status_code != 200:
+            response.close()
+            return None
+        content = response.content
+        new_digest = self._store(instance, key, content, response)
+        if row is None:
+            self._record(misses=1, bytes_fetched=len(content))
+        else:
+            self._record(refetched=1, changed=int(new_digest != digest), bytes_fetched=len(content))
+        return json.loads(content)
+
+    def evict(self) -> int:
+        """Drop entries past max_age, then least recently used ones over the size bounds; returns the count."""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        db = self._db
+        before = db.total_changes
+        db.execute("DELETE FROM configs WHERE used < ?", (time.time() - self.max_age,))
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM configs").fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            doomed = []
+            for instance, key, size in db.execute("SELECT instance, key, LENGTH(body) FROM configs ORDER BY used"):
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                doomed.append((instance, key))
+                count -= 1
+                total -= size
+            db.executemany("DELETE FROM configs WHERE instance = ? AND key = ?", doomed)
+        db.commit()
+        return db.total_changes - before
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM configs").fetchone()[0]
@@ -0,0 +1,206 @@
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from artifactory_client import ArtifactoryClient
+from config_cache import ConfigCache
+from loader import SECTIONS
+from translator import RCLASS_SECTION, Translation, Translator
+
+# Listed groups whose repos split into several exported package types once fetched
+_SPLIT_GROUPS = frozenset({("local_repositories", "terraform")})
+
+_INDENT = " " * 12
+
+
+class ListedRepo(NamedTuple):
+    section: str
+    package_type: str
+    key: str
+
+
+class ExportStats(NamedTuple):
+    repos: int
+    failed: Tuple[str, ...]
+    unmapped: Tuple[str, ...]
+    seconds: float
+
+
+def list_repositories(client: ArtifactoryClient) -> List[ListedRepo]:
+    """Every repo of the instance grouped the way the export is: section, package type, key.
+
+    Sections follow SECTIONS; package types and keys keep their listing order.
+    """
+    response, _ = client.request("GET", "/api/repositories")
+    response.raise_for_status()
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for repo in response.json():
+        section = RCLASS_SECTION.get(repo["type"].lower())
+        if section is None:
+            # Federated and distribution repos have no export section
+            continue
+        groups.setdefault((section, repo["packageType"].lower()), []).append(repo["key"])
+    listed = []
+    for section in SECTIONS:
+        for (group_section, package_type), keys in groups.items():
+            if group_section == section:
+                listed.extend(ListedRepo(section, package_type, key) for key in keys)
+    return listed
+
+
+def _fetch(client: ArtifactoryClient, translator: Translator, key: str,
+           cache: Optional[ConfigCache]) -> Optional[Translation]:
+    try:
+        if cache is not None:
+            payload = cache.fetch(client, key)
+        else:
+            response, _ = client.request("GET", f"/api/repositories/{key}")
+            if response.status_code != 200:
+                response.close()
+                return None
+            payload = response.json()
+    except requests.RequestException:
+        return None
+    return translator.rest_to_export(payload) if payload is not None else None
+
+
+class _ExportWriter:
+    # Writes the section -> package type -> key document one repo at a time
+
+    def __init__(self, out: IO[str]):
+        self.out = out
+        self.section: Optional[str] = None
+        self.package_type: Optional[str] = None
+        self.first_type = True
+        self.first_repo = True
+        out.write("{")
+
+    def _close_type(self) -> None:
+        if self.package_type is not None:
+            self.out.write("\n        }")
+            self.package_type = None
+
+    def _close_section(self) -> None:
+        self._close_type()
+        if self.section is not None:
+            self.out.write("\n    }")
+
+    def write(self, section: str, package_type: str, name: str, values: Dict[str, Any]) -> None:
+        if section != self.section:
+            self._close_section()
+            self.out.write(("," if self.section is not None else "") + f"\n    {json.dumps(section)}: {{")
+            self.section = section
+            self.first_type = True
+        if package_type != self.package_type:
+            self._close_type()
+            self.out.write(("" if self.first_type else ",") + f"\n        {json.dumps(package_type)}: {{")
+            self.package_type = package_type
+            self.first_type = False
+            self.first_repo = True
+        body = json.dumps(values, indent=4).replace("\n", "\n" + _INDENT)
+        self.out.write(("" if self.first_repo else ",") + f"\n{_INDENT}{json.dumps(name)}: {body}")
+        self.first_repo = False
+
+    def close(self) -> None:
+        self._close_section()
+        self.out.write("\n}\n")
+
+
+def export_inventory(
+    client: ArtifactoryClient,
+    out: IO[str],
+    translator: Optional[Translator] = None,
+    window: Optional[int] = None,
+    cache: Optional[ConfigCache] = None,
+) -> ExportStats:
+    """Fetch every repo config in parallel and stream the export to `out` as they arrive.
+
+    Fetches run on the client's worker pool and pooled keep-alive session.
+    Results are written in listing order, so at most `window` configs
+    (default 4 x max_workers) are held in memory; only the local terraform
+    group, whose repos split into terraform_module/terraform_provider, is
+    buffered whole. With a ConfigCache, unchanged configs are served from it.
+    """
+    start = time.perf_counter()
+    if translator is None:
+        translator = Translator.from_file()
+    if window is None:
+        window = 4 * client.max_workers
+    listed = list_repositories(client)
+    writer = _ExportWriter(out)
+    failed: List[str] = []
+    unmapped = set()
+    count = 0
+    split_buffer: Dict[str, List[Translation]] = {}
+    split_group: Optional[Tuple[str, str]] = None
+
+    def flush_split() -> None:
+        nonlocal count
+        for package_type, translations in split_buffer.items():
+            for translation in translations:
+                writer.write(translation.section, package_type, translation.values["key"], translation.values)
+                count += 1
+        split_buffer.clear()
+
+    def emit(repo: ListedRepo, translation: Optional[Translation]) -> None:
+        nonlocal count, split_group
+        group = (repo.section, repo.package_type)
+        if split_group is not None and group != split_group:
+            flush_split()
+            split_group = None
+        if translation is None:
+            failed.append(repo.key)
+            return
+        unmapped.update(translation.unmapped)
+        if group in _SPLIT_GROUPS:
+            split_group = group
+            split_buffer.setdefault(translation.package_type, []).append(translation)
+            return
+        writer.write(translation.section, translation.package_type, repo.key, translation.values)
+        count += 1
+
+    with ThreadPoolExecutor(max_workers=client.max_workers) as pool:
+        in_flight: deque = deque()
+        for repo in listed:
+            in_flight.append((repo, pool.submit(_fetch, client, translator, repo.key, cache)))
+            if len(in_flight) >= window:
+                done, future = in_flight.popleft()
+                emit(done, future.result())
+        while in_flight:
+            done, future = in_flight.popleft()
+            emit(done, future.result())
+    flush_split()
+    writer.close()
+    return ExportStats(count, tuple(failed), tuple(sorted(unmapped)), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    import os
+
+    parser = argparse.ArgumentParser(description="Export every repository config of an instance")
+    parser.add_argument("--url", required=True, help="Artifactory base URL, e.g. https://host/artifactory")
+    parser.add_argument("--out", default="repos_data_full_nonprod.json")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--rps", type=float, default=None, help="requests per second cap")
+    parser.add_argument("--cache", help="config cache database, reused across runs")
+    parser.add_argument("--cache-ttl", type=float, default=3600, help="seconds before a cached config is revalidated")
+    args = parser.parse_args()
+
+    cache = ConfigCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+    with ArtifactoryClient(args.url, token=os.environ.get("ARTIFACTORY_TOKEN"),
+                           max_workers=args.workers, rps=args.rps) as client, open(args.out, "w") as out:
+        stats = export_inventory(client, out, cache=cache)
+    if cache is not None:
+        cache.close()
+        print(f"cache: {cache.stats.report()}")
+    print(f"{stats.repos} repos exported to {args.out} in {stats.seconds:.1f}s "
+          f"({stats.repos / stats.seconds:.0f} repos/s), {len(stats.failed)} failed")
+    for key in stats.failed:
+        print(f"  failed: {key}")
+    if stats.unmapped:
+        print(f"REST keys without a mapping: {', '.join(stats.unmapped)}")
@@ -0,0 +1,330 @@
+import argparse
+import json
+from array import array
+from collections import Counter
+from typing import IO, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from loader import SECTIONS, iter_repositories
+from translator import MODEL_FIELD_ALIASES, SECTION_RCLASS
+
+# Share of repos the most common value must reach for a field to count as near-constant
+NEAR_CONSTANT_SHARE = 0.95
+# Distinct values per repo above which a field is taken to identify the repo
+UNIQUE_RATIO = 0.5
+
+
+# One field of one (section, package_type): the rows it is set in and, per row, its value code
+class _Column:
+    __slots__ = ("rows", "codes")
+
+    def __init__(self):
+        self.rows = array("I")
+        self.codes = array("I")
+
+
+class _Table:
+    __slots__ = ("rows", "columns")
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: Dict[str, _Column] = {}
+
+
+class FieldSummary(NamedTuple):
+    section: str
+    field: str
+    # Package types the field is set in, and the repos of those types
+    types: Tuple[str, ...]
+    rows: int
+    present: int
+    distinct: int
+    # Most common values first, as (value, count)
+    top: Tuple[Tuple[Any, int], ...]
+    # package_type -> (most common value, its share of that type's repos setting the field)
+    by_type: Dict[str, Tuple[Any, float]]
+    # identifier, constant, near_constant, by_type or varies
+    kind: str
+
+    @property
+    def share(self) -> float:
+        return self.top[0][1] / self.present if self.present else 0.0
+
+
+def _value_key(value: Any) -> Any:
+    # Hashable and type-exact: True, 1 and 1.0 must not share a code
+    kind = type(value)
+    if kind is str:
+        return value
+    if kind is bool or kind is int or kind is float or value is None:
+        return kind, value
+    return "json", json.dumps(value, sort_keys=True)
+
+
+class FieldStatistics:
+    """Per-package-type columnar store of an export's field values.
+
+    Each (section, package_type) keeps, per field, an array of the rows it is
+    set in and an array of integer value codes; values are interned once in
+    `values`. Distributions are Counters over the code arrays and presence
+    patterns are compared as whole arrays, so the analysis never goes back to
+    per-repo dicts. Field names are the model names (x_ray_index, ...).
+    """
+
+    def __init__(self):
+        self.tables: Dict[Tuple[str, str], _Table] = {}
+        # Code 0 is "not set"
+        self.values: List[Any] = [None]
+        self._codes: Dict[Any, int] = {}
+
+    @classmethod
+    def from_export(cls, fp: IO[str], sections: Iterable[str] = SECTIONS) -> "FieldStatistics":
+        stats = cls()
+        for entry in iter_repositories(fp, sections=sections, typed=False):
+            stats.add(entry.section, entry.package_type, entry.config)
+        return stats
+
+    def add(self, section: str, package_type: str, config: Dict[str, Any]) -> None:
+        table = self.tables.get((section, package_type))
+        if table is None:
+            table = self.tables[(section, package_type)] = _Table()
+        row = table.rows
+        table.rows += 1
+        columns = table.columns
+        codes = self._codes
+        for field, value in config.items():
+            column = columns.get(field)
+            if column is None:
+                column = columns[field] = _Column()
+            # Strings, most cells, are their own key
+            key = value if type(value) is str else _value_key(value)
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(self.values)
+                self.values.append(value)
+            column.rows.append(row)
+            column.codes.append(code)
+
+    def fields(self, section: str, package_type: str) -> Dict[str, _Column]:
+        # Columns are kept under the export names and reported under the model names
+        columns = self.tables[(section, package_type)].columns
+        return {MODEL_FIELD_ALIASES.get(name, name): column for name, column in columns.items()}
+
+    def package_types(self, section: str) -> List[str]:
+        return [package_type for s, package_type in self.tables if s == section]
+
+    def repos(self, section: Optional[str] = None) -> int:
+        return sum(table.rows for (s, _), table in self.tables.items() if section in (None, s))
+
+    def summarize(self, section: str) -> List[FieldSummary]:
+        """Distribution and kind of every field of a section, in first-seen order."""
+        per_field: Dict[str, Dict[str, Tuple[int, Counter]]] = {}
+        for package_type in self.package_types(section):
+            table = self.tables[(section, package_type)]
+            for field, column in self.fields(section, package_type).items():
+                per_field.setdefault(field, {})[package_type] = (table.rows, Counter(column.codes))
+        summaries = []
+        for field, types in per_field.items():
+            total: Counter = Counter()
+            rows = type_modes = 0
+            by_type = {}
+            for package_type, (type_rows, counts) in types.items():
+                total.update(counts)
+                rows += type_rows
+                code, count = counts.most_common(1)[0]
+                type_modes += count
+                by_type[package_type] = (self.values[code], count / sum(counts.values()))
+            present = sum(total.values())
+            top = tuple((self.values[code], count) for code, count in total.most_common())
+            summaries.append(FieldSummary(section, field, tuple(types), rows, present, len(total), top, by_type,
+                                          self._kind(present, len(total), top, by_type, type_modes)))
+        return summaries
+
+    @staticmethod
+    def _kind(present: int, distinct: int, top, by_type, type_modes: int) -> str:
+        if distinct == 1:
+            return "constant"
+        if present > 1 and distinct / present >= UNIQUE_RATIO:
+            return "identifier"
+        if top[0][1] / present >= NEAR_CONSTANT_SHARE:
+            return "near_constant"
+        # Each package type's own most common value covers nearly every repo
+        modes = {_value_key(value) for value, _ in by_type.values()}
+        if len(modes) > 1 and type_modes / present >= NEAR_CONSTANT_SHARE:
+            return "by_type"
+        return "varies"
+
+    def travel_together(self, section: str) -> List[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+        """(fields, package types) of fields set in exactly the same package types, short of all of them."""
+        all_types = self.package_types(section)
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for summary in self.summarize(section):
+            if len(summary.types) < len(all_types):
+                groups.setdefault(tuple(sorted(summary.types)), []).append(summary.field)
+        return [(tuple(fields), types) for types, fields in groups.items() if len(fields) > 1]
+
+    def set_together(self, section: str, package_type: str) -> List[Tuple[str, ...]]:
+        """Fields of one package type set in the same repos as each other but not in every repo."""
+        table = self.tables[(section, package_type)]
+        groups: Dict[bytes, List[str]] = {}
+        for field, column in self.fields(section, package_type).items():
+            if len(column.rows) < table.rows:
+                groups.setdefault(column.rows.tobytes(), []).append(field)
+        return [tuple(fields) for fields in groups.values() if len(fields) > 1]
+
+
+def _show(value: Any) -> str:
+    return json.dumps(value)
+
+
+def _percent(share: float) -> str:
+    return "<1%" if 0 < share < 0.005 else f"{share:.0%}"
+
+
+def _describe(summary: FieldSummary) -> str:
+    value, count = summary.top[0]
+    if summary.kind == "constant":
+        text = f"Always {_show(value)}"
+    elif summary.kind == "identifier":
+        text = f"Unique per repo ({summary.distinct} values in {summary.present} repos)"
+    elif summary.kind == "near_constant":
+        others = sorted(t for t, (mode, share) in summary.by_type.items()
+                        if _value_key(mode) != _value_key(value) or share < 1)
+        text = f"Almost always {_show(value)} ({_percent(summary.share)}; other values in {', '.join(others)})"
+    elif summary.kind == "by_type":
+        text = "Set by package type"
+    else:
+        rest = ", ".join(f"{_show(v)} ({_percent(c / summary.present)})" for v, c in summary.top[1:3])
+        more = f", {summary.distinct - 3} more" if summary.distinct > 3 else ""
+        text = f"Usually {_show(value)} ({_percent(summary.share)}), also {rest}{more}"
+    if summary.present < summary.rows:
+        text += f"; set in {summary.present} of {summary.rows} repos"
+    return text + "."
+
+
+def write_analysis(stats: FieldStatistics, out: IO[str], source: str = "the export") -> None:
+    """Write the parameter analysis in the layout of param-analysis.txt."""
+    counts = ", ".join(f"{stats.repos(section)} {SECTION_RCLASS[section]}" for section in SECTIONS)
+    out.write(f"Generated by field_stats.py from {source}: {stats.repos()} repos ({counts}).\n")
+    out.write(f"Near-constant means one value in at least {NEAR_CONSTANT_SHARE:.0%} of the repos setting the field.\n")
+    for section in SECTIONS:
+        if not stats.package_types(section):
+            continue
+        summaries = stats.summarize(section)
+        all_types = stats.package_types(section)
+        common = [s for s in summaries if len(s.types) == len(all_types)]
+        specific = [s for s in summaries if len(s.types) < len(all_types)]
+        out.write(f"\n== {section} ({stats.repos(section)} repos, {len(all_types)} package types) ==\n\n")
+        out.write("1. Parameters\n")
+        for title, kinds in (
+            ("Unique Parameters (user-prompted)", ("identifier",)),
+            ("Redundant/Default Parameters", ("constant", "near_constant")),
+            ("Varying Parameters", ("varies",)),
+        ):
+            out.write(f"{title}:\n")
+            for summary in common:
+                if summary.kind in kinds:
+                    out.write(f"  {summary.field}: {_describe(summary)}\n")
+        out.write("Type-Specific Parameters (dependent):\n")
+        for summary in common:
+            if summary.kind == "by_type":
+                out.write(f"  {summary.field}: Depends on package type (see dependencies below).\n")
+        for fields, types in _type_specific_groups(specific):
+            out.write(f"  {', '.join(fields)}: {', '.join(types)} only.\n")
+
+        out.write("\n2. Parameter Dependency Relationships\n")
+        out.write("  A. Dependencies by Repository Type\n")
+        for summary in summaries:
+            if summary.kind != "by_type":
+                continue
+            out.write(f"  {summary.field} is dictated by repository type:\n")
+            for package_type, (value, share) in sorted(summary.by_type.items()):
+                mostly = "" if share == 1 else f" ({_percent(share)})"
+                out.write(f"    {package_type}: {_show(value)}{mostly}\n")
+        out.write("  B. Related Parameters\n")
+        for fields, types in stats.travel_together(section):
+            out.write(f"  {', '.join(fields)} are always found together in {', '.join(types)} repos.\n")
+        for package_type in all_types:
+            for fields in stats.set_together(section, package_type):
+                out.write(f"  {', '.join(fields)} are set in the same {package_type} repos.\n")
+
+        out.write("\n3. Recommendations: What to Prompt, What to Omit\n")
+        for title, kinds in (
+            ("Always Prompt For", ("identifier",)),
+            ("Prompt Only If User Wants Advanced/Non-default Configuration", ("near_constant", "varies")),
+            ("Infer From Package Type", ("by_type",)),
+            ("Omit/Default", ("constant",)),
+        ):
+            fields = [s.field for s in common if s.kind in kinds]
+            if title == "Always Prompt For" and "repositories" in {s.field for s in summaries}:
+                fields.append("repositories")
+            out.write(f"{title}:\n")
+            for field in dict.fromkeys(fields):
+                out.write(f"  {field}\n")
+
+
+def _type_specific_groups(specific: List[FieldSummary]) -> List[Tuple[List[str], List[str]]]:
+    groups: Dict[Tuple[str, ...], List[str]] = {}
+    for summary in specific:
+        groups.setdefault(tuple(sorted(summary.types)), []).append(summary.field)
+    return sorted(((fields, list(types)) for types, fields in groups.items()), key=lambda group: group[1])
+
+
+def write_template(stats: FieldStatistics, out: IO[str], source: str = "the export") -> None:
+    """Write per-package-type defaults in the layout of minimal-parameter-template.txt.
+
+    Fields that identify a repo are null (prompt for them); every other field
+    takes its most common value, in the common block when it is set for every
+    package type and the same in all of them, otherwise per package type.
+    """
+    out.write(f"# Generated by field_stats.py from {source}.\n")
+    out.write("# Most common value of each field; null where the value identifies the repo and must be prompted for.\n")
+    for section in SECTIONS:
+        all_types = stats.package_types(section)
+        if not all_types:
+            continue
+        rclass = SECTION_RCLASS[section]
+        summaries = stats.summarize(section)
+        common, per_type = [], {package_type: [] for package_type in sorted(all_types)}
+        for summary in summaries:
+            identifier = summary.kind == "identifier"
+            if len(summary.types) == len(all_types) and summary.kind != "by_type":
+                common.append((summary.field, None if identifier else summary.top[0][0]))
+            else:
+                for package_type, (value, _) in summary.by_type.items():
+                    per_type[package_type].append((summary.field, None if identifier else value))
+        out.write(f"\n# {rclass.capitalize()} repos: common attributes across types\n")
+        _write_block(out, f"{rclass}_repo_common_defaults", common)
+        out.write(f"\n# Defaults per {rclass} repository package type.\n")
+        out.write(f"{rclass}_repo_defaults = {{\n")
+        for package_type, fields in per_type.items():
+            _write_block(out, package_type, fields)
+        out.write("}\n")
+
+
+def _write_block(out: IO[str], name: str, fields: List[Tuple[str, Any]]) -> None:
+    if not fields:
+        out.write(f"{name} = {{}}\n")
+        return
+    width = max(len(field) for field, _ in fields)
+    out.write(f"{name} = {{\n")
+    for field, value in fields:
+        out.write(f"    {field:<{width}} = {json.dumps(value)}\n")
+    out.write("}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate param-analysis.txt and minimal-parameter-template.txt")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--analysis", default="param-analysis.txt")
+    parser.add_argument("--template", default="minimal-parameter-template.txt")
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        statistics = FieldStatistics.from_export(fp)
+    name = args.export.replace("\\", "/").rsplit("/", 1)[-1]
+    with open(args.analysis, "w") as out:
+        write_analysis(statistics, out, name)
+    with open(args.template, "w") as out:
+        write_template(statistics, out, name)
+    print(f"{statistics.repos()} repos, {len(statistics.values)} distinct values; "
+          f"wrote {args.analysis} and {args.template}")
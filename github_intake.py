@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_URL = "https://api.github.com"
+
+# ```json fenced blocks of an issue body; each holds one builder row or a list of rows
+_FENCED_JSON = re.compile(r"```json\s*\n(.*?)\n```", re.DOTALL)
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class OnboardingRequest(NamedTuple):
+    repo: str
+    number: int
+    title: str
+    body: str
+    updated_at: str
+    url: str
+
+
+class IntakeRow(NamedTuple):
+    request: OnboardingRequest
+    # RepositoryStructureBuilder.add_rows input, or None with `error` set
+    row: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+
+class CursorStore:
+    """`since` cursors and list validators per intake repo, persisted as JSON between runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.cursors: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            with open(path) as fp:
+                self.cursors = json.load(fp)
+
+    def get(self, repo: str) -> Dict[str, str]:
+        return self.cursors.setdefault(repo, {})
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fp:
+            json.dump(self.cursors, fp, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+class RateBudget:
+    """Rate-limit state shared by every poller of one token.
+
+    Updated from the X-RateLimit-* headers of each response. Once fewer than
+    `reserve` calls remain, callers wait for the reset; a secondary limit
+    (403/429 with Retry-After) backs everyone off for that long.
+    """
+
+    def __init__(self, reserve: int = 100, max_wait: float = 900):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.calls = 0
+        self.conditional_hits = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            until = self._blocked_until
+            if self.remaining is not None and self.remaining <= self.reserve:
+                until = max(until, self.reset_at)
+        delay = until - time.time()
+        if delay > 0:
+            if delay > self.max_wait:
+                raise RuntimeError(f"GitHub rate limit resets in {delay:.0f}s, beyond max_wait")
+            time.sleep(delay)
+
+    def update(self, response: requests.Response) -> None:
+        with self._lock:
+            self.calls += 1
+            if response.status_code == 304:
+                # Conditional hits are not charged against the rate limit
+                self.conditional_hits += 1
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                self.remaining = int(remaining)
+                self.reset_at = float(response.headers.get("X-RateLimit-Reset", 0))
+            if response.status_code in (403, 429):
+                retry_after = response.headers.get("Retry-After")
+                if retry_after is not None:
+                    self._blocked_until = time.time() + float(retry_after)
+                elif self.remaining == 0:
+                    self._blocked_until = self.reset_at
+
+
+def parse_rows(request: OnboardingRequest) -> Iterator[IntakeRow]:
+    """Builder rows from the ```json blocks of a request body; bad blocks are yielded as errors."""
+    for block in _FENCED_JSON.findall(request.body or ""):
+        try:
+            parsed = json.loads(block)
+        except ValueError as e:
+            yield IntakeRow(request, None, f"invalid JSON: {e}")
+            continue
+        for row in parsed if isinstance(parsed, list) else [parsed]:
+            if not isinstance(row, dict) or "package_type" not in row or "key" not in row:
+                yield IntakeRow(request, None, "a row needs at least package_type and key")
+            else:
+                yield IntakeRow(request, row, None)
+
+
+class GitHubIntake:
+    """Incremental poller of onboarding issues across several intake repos.
+
+    Each poll lists only issues updated since the repo's persisted cursor and
+    sends the ETag/Last-Modified of the previous listing, so an unchanged
+    repo costs one 304 that GitHub does not charge to the rate limit. The
+    cursor advances past the newest issue seen, and RateBudget paces every
+    call made with the shared token.
+    """
+
+    def __init__(
+        self,
+        repos: Iterable[str],
+        cursors: CursorStore,
+        token: Optional[str] = None,
+        label: Optional[str] = "onboarding",
+        base_url: str = GITHUB_URL,
+        budget: Optional[RateBudget] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        self.repos = list(repos)
+        self.cursors = cursors
+        self.label = label
+        self.base_url = base_url.rstrip("/")
+        self.budget = budget or RateBudget()
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=4, max_retries=0))
+            session.mount("http://", HTTPAdapter(pool_maxsize=4, max_retries=0))
+        session.headers["Accept"] = "application/vnd.github+json"
+        if token:
+            session.headers["Authorization"] = f"Bearer {token}"
+        self.session = session
+
+    def _get(self, url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        for attempt in range(5):
+            self.budget.wait()
+            response = self.session.get(url, headers=headers, params=params, timeout=30)
+            self.budget.update(response)
+            if response.status_code not in (403, 429, 502, 503) or attempt == 4:
+                return response
+            # RateBudget.update() already blocks callers until a signalled limit lifts
+            limited = "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0"
+            if response.status_code == 403 and not limited:
+                # A permission error, not a limit
+                return response
+            response.close()
+            if response.status_code >= 500 or not limited:
+                time.sleep(2 ** attempt)
+        raise AssertionError("unreachable")
+
+    def _list(self, repo: str) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        cursor = self.cursors.get(repo)
+        params = {"state": "all", "sort": "updated", "direction": "asc", "per_page": 100}
+        if self.label:
+            params["labels"] = self.label
+        if cursor.get("since"):
+            params["since"] = cursor["since"]
+        headers = {}
+        if cursor.get("etag"):
+            headers["If-None-Match"] = cursor["etag"]
+        if cursor.get("last_modified"):
+            headers["If-Modified-Since"] = cursor["last_modified"]
+        response = self._get(f"{self.base_url}/repos/{repo}/issues", headers, params)
+        if response.status_code == 304:
+            return [], {}
+        response.raise_for_status()
+        validators = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+        }
+        issues = response.json()
+        next_url = _next_link(response)
+        while next_url:
+            page = self._get(next_url, {})
+            page.raise_for_status()
+            issues.extend(page.json())
+            next_url = _next_link(page)
+        return issues, validators
+
+    def poll(self) -> Iterator[OnboardingRequest]:
+        """Requests created or updated since the last poll, oldest first per repo; cursors saved per repo."""
+        for repo in self.repos:
+            issues, validators = self._list(repo)
+            cursor = self.cursors.get(repo)
+            since = cursor.get("since", "")
+            seen = set(cursor.get("seen", "").split(","))
+            for issue in issues:
+                # `since` is inclusive, so the newest issues of the last poll come back once more
+                if issue["updated_at"] == since and str(issue["number"]) in seen:
+                    continue
+                yield OnboardingRequest(
+                    repo, issue["number"], issue["title"], issue.get("body") or "", issue["updated_at"],
+                    issue["html_url"],
+                )
+            newest = max((issue["updated_at"] for issue in issues), default=since)
+            if newest != since:
+                cursor["since"] = newest
+                cursor["seen"] = ",".join(str(i["number"]) for i in issues if i["updated_at"] == newest)
+                # Validators only hold for the URL they came with, which has the old `since`
+                cursor.pop("etag", None)
+                cursor.pop("last_modified", None)
+            elif validators:
+                cursor.update(validators)
+            self.cursors.save()
+
+    def rows(self) -> Iterator[IntakeRow]:
+        """Builder rows of every new or updated request, streamed as each repo is polled."""
+        for request in self.poll():
+            yield from parse_rows(request)
+
+
+def _next_link(response: requests.Response) -> Optional[str]:
+    match = _NEXT_LINK.search(response.headers.get("Link", ""))
+    return match.group(1) if match else None
+
+
+if __name__ == "__main__":
+    from structure import RepositoryStructureBuilder, to_json
+
+    parser = argparse.ArgumentParser(description="Pull new onboarding requests from GitHub intake repos")
+    parser.add_argument("repos", nargs="+", help="owner/name of each intake repo")
+    parser.add_argument("--cursors", default=".intake-cursors.json")
+    parser.add_argument("--label", default="onboarding")
+    parser.add_argument("--url", default=GITHUB_URL)
+    args = parser.parse_args()
+
+    intake = GitHubIntake(args.repos, CursorStore(args.cursors), token=os.environ.get("GITHUB_TOKEN"),
+                          label=args.label, base_url=args.url)
+    builder = RepositoryStructureBuilder()
+    for item in intake.rows():
+        if item.error:
+            print(f"{item.request.url}: {item.error}")
+            continue
+        try:
+            builder.add_rows([item.row])
+        except ValueError as e:
+            print(f"{item.request.url}: {e}")
+    print(to_json(builder.build()))
+    print(f"{intake.budget.calls} API calls, {intake.budget.conditional_hits} answered 304, "
+          f"{intake.budget.remaining} remaining")
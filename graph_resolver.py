@@ -0,0 +1,279 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GRAPH_URL = "https://graph.microsoft.com/v1.0"
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+# Graph accepts at most 20 requests in one JSON $batch
+MAX_BATCH = 20
+
+USER_FIELDS = "id,displayName,mail,userPrincipalName"
+GROUP_FIELDS = "id,displayName,mail"
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire `ttl` seconds after they are set."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TokenCache:
+    """Reuses an azure-identity access token until shortly before it expires."""
+
+    def __init__(self, credential: Any, scope: str = GRAPH_SCOPE, margin: float = 300):
+        self.credential = credential
+        self.scope = scope
+        self.margin = margin
+        self.acquired = 0
+        self._token: Optional[str] = None
+        self._expires_on = 0.0
+        self._lock = threading.Lock()
+
+    def token(self) -> str:
+        with self._lock:
+            if self._token is None or time.time() >= self._expires_on - self.margin:
+                access = self.credential.get_token(self.scope)
+                self._token, self._expires_on = access.token, access.expires_on
+                self.acquired += 1
+            return self._token
+
+
+class GraphResolver:
+    """Resolves the AD users, groups and group members named in onboarding requests.
+
+    Lookups that miss the TTL+LRU caches are sent as JSON $batch requests of
+    up to 20, several batches at a time, over one pooled session. Throttled
+    requests inside a batch are retried in a later batch after the largest
+    Retry-After. The access token is reused until it nears expiry.
+    `credential` is any azure-identity credential; it defaults to
+    DefaultAzureCredential, imported only then.
+    """
+
+    def __init__(
+        self,
+        credential: Any = None,
+        base_url: str = GRAPH_URL,
+        max_workers: int = 4,
+        cache_size: int = 50_000,
+        cache_ttl: float = 3600,
+        retries: int = 4,
+        max_delay: float = 60.0,
+        session: Optional[requests.Session] = None,
+    ):
+        if credential is None:
+            from azure.identity import DefaultAzureCredential
+
+            credential = DefaultAzureCredential()
+        self.tokens = TokenCache(credential)
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.retries = retries
+        self.max_delay = max_delay
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.round_trips = 0
+        self._lock = threading.Lock()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "GraphResolver":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _post_batch(self, batch: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        body = {"requests": [{"id": request_id, "method": "GET", "url": url} for request_id, url in batch]}
+        for attempt in range(self.retries + 1):
+            response = self.session.post(
+                f"{self.base_url}/$batch",
+                json=body,
+                headers={"Authorization": f"Bearer {self.tokens.token()}"},
+                timeout=60,
+            )
+            with self._lock:
+                self.round_trips += 1
+            if response.status_code in (429, 503, 504) and attempt < self.retries:
+                time.sleep(self._delay(response.headers, 2 ** attempt))
+                continue
+            response.raise_for_status()
+            return {item["id"]: item for item in response.json()["responses"]}
+        raise AssertionError("unreachable")
+
+    def _delay(self, headers: Dict[str, str], default: float) -> float:
+        # Retry-After in seconds, capped at max_delay; HTTP-date or unparsable values fall back to `default`
+        try:
+            delay = float(headers.get("Retry-After", default))
+        except ValueError:
+            delay = default
+        return min(max(delay, 0.0), self.max_delay)
+
+    def batch_get(self, urls: Dict[str, str]) -> Dict[str, Tuple[int, Any]]:
+        """GET every relative URL of {request id: url} through $batch; returns {request id: (status, body)}."""
+        results: Dict[str, Tuple[int, Any]] = {}
+        pending = list(urls.items())
+        for attempt in range(self.retries + 1):
+            if not pending:
+                break
+            batches = [pending[i:i + MAX_BATCH] for i in range(0, len(pending), MAX_BATCH)]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                responses = list(pool.map(self._post_batch, batches))
+            retry = []
+            delay = 0.0
+            for batch, batch_responses in zip(batches, responses):
+                for request_id, url in batch:
+                    item = batch_responses.get(request_id, {"status": 500})
+                    status = item["status"]
+                    if status in (429, 503) and attempt < self.retries:
+                        retry.append((request_id, url))
+                        delay = max(delay, self._delay(item.get("headers") or {}, 1))
+                    else:
+                        results[request_id] = (status, item.get("body"))
+            pending = retry
+            if pending:
+                time.sleep(delay)
+        return results
+
+    def _resolve(self, kind: str, names: Iterable[str], url_for) -> Dict[str, Optional[Dict[str, Any]]]:
+        # Cached lookup of one object kind; misses are fetched in batches and cached, 404s as None
+        resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+        urls: Dict[str, str] = {}
+        queued = set()
+        for name in names:
+            if name in resolved or name in queued:
+                continue
+            cached = self.cache.get((kind, name.lower()), _MISSING)
+            if cached is not _MISSING:
+                resolved[name] = cached
+            else:
+                queued.add(name)
+                urls[str(len(urls))] = name
+        fetched = self.batch_get({request_id: url_for(name) for request_id, name in urls.items()})
+        for request_id, name in urls.items():
+            status, body = fetched[request_id]
+            if status == 200:
+                if "value" in body:
+                    if len(body["value"]) > 1:
+                        ids = ", ".join(item["id"] for item in body["value"])
+                        raise ValueError(f"Graph {kind} name {name!r} is ambiguous: matches {ids}")
+                    value = body["value"][0] if body["value"] else None
+                else:
+                    value = body
+            elif status == 404:
+                value = None
+            else:
+                raise requests.HTTPError(f"Graph lookup of {kind} {name!r} failed with HTTP {status}: {body}")
+            self.cache.set((kind, name.lower()), value)
+            resolved[name] = value
+        return resolved
+
+    def resolve_users(self, users: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """User objects by object id or user principal name; None for unknown users."""
+        return self._resolve(
+            "user", users, lambda name: f"/users/{quote(name)}?$select={USER_FIELDS}",
+        )
+
+    def resolve_groups(self, groups: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Group objects by object id or display name; None for unknown groups.
+
+        Raises ValueError if a display name matches more than one group.
+        """
+        def url_for(name: str) -> str:
+            if _is_object_id(name):
+                return f"/groups/{name}?$select={GROUP_FIELDS}"
+            query = "displayName eq '" + name.replace("'", "''") + "'"
+            return f"/groups?$filter={quote(query)}&$select={GROUP_FIELDS}"
+
+        return self._resolve("group", groups, url_for)
+
+    def group_members(self, group_ids: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Direct user members of each group id; pages past the first are fetched one by one.
+
+        Raises requests.HTTPError if a group cannot be read, unknown ids included.
+        """
+        members: Dict[str, List[Dict[str, Any]]] = {}
+        urls: Dict[str, str] = {}
+        queued = set()
+        for group_id in group_ids:
+            cached = self.cache.get(("members", group_id), _MISSING)
+            if cached is not _MISSING:
+                members[group_id] = cached
+            elif group_id not in queued:
+                queued.add(group_id)
+                urls[str(len(urls))] = group_id
+        fetched = self.batch_get({
+            request_id: f"/groups/{group_id}/members/microsoft.graph.user?$select={USER_FIELDS}&$top=999"
+            for request_id, group_id in urls.items()
+        })
+        for request_id, group_id in urls.items():
+            status, body = fetched[request_id]
+            if status != 200:
+                raise requests.HTTPError(
+                    f"Graph lookup of members of group {group_id!r} failed with HTTP {status}: {body}"
+                )
+            value = list(body.get("value", []))
+            next_link = body.get("@odata.nextLink")
+            while next_link:
+                response = self.session.get(
+                    next_link, headers={"Authorization": f"Bearer {self.tokens.token()}"}, timeout=60,
+                )
+                with self._lock:
+                    self.round_trips += 1
+                response.raise_for_status()
+                page = response.json()
+                value.extend(page.get("value", []))
+                next_link = page.get("@odata.nextLink")
+            for user in value:
+                self.cache.set(("user", user["id"].lower()), user)
+            self.cache.set(("members", group_id), value)
+            members[group_id] = value
+        return members
+
+
+def _is_object_id(name: str) -> bool:
+    parts = name.split("-")
+    return [len(p) for p in parts] == [8, 4, 4, 4, 12] and all(
+        c in "0123456789abcdefABCDEF" for p in parts for c in p
+    )
@@ -0,0 +1,259 @@
+import argparse
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import IO, TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from structure import REPO_CONFIGS
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+# (section, package_type, repo_name) a key is stored under
+KeyLocation = Tuple[str, str, str]
+
+
+class KeyCheck(NamedTuple):
+    key: str
+    # Location of this exact key, if taken
+    taken: Optional[KeyLocation]
+    # Existing keys equal to `key` ignoring case
+    case_collisions: Tuple[str, ...]
+    # Existing keys within the edit distance bound, closest first
+    similar: Tuple[Tuple[str, int], ...]
+
+
+def bounded_distance(a: str, b: str, bound: int) -> int:
+    """Levenshtein distance of a and b, or bound + 1 once it must exceed `bound`.
+
+    Only the diagonal band of width 2 * bound + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    # Similar keys mostly differ in a short stretch; drop the common ends first
+    shorter = min(len(a), len(b))
+    start = 0
+    while start < shorter and a[start] == b[start]:
+        start += 1
+    tail = 0
+    while tail < shorter - start and a[-1 - tail] == b[-1 - tail]:
+        tail += 1
+    a = a[start:len(a) - tail]
+    b = b[start:len(b) - tail]
+    if not a or not b:
+        return min(len(a) + len(b), bound + 1)
+    if len(a) == 1 and len(b) == 1:
+        return min(1, bound + 1)
+    if len(a) > len(b):
+        a, b = b, a
+    over = bound + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        low = max(1, i - bound)
+        high = min(len(b), i + bound)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= bound else over
+        best = current[0]
+        ca = a[i - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > bound:
+            return over
+        previous = current
+    return min(previous[len(b)], over)
+
+
+def _segments(length: int, parts: int) -> List[Tuple[int, int]]:
+    # (start, length) of `parts` near-equal segments of a string of `length` characters
+    base, extra = divmod(length, parts)
+    segments = []
+    start = 0
+    for i in range(parts):
+        size = base + (1 if i < extra else 0)
+        segments.append((start, size))
+        start += size
+    return segments
+
+
+class KeyIndex:
+    """Global index of repository keys across every section and package type.
+
+    Exact and case-insensitive lookups are dict hits, prefix search is a
+    bisect over the sorted lowercased keys, and "did you mean" uses a
+    segment index: each key is cut into 2 * max_distance + 1 segments, and a
+    key within max_distance edits of a query keeps at least max_distance + 1
+    of them intact at a position shifted by at most max_distance. Only keys
+    sharing that many segments with the query are compared with a banded
+    edit distance. Every structure is updated in place by add() and remove().
+    """
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._parts = 2 * max_distance + 1
+        self.locations: Dict[str, KeyLocation] = {}
+        self._folded: Dict[str, Set[str]] = {}
+        self._sorted: List[str] = []
+        # (length, segment number, segment text) -> lowercased keys
+        self._segments: Dict[Tuple[int, int, str], Set[str]] = {}
+        # Keys too short to cut into segments, compared one by one
+        self._short: Set[str] = set()
+
+    @classmethod
+    def from_structure(cls, structure: "RepositoryStructure", **options) -> "KeyIndex":
+        index = cls(**options)
+        for section, config_classes in REPO_CONFIGS.items():
+            container = getattr(structure, section)
+            for package_type in config_classes:
+                for name, repo in getattr(container, package_type).items():
+                    index.add(repo.key, section, package_type, name)
+        return index
+
+    @classmethod
+    def from_export(cls, fp: IO[str], **options) -> "KeyIndex":
+        """Index an export without building models, so unmodelled package types are included."""
+        from loader import SECTIONS, iter_repositories
+
+        index = cls(**options)
+        for entry in iter_repositories(fp, sections=SECTIONS, typed=False):
+            index.add(entry.config["key"], entry.section, entry.package_type, entry.name)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.locations
+
+    def get(self, key: str) -> Optional[KeyLocation]:
+        return self.locations.get(key)
+
+    def add(self, key: str, section: str, package_type: str, repo_name: Optional[str] = None) -> None:
+        if key in self.locations:
+            raise ValueError(f"Repository key already in use: {key} ({'/'.join(self.locations[key])})")
+        self.locations[key] = (section, package_type, repo_name if repo_name is not None else key)
+        folded = key.lower()
+        keys = self._folded.setdefault(folded, set())
+        if not keys:
+            insort(self._sorted, folded)
+            self._index_segments(folded, add=True)
+        keys.add(key)
+
+    def remove(self, key: str) -> None:
+        del self.locations[key]
+        folded = key.lower()
+        keys = self._folded[folded]
+        keys.discard(key)
+        if not keys:
+            del self._folded[folded]
+            del self._sorted[bisect_left(self._sorted, folded)]
+            self._index_segments(folded, add=False)
+
+    def _index_segments(self, folded: str, add: bool) -> None:
+        if len(folded) < self._parts:
+            (self._short.add if add else self._short.discard)(folded)
+            return
+        for number, (start, size) in enumerate(_segments(len(folded), self._parts)):
+            slot = (len(folded), number, folded[start:start + size])
+            if add:
+                self._segments.setdefault(slot, set()).add(folded)
+            else:
+                bucket = self._segments[slot]
+                bucket.discard(folded)
+                if not bucket:
+                    del self._segments[slot]
+
+    def case_collisions(self, key: str) -> List[str]:
+        """Existing keys equal to `key` ignoring case, other than `key` itself."""
+        return sorted(k for k in self._folded.get(key.lower(), ()) if k != key)
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Keys starting with `prefix`, ignoring case, in sorted order."""
+        prefix = prefix.lower()
+        found: List[str] = []
+        position = bisect_left(self._sorted, prefix)
+        while position < len(self._sorted) and (limit is None or len(found) < limit):
+            folded = self._sorted[position]
+            if not folded.startswith(prefix):
+                break
+            found.extend(sorted(self._folded[folded]))
+            position += 1
+        return found[:limit] if limit is not None else found
+
+    def similar(self, key: str, max_distance: Optional[int] = None, limit: int = 5) -> List[Tuple[str, int]]:
+        """Existing keys within `max_distance` case-insensitive edits of `key`, closest first.
+
+        The key itself and its case variants are not included.
+        """
+        bound = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        query = key.lower()
+        # Lowercased key -> segments matched; short keys are always compared
+        candidates: Dict[str, int] = dict.fromkeys(self._short, self._parts)
+        for length in range(max(len(query) - bound, self._parts), len(query) + bound + 1):
+            hits: Counter = Counter()
+            for number, (start, size) in enumerate(_segments(length, self._parts)):
+                matched: Set[str] = set()
+                for shift in range(-bound, bound + 1):
+                    begin = start + shift
+                    if begin < 0 or begin + size > len(query):
+                        continue
+                    bucket = self._segments.get((length, number, query[begin:begin + size]))
+                    if bucket:
+                        matched.update(bucket)
+                hits.update(matched)
+            for folded, count in hits.items():
+                if count >= self._parts - bound and count > candidates.get(folded, 0):
+                    candidates[folded] = count
+        candidates.pop(query, None)
+        # Keys sharing the most segments tend to be closest; once `limit` keys
+        # are found, the bound drops to the farthest of them, and so does the
+        # number of segments a candidate must share
+        scored: List[Tuple[str, int]] = []
+        for folded in sorted(candidates, key=candidates.__getitem__, reverse=True):
+            if candidates[folded] < self._parts - bound:
+                break
+            distance = bounded_distance(query, folded, bound)
+            if distance <= bound:
+                scored.extend((original, distance) for original in self._folded[folded])
+                if len(scored) >= limit:
+                    scored.sort(key=lambda item: (item[1], item[0]))
+                    del scored[limit:]
+                    bound = scored[-1][1]
+        scored.sort(key=lambda item: (item[1], item[0]))
+        return scored[:limit]
+
+    def check(self, key: str) -> KeyCheck:
+        return KeyCheck(key, self.get(key), tuple(self.case_collisions(key)), tuple(self.similar(key)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check proposed repository keys against an export")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("keys", nargs="*", help="proposed keys; without any, near-duplicates in the export are listed")
+    parser.add_argument("--distance", type=int, default=2)
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        index = KeyIndex.from_export(fp, max_distance=args.distance)
+    if args.keys:
+        for key in args.keys:
+            result = index.check(key)
+            status = f"taken by {'/'.join(result.taken)}" if result.taken else "free"
+            print(f"{key}: {status}")
+            for other in result.case_collisions:
+                print(f"  differs only in case from {other}")
+            for other, distance in result.similar:
+                print(f"  did you mean {other}? ({distance} edit{'s' if distance > 1 else ''})")
+    else:
+        reported = set()
+        for key in sorted(index.locations):
+            for other, distance in index.similar(key, max_distance=1):
+                pair = tuple(sorted((key, other)))
+                if pair not in reported:
+                    reported.add(pair)
+                    print(f"{pair[0]} ~ {pair[1]} ({distance})")
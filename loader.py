@@ -0,0 +1,271 @@
+import json
+import random
+from functools import lru_cache
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from serialization import PYDANTIC_V2, load_json
+from structure import REPO_CONFIGS, field_is_required, model_fields
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+SECTIONS = ("local_repositories", "remote_repositories", "virtual_repositories")
+
+_WHITESPACE = " \t\r\n"
+
+
+# One repository read from an export
+class RepoEntry(NamedTuple):
+    section: str
+    package_type: str
+    name: str
+    config: Union[BaseModel, Dict[str, Any]]
+
+
+# Incremental reader over a JSON text stream. Only the value currently being
+# decoded is held in memory, never the whole document.
+class _JsonStream:
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in export, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def members(self) -> Iterator[str]:
+        # Yields each key of an object; the caller must consume the value
+        # before asking for the next key.
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' in export, found {char or 'end of file'!r}")
+
+
+VALIDATION_MODES = ("full", "trusted", "sampled")
+
+
+# Precomputed per class for pydantic 1: the declared field names, the required
+# ones and the fields holding nested models
+@lru_cache(maxsize=None)
+def _construct_plan(config_cls: Type[BaseModel]):
+    required = set()
+    nested: Dict[str, Type[BaseModel]] = {}
+    for name, field in model_fields(config_cls).items():
+        annotation = getattr(field, "annotation", None) or getattr(field, "outer_type_", None)
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            nested[name] = annotation
+        if field_is_required(field):
+            required.add(name)
+    return frozenset(model_fields(config_cls)), frozenset(required), nested
+
+
+def trusted_construct(config_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """Build a model from known-good data as fast as the installed pydantic allows.
+
+    On pydantic 1 validation is skipped: keys the model does not declare are
+    dropped, as validation would, and values are taken as-is, so this is only
+    for data Artifactory produced. On pydantic 2 validating in pydantic-core
+    is faster than model_construct, so the data is simply validated.
+    """
+    if PYDANTIC_V2:
+        return validated_construct(config_cls, data)
+    names, required, nested = _construct_plan(config_cls)
+    keys = data.keys()
+    missing = required - keys
+    if missing:
+        raise ValueError(f"{config_cls.__name__} is missing required fields: {sorted(missing)}")
+    if nested:
+        data = dict(data)
+        for name, nested_cls in nested.items():
+            if isinstance(data.get(name), dict):
+                data[name] = trusted_construct(nested_cls, data[name])
+    return config_cls.construct(_fields_set=keys & names, **{k: data[k] for k in keys & names})
+
+
+def validated_construct(config_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """Build a model with full validation, straight from the dict rather than as keyword arguments."""
+    validate = getattr(config_cls, "model_validate", None) or config_cls.parse_obj
+    return validate(data)
+
+
+# Decides, per repository, whether its config is validated or trusted
+class _ConfigBuilder:
+    def __init__(self, validation: str, sample_rate: float, sample_min_per_type: int, seed: Optional[int]):
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"Unsupported validation mode: {validation}")
+        self._validation = validation
+        self._sample_rate = sample_rate
+        self._sample_min_per_type = sample_min_per_type
+        self._random = random.Random(seed)
+        self._validated: Dict[Tuple[str, str], int] = {}
+
+    def _should_validate(self, section: str, package_type: str) -> bool:
+        if self._validation == "full":
+            return True
+        if self._validation == "trusted":
+            return False
+        # The first few of every type are always validated so rare types are covered
+        seen = self._validated.get((section, package_type), 0)
+        if seen < self._sample_min_per_type or self._random.random() < self._sample_rate:
+            self._validated[(section, package_type)] = seen + 1
+            return True
+        return False
+
+    def build(self, section: str, package_type: str, data: Dict[str, Any]) -> Union[BaseModel, Dict[str, Any]]:
+        config_cls = REPO_CONFIGS.get(section, {}).get(package_type)
+        if config_cls is None:
+            # Remote repositories and package types structure.py does not model yet
+            return data
+        if self._should_validate(section, package_type):
+            return validated_construct(config_cls, data)
+        return trusted_construct(config_cls, data)
+
+
+def iter_repositories(
+    fp: IO[str],
+    sections: Iterable[str] = SECTIONS,
+    typed: bool = True,
+    chunk_size: int = 64 * 1024,
+    validation: str = "full",
+    sample_rate: float = 0.05,
+    sample_min_per_type: int = 1,
+    seed: Optional[int] = None,
+) -> Iterator[RepoEntry]:
+    """Yield every repository of an export one at a time.
+
+    The export is read in chunks and only one repository object is decoded at
+    a time, so memory stays flat however large the export is. With typed=True
+    each config is built as its *RepoConfig model; types without a model are
+    yielded as plain dicts.
+
+    validation="trusted" builds models without validation on pydantic 1, for
+    exports Artifactory itself produced; on pydantic 2 it validates, which is
+    faster there. validation="sampled" fully validates only a
+    `sample_rate` fraction of repositories, plus the first `sample_min_per_type`
+    of every package type, and trusts the rest.
+    """
+    builder = _ConfigBuilder(validation, sample_rate, sample_min_per_type, seed)
+    wanted = set(sections)
+    stream = _JsonStream(fp, chunk_size)
+    for section in stream.members():
+        if stream.peek() != "{":
+            stream.value()
+            continue
+        for package_type in stream.members():
+            for name in stream.members():
+                data = stream.value()
+                if section not in wanted:
+                    continue
+                config = builder.build(section, package_type, data) if typed else data
+                yield RepoEntry(section, package_type, name, config)
+    if stream.peek():
+        raise ValueError("Unexpected data after the end of the export")
+
+
+def load_repository_structure(
+    fp: IO[str],
+    structure: "Optional[RepositoryStructure]" = None,
+    chunk_size: int = 64 * 1024,
+    **validation_options: Any,
+) -> "RepositoryStructure":
+    """Stream an export into a RepositoryStructure, filling `structure` in place if given.
+
+    Repositories RepositoryStructure has no field for (remotes, unmodelled
+    package types) are skipped, as they are when loading the export whole.
+    validation_options are passed to iter_repositories.
+    """
+    if structure is None:
+        from structure import RepositoryStructure
+
+        structure = RepositoryStructure()
+    for entry in iter_repositories(fp, sections=REPO_CONFIGS, chunk_size=chunk_size, **validation_options):
+        if isinstance(entry.config, dict):
+            continue
+        container = getattr(structure, entry.section)
+        getattr(container, entry.package_type)[entry.name] = entry.config
+    return structure
+
+
+def load_repository_structure_full(
+    fp: IO[str],
+    validation: str = "full",
+    sample_rate: float = 0.05,
+    sample_min_per_type: int = 1,
+    seed: Optional[int] = None,
+) -> "RepositoryStructure":
+    """Load an export in one piece; the whole document is held in memory.
+
+    validation takes the same modes as iter_repositories.
+    """
+    if validation == "full":
+        return load_json(fp.read())
+    data = json.load(fp)
+    from structure import RepositoryStructure
+
+    builder = _ConfigBuilder(validation, sample_rate, sample_min_per_type, seed)
+    structure = RepositoryStructure()
+    for section, config_classes in REPO_CONFIGS.items():
+        container = getattr(structure, section)
+        for package_type, repos in data.get(section, {}).items():
+            if package_type not in config_classes:
+                continue
+            target = getattr(container, package_type)
+            for name, repo in repos.items():
+                target[name] = builder.build(section, package_type, repo)
+    return structure
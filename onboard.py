@@ -0,0 +1,248 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import IO, Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from structure import build_repo
+from validation import Validator
+
+# Only the standard library, pydantic and the modules above are imported on
+# the common path; repo_diff, tfvars and github_intake (and with it requests)
+# are imported by the subcommands and options that need them.
+
+
+class RowError(NamedTuple):
+    # Line of the request file (CSV counts its header as line 1), or the issue URL
+    source: str
+    key: Optional[str]
+    message: str
+
+
+class OnboardStats(NamedTuple):
+    rows: int
+    written: int
+    errors: int
+    warnings: int
+
+
+def _cell(value: str) -> Any:
+    # CSV cells are strings; lists, objects and booleans may be given as JSON.
+    # Numbers are left to the models, so keys like "123" stay strings
+    if value[:1] in "[{\"" or value in ("true", "false", "null"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def read_rows(fp: IO[str], fmt: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (line, row, error) for each request of a JSONL or CSV stream, one at a time.
+
+    JSONL rows are objects like RepositoryStructureBuilder.add_rows input;
+    blank lines and lines starting with # are skipped. CSV needs a header
+    with at least key and package_type; empty cells are left out.
+    """
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(fp), 2):
+            yield str(number), {k: _cell(v) for k, v in record.items() if k and v not in ("", None)}, None
+        return
+    for number, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield str(number), None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield str(number), None, "a row must be a JSON object"
+        else:
+            yield str(number), row, None
+
+
+class _JsonlSink:
+    # One add_rows-style line per repo, fields left at their defaults omitted
+    def __init__(self, out: IO[str]):
+        from repo_diff import normalized_fields
+
+        self.out = out
+        self._normalized = normalized_fields
+        self.count = 0
+
+    def add(self, section: str, package_type: str, name: str, repo: BaseModel) -> None:
+        row = {"rclass": section.split("_")[0], "package_type": package_type}
+        if name != repo.key:
+            row["repo_name"] = name
+        row.update(self._normalized(repo))
+        self.out.write(json.dumps(row) + "\n")
+        self.count += 1
+
+    def finish(self) -> int:
+        return self.count
+
+
+def onboard(
+    rows: Iterable[Tuple[str, Optional[Dict[str, Any]], Optional[str]]],
+    validator: Validator,
+    sink=None,
+    report=None,
+) -> OnboardStats:
+    """Build, validate and write each row as it is read.
+
+    Rows that fail to build, reuse a key, or break a per-repo rule with an
+    error are reported and not written. Cross-repo rules (virtual members,
+    default_deployment_repo) can only be resolved once every row is read, so
+    their violations are reported at the end; the output must not be applied
+    when any error was reported.
+    """
+    report = report or (lambda item: None)
+    count = written = errors = warnings = 0
+    for source, row, error in rows:
+        count += 1
+        key = row.get("key") if row else None
+        if error is None:
+            try:
+                section, package_type, name, repo = build_repo(row)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            errors += 1
+            report(RowError(source, key, error))
+            continue
+        # Every field of the built repo, defaults included, is what gets applied
+        dump = repo.model_dump if hasattr(repo, "model_dump") else repo.dict
+        validator.add(section, package_type, dump())
+        failed = False
+        for violation in validator.violations:
+            report(violation)
+            if violation.severity == "error":
+                errors += 1
+                failed = True
+            else:
+                warnings += 1
+        # Reported already; finish() then returns only the cross-repo violations
+        validator.violations.clear()
+        if failed or sink is None:
+            continue
+        try:
+            sink.add(section, package_type, name, repo)
+            written += 1
+        except ValueError as e:
+            errors += 1
+            report(RowError(source, repo.key, str(e)))
+    for violation in validator.finish():
+        report(violation)
+        if violation.severity == "error":
+            errors += 1
+        else:
+            warnings += 1
+    if sink is not None:
+        sink.finish()
+    return OnboardStats(count, written, errors, warnings)
+
+
+def _print_report(item) -> None:
+    if isinstance(item, RowError):
+        print(f"{item.source}: {item.key + ': ' if item.key else ''}{item.message}", file=sys.stderr)
+    else:
+        print(f"{item.severity} {item.rule} {item.key}: {item.message}", file=sys.stderr)
+
+
+def _validator(existing: Optional[str]) -> Validator:
+    validator = Validator()
+    if existing:
+        from loader import SECTIONS, iter_repositories
+
+        with open(existing) as fp:
+            for entry in iter_repositories(fp, sections=SECTIONS, typed=False):
+                validator.known(entry.section, entry.package_type, entry.config["key"])
+    return validator
+
+
+def _sink(fmt: str, out: IO[str]):
+    if fmt == "jsonl":
+        return _JsonlSink(out)
+    from tfvars import TfvarsWriter
+
+    return TfvarsWriter(out)
+
+
+def _run(args: argparse.Namespace, rows) -> OnboardStats:
+    validator = _validator(args.existing)
+    if getattr(args, "out", None) is None:
+        return onboard(rows, validator, report=_print_report)
+    if args.out == "-":
+        return onboard(rows, validator, _sink(args.format, sys.stdout), _print_report)
+    # Write next to the target and only rename it there once every row passed,
+    # so a failed or interrupted run leaves the previous output in place
+    partial = args.out + ".partial"
+    try:
+        with open(partial, "w") as out:
+            stats = onboard(rows, validator, _sink(args.format, out), _print_report)
+    except BaseException:
+        os.remove(partial)
+        raise
+    if stats.errors:
+        os.remove(partial)
+        print(f"{args.out} not written", file=sys.stderr)
+    else:
+        os.replace(partial, args.out)
+    return stats
+
+
+def _file_rows(args: argparse.Namespace):
+    fmt = args.input_format or ("csv" if args.requests.endswith(".csv") else "jsonl")
+    if args.requests == "-":
+        yield from read_rows(sys.stdin, fmt)
+        return
+    with open(args.requests, newline="") as fp:
+        yield from read_rows(fp, fmt)
+
+
+def _github_rows(args: argparse.Namespace):
+    from github_intake import GITHUB_URL, CursorStore, GitHubIntake
+
+    intake = GitHubIntake(args.repos, CursorStore(args.cursors), token=os.environ.get("GITHUB_TOKEN"),
+                          label=args.label, base_url=args.url or GITHUB_URL)
+    for item in intake.rows():
+        yield item.request.url, item.row, item.error
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Onboard repositories in bulk from request files or GitHub intake")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(command: argparse.ArgumentParser, output: bool) -> None:
+        command.add_argument("--existing", help="export of the current inventory, for members and key clashes")
+        if output:
+            command.add_argument("--out", default="-", help="output file, - for stdout (default)")
+            command.add_argument("--format", choices=("tfvars", "jsonl"), default="tfvars",
+                                 help="tfvars.json for Terraform, or normalized add_rows lines")
+
+    for name, help_text in (("build", "build, validate and write repos"), ("validate", "only validate")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("requests", help="JSONL or CSV request file, - for stdin")
+        command.add_argument("--input-format", choices=("jsonl", "csv"), help="default: from the file extension")
+        add_common(command, output=name == "build")
+    command = commands.add_parser("github", help="build repos from new GitHub intake requests")
+    command.add_argument("repos", nargs="+", help="owner/name of each intake repo")
+    command.add_argument("--cursors", default=".intake-cursors.json")
+    command.add_argument("--label", default="onboarding")
+    command.add_argument("--url", help="GitHub API URL")
+    add_common(command, output=True)
+    args = parser.parse_args(argv)
+
+    stats = _run(args, _github_rows(args) if args.command == "github" else _file_rows(args))
+    print(f"{stats.rows} rows, {stats.written} written, {stats.errors} errors, {stats.warnings} warnings",
+          file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+import argparse
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import IO, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+
+from loader import iter_repositories
+from structure import BaseRemoteRepoConfig
+
+
+# A remote repository to probe: its config (url, socket_timeout_millis, hard_fail,
+# offline, ...) plus the package type, which the config itself does not carry
+class RemoteTarget(BaseRemoteRepoConfig):
+    package_type: str
+
+
+class ProbeResult(BaseModel):
+    target: RemoteTarget
+    latencies_ms: List[float] = Field(default_factory=list)
+    failures: List[str] = Field(default_factory=list)
+
+    @property
+    def attempts(self) -> int:
+        return len(self.latencies_ms) + len(self.failures)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        # Nearest-rank percentile over successful probes
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class Recommendation(BaseModel):
+    key: str
+    package_type: str
+    action: str
+    current: Optional[int] = None
+    suggested: Optional[int] = None
+    reason: str
+
+
+def remote_targets(fp: IO[str]) -> List[RemoteTarget]:
+    """Read the probe-relevant fields of every remote with a URL from an export."""
+    targets = []
+    for entry in iter_repositories(fp, sections=["remote_repositories"], typed=False):
+        if entry.config.get("url"):
+            targets.append(RemoteTarget(package_type=entry.package_type, **entry.config))
+    return targets
+
+
+def _new_session(max_workers: int, hosts: int) -> requests.Session:
+    # One connection pool per host, each large enough for every worker
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max(hosts, 1), pool_maxsize=max_workers, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _probe_once(session: requests.Session, target: RemoteTarget, timeout_ms: int):
+    start = time.perf_counter()
+    try:
+        response = session.head(target.url, timeout=timeout_ms / 1000, allow_redirects=False)
+        response.close()
+    except requests.Timeout:
+        return None, f"timeout after {timeout_ms} ms"
+    except requests.RequestException as e:
+        return None, type(e).__name__
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code >= 500:
+        return None, f"HTTP {response.status_code}"
+    # Any other status, 404/405 included, means the upstream answered
+    return elapsed, None
+
+
+def probe_remotes(
+    targets: Iterable[RemoteTarget],
+    attempts: int = 3,
+    max_workers: int = 16,
+    timeout_ms: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+) -> List[ProbeResult]:
+    """Probe every remote URL `attempts` times through a bounded worker pool.
+
+    Each probe is a HEAD request bounded by the remote's own socket_timeout_millis
+    (or `timeout_ms` if smaller). Connections are pooled per host and reused
+    across remotes sharing an upstream.
+    """
+    results: Dict[str, ProbeResult] = {t.key: ProbeResult(target=t) for t in targets}
+    hosts = {urlsplit(r.target.url).netloc for r in results.values()}
+    own_session = session is None
+    if own_session:
+        session = _new_session(max_workers, len(hosts))
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for result in results.values():
+                limit = result.target.socket_timeout_millis
+                if timeout_ms is not None:
+                    limit = min(limit, timeout_ms)
+                for _ in range(attempts):
+                    futures[pool.submit(_probe_once, session, result.target, limit)] = result
+            for future in as_completed(futures):
+                latency, failure = future.result()
+                result = futures[future]
+                if failure is None:
+                    result.latencies_ms.append(latency)
+                else:
+                    result.failures.append(failure)
+    finally:
+        if own_session:
+            session.close()
+    return list(results.values())
+
+
+def recommend(
+    results: Iterable[ProbeResult],
+    headroom: float = 3.0,
+    min_timeout_ms: int = 2000,
+) -> List[Recommendation]:
+    """Turn probe results into offline and socket_timeout_millis recommendations.
+
+    A remote that never answered should be marked offline; one that answered
+    close to its timeout needs a longer one; one whose p99 times `headroom` is
+    well under its timeout can fail faster with a shorter one.
+    """
+    recommendations = []
+    for result in results:
+        target = result.target
+        p99 = result.percentile(99)
+        if p99 is None:
+            if not target.offline:
+                recommendations.append(Recommendation(
+                    key=target.key, package_type=target.package_type, action="mark_offline",
+                    reason=f"all {result.attempts} probes failed ({result.failures[0]})",
+                ))
+            continue
+        if target.offline:
+            recommendations.append(Recommendation(
+                key=target.key, package_type=target.package_type, action="mark_online",
+                reason=f"marked offline but answered with p99 {p99:.0f} ms",
+            ))
+            continue
+        suggested = max(min_timeout_ms, int(math.ceil(p99 * headroom / 1000)) * 1000)
+        current = target.socket_timeout_millis
+        if result.failures or p99 > current * 0.8:
+            if suggested > current:
+                recommendations.append(Recommendation(
+                    key=target.key, package_type=target.package_type, action="raise_socket_timeout",
+                    current=current, suggested=suggested,
+                    reason=f"p99 {p99:.0f} ms with {len(result.failures)}/{result.attempts} failed probes",
+                ))
+        elif suggested < current:
+            recommendations.append(Recommendation(
+                key=target.key, package_type=target.package_type, action="lower_socket_timeout",
+                current=current, suggested=suggested,
+                reason=f"p99 {p99:.0f} ms, a dead upstream stalls resolution for {current} ms",
+            ))
+    return recommendations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Probe remote repository upstreams from an export")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--timeout-ms", type=int, default=None, help="cap on every probe's timeout")
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        targets = remote_targets(fp)
+    results = probe_remotes(targets, attempts=args.attempts, max_workers=args.workers, timeout_ms=args.timeout_ms)
+    print(f"{'remote':<45} {'p50':>7} {'p90':>7} {'p99':>7} {'failed':>7}")
+    for result in sorted(results, key=lambda r: r.target.key):
+        cells = [result.percentile(p) for p in (50, 90, 99)]
+        print(f"{result.target.key:<45} " + " ".join(f"{c:>7.0f}" if c is not None else f"{'-':>7}" for c in cells)
+              + f" {len(result.failures):>3}/{result.attempts}")
+    print()
+    for rec in recommend(results):
+        change = f" {rec.current} -> {rec.suggested}" if rec.suggested is not None else ""
+        print(f"{rec.package_type:<10} {rec.key:<45} {rec.action}{change}: {rec.reason}")
@@ -0,0 +1,145 @@
+import argparse
+from collections import Counter
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from structure import REMOTE_REPO_CONFIGS, BaseRemoteRepoConfig, RepositoryStructure
+
+
+class Finding(BaseModel):
+    key: str
+    package_type: str
+    field: str
+    current: Any
+    suggested: Any
+    reason: str
+    score: float
+
+
+# Base weight of each kind of finding before scaling by how many virtuals use the remote
+WEIGHTS = {
+    "retrieval_cache_period_seconds": 8.0,
+    "missed_cache_period_seconds": 6.0,
+    "store_artifacts_locally": 10.0,
+    "socket_timeout_millis": 4.0,
+    "metadata_retrieval_timeout_secs": 3.0,
+    "assumed_offline_period_secs": 3.0,
+    "unused_artifacts_cleanup_period_hours": 2.0,
+    "bypass_head_requests": 1.0,
+}
+
+
+def virtual_fan_in(structure: RepositoryStructure) -> Counter:
+    """How many virtual repositories list each repo key as a member."""
+    fan_in: Counter = Counter()
+    for repos in structure.virtual_repositories.__dict__.values():
+        for virtual in repos.values():
+            fan_in.update(set(virtual.repositories))
+    return fan_in
+
+
+def check_remote(remote: BaseRemoteRepoConfig) -> List[tuple]:
+    """(field, suggested, reason, weight multiplier) for each setting that costs upstream traffic or stalls."""
+    issues = []
+    if remote.retrieval_cache_period_seconds < 60:
+        issues.append((
+            "retrieval_cache_period_seconds", 600,
+            f"metadata is cached for only {remote.retrieval_cache_period_seconds}s, so most requests go upstream",
+            1.0 if remote.retrieval_cache_period_seconds == 0 else 0.7,
+        ))
+    if remote.missed_cache_period_seconds < 60:
+        issues.append((
+            "missed_cache_period_seconds", 1800,
+            f"misses are cached for only {remote.missed_cache_period_seconds}s, so every 404 is re-fetched upstream",
+            1.0,
+        ))
+    if not remote.store_artifacts_locally:
+        issues.append((
+            "store_artifacts_locally", True,
+            "artifacts are not cached, every download is proxied from upstream",
+            1.0,
+        ))
+    if remote.socket_timeout_millis >= 15000 and not remote.hard_fail:
+        issues.append((
+            "socket_timeout_millis", 5000,
+            f"a dead upstream stalls each resolution for {remote.socket_timeout_millis / 1000:.0f}s without hard_fail",
+            remote.socket_timeout_millis / 15000,
+        ))
+    if remote.metadata_retrieval_timeout_secs > 60:
+        issues.append((
+            "metadata_retrieval_timeout_secs", 60,
+            f"metadata requests may block for {remote.metadata_retrieval_timeout_secs}s",
+            remote.metadata_retrieval_timeout_secs / 60,
+        ))
+    if remote.assumed_offline_period_secs < 60:
+        issues.append((
+            "assumed_offline_period_secs", 300,
+            f"a failing upstream is retried every {remote.assumed_offline_period_secs}s",
+            1.0,
+        ))
+    if 0 < remote.unused_artifacts_cleanup_period_hours < 168:
+        issues.append((
+            "unused_artifacts_cleanup_period_hours", 0,
+            f"cached artifacts are evicted after {remote.unused_artifacts_cleanup_period_hours}h and fetched again",
+            1.0,
+        ))
+    if remote.bypass_head_requests:
+        issues.append((
+            "bypass_head_requests", False,
+            "cache revalidation downloads with GET instead of a HEAD request",
+            1.0,
+        ))
+    return issues
+
+
+def analyze_remotes(structure: RepositoryStructure) -> List[Finding]:
+    """Flag remote settings that cause extra upstream traffic or long stalls, most costly first.
+
+    A finding's score is its weight times one plus the number of virtuals the
+    remote is a member of, since a busy remote's misconfiguration is paid by
+    every build resolving through those virtuals. Offline remotes are skipped.
+    """
+    fan_in = virtual_fan_in(structure)
+    findings = []
+    for package_type in REMOTE_REPO_CONFIGS:
+        for remote in getattr(structure.remote_repositories, package_type).values():
+            if remote.offline:
+                continue
+            for field, suggested, reason, multiplier in check_remote(remote):
+                findings.append(Finding(
+                    key=remote.key,
+                    package_type=package_type,
+                    field=field,
+                    current=getattr(remote, field),
+                    suggested=suggested,
+                    reason=reason,
+                    score=WEIGHTS[field] * multiplier * (1 + fan_in[remote.key]),
+                ))
+    findings.sort(key=lambda f: (-f.score, f.package_type, f.key, f.field))
+    return findings
+
+
+def findings_by_package_type(findings: List[Finding]) -> Dict[str, List[Finding]]:
+    """Group ranked findings per package type, keeping the ranking within each group."""
+    grouped: Dict[str, List[Finding]] = {}
+    for finding in findings:
+        grouped.setdefault(finding.package_type, []).append(finding)
+    return grouped
+
+
+if __name__ == "__main__":
+    from loader import load_repository_structure
+
+    parser = argparse.ArgumentParser(description="Recommend remote repository cache and timeout changes")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--top", type=int, default=10, help="findings to show per package type")
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        structure = load_repository_structure(fp)
+    for package_type, findings in findings_by_package_type(analyze_remotes(structure)).items():
+        print(f"{package_type} ({len(findings)} findings)")
+        for finding in findings[:args.top]:
+            print(f"  {finding.score:6.1f} {finding.key}: {finding.field} {finding.current} -> "
+                  f"{finding.suggested} ({finding.reason})")
@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import json
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from compact import class_defaults, class_field_names
+from structure import REPO_CONFIGS, RepositoryStructure
+
+# (section, package_type, name) of one repo in a RepositoryStructure
+RepoId = Tuple[str, str, str]
+
+
+def normalized_fields(repo: BaseModel) -> Dict[str, Any]:
+    """Fields of a repo that differ from the class defaults, nested models as dicts.
+
+    A field left at its default and one set explicitly to the default value
+    normalize the same, so they fingerprint the same.
+    """
+    config_cls = type(repo)
+    defaults = class_defaults(config_cls)
+    fields = {}
+    for name in class_field_names(config_cls):
+        value = getattr(repo, name)
+        if name in defaults and value == defaults[name]:
+            continue
+        if isinstance(value, BaseModel):
+            value = normalized_fields(value)
+        fields[name] = value
+    return fields
+
+
+def fingerprint(repo: BaseModel) -> str:
+    """Stable content hash of a repo config over its normalized fields."""
+    canonical = json.dumps(normalized_fields(repo), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def iter_repos(structure: RepositoryStructure) -> Iterator[Tuple[RepoId, BaseModel]]:
+    for section, config_classes in REPO_CONFIGS.items():
+        container = getattr(structure, section)
+        for package_type in config_classes:
+            for name, repo in getattr(container, package_type).items():
+                yield (section, package_type, name), repo
+
+
+def fingerprints(structure: RepositoryStructure) -> Dict[RepoId, str]:
+    return {repo_id: fingerprint(repo) for repo_id, repo in iter_repos(structure)}
+
+
+def save_fingerprints(prints: Dict[RepoId, str], fp: IO[str]) -> None:
+    """Write a fingerprint manifest, e.g. next to the tfvars of the last apply."""
+    nested: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for (section, package_type, name), digest in prints.items():
+        nested.setdefault(section, {}).setdefault(package_type, {})[name] = digest
+    json.dump(nested, fp, indent=1, sort_keys=True)
+
+
+def load_fingerprints(fp: IO[str]) -> Dict[RepoId, str]:
+    return {
+        (section, package_type, name): digest
+        for section, types in json.load(fp).items()
+        for package_type, repos in types.items()
+        for name, digest in repos.items()
+    }
+
+
+class FieldDelta(NamedTuple):
+    field: str
+    old: Any
+    new: Any
+
+
+class RepoChange(NamedTuple):
+    section: str
+    package_type: str
+    name: str
+    # "add", "remove" or "change"
+    action: str
+    # Field deltas of a change; None when the previous side is only a fingerprint
+    deltas: Optional[Tuple[FieldDelta, ...]]
+
+
+def field_deltas(old: BaseModel, new: BaseModel) -> Tuple[FieldDelta, ...]:
+    old_fields = normalized_fields(old)
+    new_fields = normalized_fields(new)
+    old_defaults = class_defaults(type(old))
+    new_defaults = class_defaults(type(new))
+    deltas = []
+    for name in sorted(old_fields.keys() | new_fields.keys()):
+        before = old_fields.get(name, old_defaults.get(name))
+        after = new_fields.get(name, new_defaults.get(name))
+        if isinstance(before, BaseModel):
+            before = normalized_fields(before)
+        if isinstance(after, BaseModel):
+            after = normalized_fields(after)
+        if before != after:
+            deltas.append(FieldDelta(name, before, after))
+    return tuple(deltas)
+
+
+class Plan(NamedTuple):
+    changes: Tuple[RepoChange, ...]
+    unchanged: int
+
+    def by_action(self, action: str) -> List[RepoChange]:
+        return [change for change in self.changes if change.action == action]
+
+    @property
+    def added(self) -> List[RepoChange]:
+        return self.by_action("add")
+
+    @property
+    def removed(self) -> List[RepoChange]:
+        return self.by_action("remove")
+
+    @property
+    def changed(self) -> List[RepoChange]:
+        return self.by_action("change")
+
+    def targeted_structure(self, desired: RepositoryStructure) -> RepositoryStructure:
+        """Only the added and changed repos of `desired`, e.g. for write_tfvars of a targeted apply."""
+        subset = RepositoryStructure()
+        for change in self.changes:
+            if change.action == "remove":
+                continue
+            repos = getattr(getattr(desired, change.section), change.package_type)
+            getattr(getattr(subset, change.section), change.package_type)[change.name] = repos[change.name]
+        return subset
+
+
+def diff(
+    desired: RepositoryStructure,
+    previous: Union[RepositoryStructure, Dict[RepoId, str]],
+    desired_prints: Optional[Dict[RepoId, str]] = None,
+) -> Plan:
+    """Added, removed and changed repos between a desired structure and a previous snapshot.
+
+    `previous` is a RepositoryStructure (a snapshot or a loaded live export) or
+    a fingerprint manifest. Each repo is hashed once and matched by dict
+    lookup, so the diff is linear in the number of repos; field deltas are
+    only computed for repos whose fingerprints differ, and only when the
+    previous side has the models.
+    """
+    if desired_prints is None:
+        desired_prints = fingerprints(desired)
+    previous_models: Dict[RepoId, BaseModel] = {}
+    if isinstance(previous, RepositoryStructure):
+        previous_models = dict(iter_repos(previous))
+        previous_prints = {repo_id: fingerprint(repo) for repo_id, repo in previous_models.items()}
+    else:
+        previous_prints = previous
+
+    desired_models = dict(iter_repos(desired)) if previous_models else {}
+    changes = []
+    unchanged = 0
+    for repo_id, digest in desired_prints.items():
+        old_digest = previous_prints.get(repo_id)
+        if old_digest is None:
+            changes.append(RepoChange(*repo_id, "add", None))
+        elif old_digest != digest:
+            deltas = None
+            if previous_models:
+                deltas = field_deltas(previous_models[repo_id], desired_models[repo_id])
+            changes.append(RepoChange(*repo_id, "change", deltas))
+        else:
+            unchanged += 1
+    for repo_id in previous_prints.keys() - desired_prints.keys():
+        changes.append(RepoChange(*repo_id, "remove", None))
+    changes.sort(key=lambda c: (c.section, c.package_type, c.name))
+    return Plan(tuple(changes), unchanged)
+
+
+if __name__ == "__main__":
+    from loader import load_repository_structure
+
+    parser = argparse.ArgumentParser(description="Diff a desired repository export against a previous one")
+    parser.add_argument("desired", help="desired repository export")
+    parser.add_argument("previous", help="previous export, or a fingerprint manifest with --manifest")
+    parser.add_argument("--manifest", action="store_true", help="previous is a fingerprint manifest")
+    parser.add_argument("--save-manifest", help="write the desired fingerprints here")
+    args = parser.parse_args()
+
+    with open(args.desired) as fp:
+        desired = load_repository_structure(fp)
+    with open(args.previous) as fp:
+        previous = load_fingerprints(fp) if args.manifest else load_repository_structure(fp)
+    desired_prints = fingerprints(desired)
+    plan = diff(desired, previous, desired_prints)
+    print(f"{len(plan.added)} to add, {len(plan.changed)} to change, "
+          f"{len(plan.removed)} to remove, {plan.unchanged} unchanged")
+    for change in plan.changes:
+        print(f"  {change.action:<6} {change.section}.{change.package_type}[{change.name!r}]")
+        for delta in change.deltas or ():
+            print(f"      {delta.field}: {delta.old!r} -> {delta.new!r}")
+    if args.save_manifest:
+        with open(args.save_manifest, "w") as fp:
+            save_fingerprints(desired_prints, fp)
@@ -0,0 +1,241 @@
+import argparse
+import json
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from structure import REPO_CONFIGS, BaseRemoteRepoConfig, RepositoryStructure
+from virtual_graph import VirtualGraphIndex
+
+# Assumed lookup costs when no measurements (e.g. from prober.py) are given
+LOCAL_LOOKUP_MS = 5.0
+UPSTREAM_LOOKUP_MS = 250.0
+DEFAULT_VIRTUAL_CACHE_SECONDS = 7200
+
+
+class VirtualCost(BaseModel):
+    key: str
+    package_type: str
+    members: int
+    remotes: int
+    # Artifact served from the first local or cached repo
+    best_case_ms: float
+    # Artifact in no cache: every local and cache is searched, then the upstreams in
+    # order until the one that serves it (averaged over which one that is)
+    cache_miss_ms: float
+    # Every upstream hangs until its socket timeout (or the first hard_fail remote aborts)
+    worst_case_ms: float
+    # Upstream metadata time spent per hour refreshing this virtual's metadata cache
+    metadata_ms_per_hour: float
+    proposed_order: Optional[List[str]] = None
+    # cache_miss_ms with the members in proposed_order
+    proposed_cache_miss_ms: Optional[float] = None
+    blocked_moves: List[Tuple[str, str]] = Field(default_factory=list)
+
+
+def _literal_prefixes(patterns: str) -> List[str]:
+    prefixes = []
+    for pattern in (patterns or "**/*").split(","):
+        pattern = pattern.strip()
+        cut = len(pattern)
+        for wildcard in ("*", "?"):
+            position = pattern.find(wildcard)
+            if position != -1:
+                cut = min(cut, position)
+        prefixes.append(pattern[:cut])
+    return prefixes
+
+
+def patterns_disjoint(includes_a: str, includes_b: str) -> bool:
+    """True only if no path can match both include patterns.
+
+    Conservative: two Ant patterns are taken to overlap unless the literal
+    text before their first wildcard diverges. Excludes are ignored, which can
+    only hide a disjointness, never invent one.
+    """
+    for a in _literal_prefixes(includes_a):
+        for b in _literal_prefixes(includes_b):
+            if a.startswith(b) or b.startswith(a):
+                return False
+    return True
+
+
+class ResolutionCostModel:
+    """Offline estimate of lookup latency through each virtual, from the export alone.
+
+    Artifactory searches a virtual's flattened members in three tiers: local
+    repos, then remote caches, then the remote upstreams, each tier in list
+    order. Only the order of the upstream tier costs network time, so that is
+    what the reordering proposal changes.
+    """
+
+    def __init__(
+        self,
+        structure: RepositoryStructure,
+        upstream_ms: Optional[Dict[str, float]] = None,
+        local_ms: float = LOCAL_LOOKUP_MS,
+        default_upstream_ms: float = UPSTREAM_LOOKUP_MS,
+    ):
+        self.structure = structure
+        self.graph = VirtualGraphIndex.from_structure(structure)
+        self.upstream_ms = upstream_ms or {}
+        self.local_ms = local_ms
+        self.default_upstream_ms = default_upstream_ms
+        self.configs: Dict[str, BaseModel] = {}
+        for section, config_classes in REPO_CONFIGS.items():
+            container = getattr(structure, section)
+            for package_type in config_classes:
+                for repo in getattr(container, package_type).values():
+                    self.configs[repo.key] = repo
+
+    def _remote(self, key: str) -> Optional[BaseRemoteRepoConfig]:
+        config = self.configs.get(key)
+        return config if isinstance(config, BaseRemoteRepoConfig) else None
+
+    def _flatten(self, key: str, members: List[str]) -> List[str]:
+        """Non-virtual repos a lookup tries if `key` listed `members`, as resolution_order walks them."""
+        order: List[str] = []
+        seen = {key}
+
+        def walk(keys: List[str]) -> None:
+            for member in keys:
+                if member in seen:
+                    continue
+                seen.add(member)
+                if member in self.graph.members:
+                    walk(self.graph.members[member])
+                else:
+                    order.append(member)
+
+        walk(members)
+        return order
+
+    def _flattened_cost(self, order: List[str]) -> Tuple[float, float, float]:
+        locals_ = [k for k in order if self._remote(k) is None and k in self.configs]
+        remotes = [self._remote(k) for k in order if self._remote(k) is not None]
+        online = [r for r in remotes if not r.offline]
+        cached = [r for r in online if r.store_artifacts_locally]
+        searched = len(locals_) + len(cached)
+        upstream = [self.upstream_ms.get(r.key, self.default_upstream_ms) for r in online]
+
+        best = self.local_ms if searched else (upstream[0] if upstream else 0.0)
+        # The search stops at the upstream that serves the artifact; each online one is
+        # taken to be equally likely, so the j-th is asked in (n - j) of n lookups
+        miss = searched * self.local_ms + sum(
+            ms * (len(upstream) - j) / len(upstream) for j, ms in enumerate(upstream)
+        )
+        worst = searched * self.local_ms
+        for remote in online:
+            worst += remote.socket_timeout_millis
+            if remote.hard_fail:
+                break
+        return best, miss, worst
+
+    def _metadata_ms_per_hour(self, virtual: BaseModel, order: List[str]) -> float:
+        period = getattr(virtual, "retrieval_cache_period_seconds", DEFAULT_VIRTUAL_CACHE_SECONDS)
+        refreshes = 3600 / max(period, 1)
+        cost = 0.0
+        for key in order:
+            remote = self._remote(key)
+            if remote is None or remote.offline:
+                continue
+            # Chance the remote's own metadata cache has expired when the virtual refreshes
+            expired = min(1.0, max(period, 1) / max(remote.retrieval_cache_period_seconds, 1))
+            cost += expired * self.upstream_ms.get(key, self.default_upstream_ms)
+        return refreshes * cost
+
+    def propose_order(self, key: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Direct members reordered to lower the virtual's cache-miss cost.
+
+        Adjacent non-local members swap while that lowers the flattened miss
+        cost. Locals keep their places (Artifactory searches them first anyway).
+        A member only moves behind another when their include patterns are
+        disjoint, so no artifact changes which repo serves it, and never across
+        a hard_fail remote, so a failing upstream still aborts the lookup at the
+        same point. Returns the proposed order and the (costlier, cheaper) moves
+        blocked by overlapping patterns.
+        """
+        members = list(self.graph.members.get(key, ()))
+        slots = [i for i, m in enumerate(members) if m in self.graph.members or self._remote(m) is not None]
+        proposed = list(members)
+        cost = self._flattened_cost(self._flatten(key, proposed))[1]
+        blocked = set()
+        changed = True
+        while changed:
+            changed = False
+            for i, j in zip(slots, slots[1:]):
+                a, b = proposed[i], proposed[j]
+                if self._hard_fails(key, a) or self._hard_fails(key, b):
+                    continue
+                swapped = list(proposed)
+                swapped[i], swapped[j] = b, a
+                swapped_cost = self._flattened_cost(self._flatten(key, swapped))[1]
+                if swapped_cost >= cost:
+                    continue
+                if patterns_disjoint(self._includes(a), self._includes(b)):
+                    proposed, cost = swapped, swapped_cost
+                    changed = True
+                else:
+                    blocked.add((a, b))
+        return proposed, sorted(blocked)
+
+    def _hard_fails(self, key: str, member: str) -> bool:
+        remotes = (self._remote(k) for k in self._flatten(key, [member]))
+        return any(r is not None and r.hard_fail and not r.offline for r in remotes)
+
+    def _includes(self, key: str) -> str:
+        config = self.configs.get(key)
+        return getattr(config, "includes_pattern", "**/*") if config is not None else "**/*"
+
+    def virtual_cost(self, key: str) -> VirtualCost:
+        virtual = self.configs[key]
+        order = self.graph.resolution_order(key)
+        best, miss, worst = self._flattened_cost(order)
+        proposed, blocked = self.propose_order(key)
+        reordered = proposed != list(self.graph.members.get(key, ()))
+        return VirtualCost(
+            key=key,
+            package_type=self.graph.package_type(key),
+            members=len(order),
+            remotes=sum(1 for k in order if self._remote(k) is not None),
+            best_case_ms=best,
+            cache_miss_ms=miss,
+            worst_case_ms=worst,
+            metadata_ms_per_hour=self._metadata_ms_per_hour(virtual, order),
+            proposed_order=proposed if reordered else None,
+            proposed_cache_miss_ms=self._flattened_cost(self._flatten(key, proposed))[1] if reordered else None,
+            blocked_moves=blocked,
+        )
+
+    def rank(self, by: str = "cache_miss_ms") -> List[VirtualCost]:
+        """Every virtual's cost, most expensive first."""
+        costs = [self.virtual_cost(key) for key in self.graph.members if key in self.configs]
+        costs.sort(key=lambda c: (-getattr(c, by), c.key))
+        return costs
+
+
+if __name__ == "__main__":
+    from loader import load_repository_structure
+
+    parser = argparse.ArgumentParser(description="Rank virtual repositories by estimated lookup cost")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--latency", help="JSON file of measured upstream latency in ms per remote key")
+    parser.add_argument("--by", default="cache_miss_ms", choices=["cache_miss_ms", "worst_case_ms", "metadata_ms_per_hour"])
+    args = parser.parse_args()
+
+    upstream_ms = None
+    if args.latency:
+        with open(args.latency) as fp:
+            upstream_ms = json.load(fp)
+    with open(args.export) as fp:
+        model = ResolutionCostModel(load_repository_structure(fp), upstream_ms=upstream_ms)
+    print(f"{'virtual':<40} {'type':<8} {'members':>7} {'best':>6} {'miss':>8} {'worst':>9} {'meta/h':>9}")
+    for cost in model.rank(args.by)[:args.top]:
+        print(f"{cost.key:<40} {cost.package_type:<8} {cost.members:>7} {cost.best_case_ms:>6.0f} "
+              f"{cost.cache_miss_ms:>8.0f} {cost.worst_case_ms:>9.0f} {cost.metadata_ms_per_hour:>9.0f}")
+        if cost.proposed_order:
+            print(f"    reorder ({cost.cache_miss_ms:.0f} -> {cost.proposed_cache_miss_ms:.0f} ms per miss): "
+                  f"{', '.join(cost.proposed_order)}")
+        for costly, cheaper in cost.blocked_moves[:3]:
+            print(f"    cannot move {costly} behind {cheaper}: include patterns overlap")
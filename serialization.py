@@ -0,0 +1,50 @@
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Union
+
+import pydantic
+
+# RepositoryStructure builds every model class, so it is imported where it is
+# used; modules that only stream exports do not pay for it at import
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+PYDANTIC_V2 = int(pydantic.VERSION.split(".")[0]) >= 2
+
+
+# Compiled validator/serializer for the whole RepositoryStructure, built once
+@lru_cache(maxsize=None)
+def structure_adapter():
+    from structure import RepositoryStructure
+
+    return pydantic.TypeAdapter(RepositoryStructure)
+
+
+def dump_json(structure: "RepositoryStructure", indent: Union[int, None] = None) -> bytes:
+    """Serialize straight to JSON bytes, in pydantic-core on pydantic 2."""
+    if PYDANTIC_V2:
+        return structure_adapter().dump_json(structure, indent=indent)
+    return json.dumps(structure.dict(), indent=indent).encode()
+
+
+def load_json(data: Union[bytes, str]) -> "RepositoryStructure":
+    """Validate JSON bytes straight into a RepositoryStructure, without an intermediate dict on pydantic 2."""
+    if PYDANTIC_V2:
+        return structure_adapter().validate_json(data)
+    from structure import RepositoryStructure
+
+    return RepositoryStructure.parse_raw(data)
+
+
+def dump_dict(structure: "RepositoryStructure") -> Dict[str, Any]:
+    if PYDANTIC_V2:
+        return structure_adapter().dump_python(structure)
+    return structure.dict()
+
+
+def load_dict(data: Dict[str, Any]) -> "RepositoryStructure":
+    if PYDANTIC_V2:
+        return structure_adapter().validate_python(data)
+    from structure import RepositoryStructure
+
+    return RepositoryStructure.parse_obj(data)
@@ -0,0 +1,279 @@
+import argparse
+import math
+import os
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Tuple
+
+from structure import REPO_CONFIGS
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+# Assumed Terraform costs when no measurements are given: each repo is one
+# resource refreshed with a provider GET, `terraform plan` refreshes up to
+# -parallelism (default 10) resources at once, plus init and provider start
+REFRESH_SECONDS_PER_RESOURCE = 0.4
+DEFAULT_PARALLELISM = 10
+PLAN_OVERHEAD_SECONDS = 10.0
+
+GROUP_BY = ("package_type", "project_key", "none")
+
+# (section, package_type, name) of one repo in the structure
+RepoRef = Tuple[str, str, str]
+
+
+def plan_seconds(
+    resources: int,
+    parallelism: int = DEFAULT_PARALLELISM,
+    refresh_seconds: float = REFRESH_SECONDS_PER_RESOURCE,
+    overhead_seconds: float = PLAN_OVERHEAD_SECONDS,
+) -> float:
+    """Estimated `terraform plan` time of a state holding `resources` repos."""
+    return overhead_seconds + math.ceil(resources / parallelism) * refresh_seconds
+
+
+class CrossShardRef(NamedTuple):
+    virtual: str
+    member: str
+    virtual_shard: int
+    member_shard: int
+
+
+class ShardSummary(NamedTuple):
+    index: int
+    repos: int
+    virtuals: int
+    # Repos per package type, or per project_key with group_by="project_key"
+    groups: Dict[str, int]
+
+
+class PlanEstimate(NamedTuple):
+    # Plan of the whole inventory in one state
+    single_state_seconds: float
+    # Wall time of planning every shard in parallel, set by the largest shard
+    parallel_seconds: float
+    # Expected plan time of a change to one repo, which only plans its shard
+    per_change_seconds: float
+    # 1 - per_change_seconds / single_state_seconds
+    reduction: float
+
+
+class ShardPlan(NamedTuple):
+    shards: Tuple[ShardSummary, ...]
+    assignment: Dict[RepoRef, int]
+    cross_refs: Tuple[CrossShardRef, ...]
+    # Virtual/member groups larger than the shard capacity, kept whole anyway
+    oversized: Tuple[Tuple[str, int], ...]
+
+    def estimate(
+        self,
+        parallelism: int = DEFAULT_PARALLELISM,
+        refresh_seconds: float = REFRESH_SECONDS_PER_RESOURCE,
+        overhead_seconds: float = PLAN_OVERHEAD_SECONDS,
+    ) -> PlanEstimate:
+        def seconds(resources: int) -> float:
+            return plan_seconds(resources, parallelism, refresh_seconds, overhead_seconds)
+
+        sizes = [shard.repos for shard in self.shards]
+        total = sum(sizes)
+        single = seconds(total)
+        parallel = max(seconds(size) for size in sizes)
+        # A changed repo falls in a shard with probability proportional to its size
+        per_change = sum(size * seconds(size) for size in sizes) / total if total else single
+        return PlanEstimate(single, parallel, per_change, 1 - per_change / single)
+
+
+def _find(parent: List[int], node: int) -> int:
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def plan_shards(
+    structure: "RepositoryStructure",
+    shards: int,
+    group_by: str = "package_type",
+    keep_virtuals: bool = True,
+    slack: float = 0.1,
+) -> ShardPlan:
+    """Split a structure into `shards` Terraform workspaces of balanced resource count.
+
+    With keep_virtuals, every virtual is placed with its members (nested
+    virtuals and their members included), so no state references a repo
+    managed by another; otherwise repos are placed one by one and the
+    virtual-to-member references crossing shards are reported. Groups are
+    placed largest first on the least loaded shard, preferring a shard that
+    already holds the same package type or project_key while it stays within
+    `slack` of an even split. A group too large for an even split gets a
+    shard to itself and is reported in `oversized`. Members missing from the structure are not
+    references between shards and are left to validation.
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    if group_by not in GROUP_BY:
+        raise ValueError(f"Unsupported group_by: {group_by}")
+
+    refs: List[RepoRef] = []
+    groups: List[str] = []
+    virtuals: List[Tuple[int, List[str]]] = []
+    by_key: Dict[str, int] = {}
+    for section, config_classes in REPO_CONFIGS.items():
+        container = getattr(structure, section)
+        for package_type in config_classes:
+            for name, repo in getattr(container, package_type).items():
+                index = len(refs)
+                refs.append((section, package_type, name))
+                if group_by == "package_type":
+                    groups.append(package_type)
+                elif group_by == "project_key":
+                    groups.append(getattr(repo, "project_key", None) or "")
+                else:
+                    groups.append("")
+                by_key.setdefault(repo.key, index)
+                if section == "virtual_repositories":
+                    virtuals.append((index, repo.repositories or []))
+
+    parent = list(range(len(refs)))
+    if keep_virtuals:
+        for index, members in virtuals:
+            for member in members:
+                member_index = by_key.get(member)
+                if member_index is not None:
+                    parent[_find(parent, member_index)] = _find(parent, index)
+    units: Dict[int, List[int]] = {}
+    for index in range(len(refs)):
+        units.setdefault(_find(parent, index), []).append(index)
+
+    # Largest first; ties in structure order, so the plan is deterministic
+    ordered = sorted(units.values(), key=lambda unit: (-len(unit), unit[0]))
+    # A unit larger than an even split gets a shard to itself, and the rest
+    # are balanced over the other shards
+    remaining, big = len(refs), 0
+    capacity = remaining / shards * (1 + slack)
+    while big < min(shards - 1, len(ordered)) and len(ordered[big]) > capacity:
+        remaining -= len(ordered[big])
+        big += 1
+        capacity = remaining / (shards - big) * (1 + slack)
+    loads = [0] * shards
+    holding: Dict[str, List[int]] = {}
+    assignment: Dict[RepoRef, int] = {}
+    oversized = []
+    for members in ordered:
+        size = len(members)
+        group = Counter(groups[i] for i in members).most_common(1)[0][0]
+        candidates = [s for s in holding.get(group, ()) if loads[s] + size <= capacity] if group else ()
+        target = min(candidates or range(shards), key=lambda s: (loads[s], s))
+        if size > capacity:
+            virtual = next((i for i in members if refs[i][0] == "virtual_repositories"), members[0])
+            oversized.append((refs[virtual][2], size))
+        loads[target] += size
+        if group and target not in holding.setdefault(group, []):
+            holding[group].append(target)
+        for i in members:
+            assignment[refs[i]] = target
+
+    cross_refs = []
+    for index, members in virtuals:
+        virtual_shard = assignment[refs[index]]
+        for member in members:
+            member_index = by_key.get(member)
+            if member_index is None:
+                continue
+            member_shard = assignment[refs[member_index]]
+            if member_shard != virtual_shard:
+                cross_refs.append(CrossShardRef(refs[index][2], member, virtual_shard, member_shard))
+
+    counts: List[Counter] = [Counter() for _ in range(shards)]
+    virtual_counts = [0] * shards
+    for index, ref in enumerate(refs):
+        shard = assignment[ref]
+        counts[shard][groups[index] if group_by != "none" else ref[1]] += 1
+        if ref[0] == "virtual_repositories":
+            virtual_counts[shard] += 1
+    summaries = tuple(
+        ShardSummary(shard, loads[shard], virtual_counts[shard], dict(counts[shard].most_common()))
+        for shard in range(shards)
+    )
+    return ShardPlan(summaries, assignment, tuple(cross_refs), tuple(oversized))
+
+
+def shard_structures(structure: "RepositoryStructure", plan: ShardPlan) -> List["RepositoryStructure"]:
+    """One RepositoryStructure per shard, sharing the repo models of `structure`."""
+    from structure import RepositoryStructure
+
+    parts = [RepositoryStructure() for _ in plan.shards]
+    for section, config_classes in REPO_CONFIGS.items():
+        container = getattr(structure, section)
+        for package_type in config_classes:
+            for name, repo in getattr(container, package_type).items():
+                part = parts[plan.assignment[(section, package_type, name)]]
+                getattr(getattr(part, section), package_type)[name] = repo
+    return parts
+
+
+def write_shard_tfvars(
+    structure: "RepositoryStructure",
+    plan: ShardPlan,
+    directory: str,
+    prefix: str = "shard",
+    **options: Any,
+) -> List[str]:
+    """Write <directory>/<prefix>-NN.tfvars.json per shard and return the paths.
+
+    options are passed to tfvars.write_tfvars.
+    """
+    from tfvars import load_tf_schemas, write_tfvars_file
+
+    options.setdefault("schemas", load_tf_schemas())
+    os.makedirs(directory, exist_ok=True)
+    width = max(2, len(str(len(plan.shards) - 1)))
+    paths = []
+    for shard, part in zip(plan.shards, shard_structures(structure, plan)):
+        path = os.path.join(directory, f"{prefix}-{shard.index:0{width}d}.tfvars.json")
+        write_tfvars_file(part, path, **options)
+        paths.append(path)
+    return paths
+
+
+def _print_plan(plan: ShardPlan, estimate: PlanEstimate, parallelism: int, refresh_seconds: float) -> None:
+    print(f"{'shard':>5} {'repos':>7} {'virtuals':>8} {'plan s':>7}  groups")
+    for shard in plan.shards:
+        seconds = plan_seconds(shard.repos, parallelism, refresh_seconds)
+        groups = ", ".join(f"{name or '-'}:{count}" for name, count in list(shard.groups.items())[:4])
+        more = f" (+{len(shard.groups) - 4})" if len(shard.groups) > 4 else ""
+        print(f"{shard.index:>5} {shard.repos:>7} {shard.virtuals:>8} {seconds:>7.0f}  {groups}{more}")
+    for key, size in plan.oversized:
+        print(f"group of {key} ({size} repos) exceeds the shard capacity and is kept whole")
+    if plan.cross_refs:
+        print(f"{len(plan.cross_refs)} virtual member references cross shards:")
+        for ref in plan.cross_refs[:20]:
+            print(f"    {ref.virtual} (shard {ref.virtual_shard}) -> {ref.member} (shard {ref.member_shard})")
+    print(f"plan in one state: {estimate.single_state_seconds:.0f} s; "
+          f"all shards in parallel: {estimate.parallel_seconds:.0f} s; "
+          f"one change: {estimate.per_change_seconds:.0f} s ({estimate.reduction:.0%} less)")
+
+
+if __name__ == "__main__":
+    from loader import load_repository_structure
+
+    parser = argparse.ArgumentParser(description="Split an inventory into balanced Terraform workspaces")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--group-by", default="package_type", choices=GROUP_BY)
+    parser.add_argument("--split-virtuals", action="store_true",
+                        help="place repos one by one and report virtual members in other shards")
+    parser.add_argument("--slack", type=float, default=0.1, help="allowed shard size over an even split")
+    parser.add_argument("--out-dir", help="write one .tfvars.json per shard here")
+    parser.add_argument("--parallelism", type=int, default=DEFAULT_PARALLELISM)
+    parser.add_argument("--refresh-seconds", type=float, default=REFRESH_SECONDS_PER_RESOURCE)
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        loaded = load_repository_structure(fp)
+    shard_plan = plan_shards(loaded, args.shards, args.group_by, not args.split_virtuals, args.slack)
+    _print_plan(shard_plan, shard_plan.estimate(args.parallelism, args.refresh_seconds),
+                args.parallelism, args.refresh_seconds)
+    if args.out_dir:
+        for written in write_shard_tfvars(loaded, shard_plan, args.out_dir):
+            print(f"wrote {written}")
@@ -1,273 +1,234 @@
+import importlib
 import json
-from typing import Dict, List, Optional, Union
-from pydantic import BaseModel, Field
-
-# Base repository configuration
-class BaseRepoConfig(BaseModel):
-    key: str
-    project_key: Optional[str] = None
-    description: str = ""
-    notes: str = ""
-    includes_pattern: str = "**/*"
-    excludes_pattern: str = ""
-    priority_resolution: bool = False
-    project_environments: List[str] = Field(default_factory=list)
-    blacked_out: bool = False
-    property_sets: Optional[List[str]] = Field(default_factory=list)
-    archive_browsing_enabled: bool = False
-    download_direct: bool = False
-    cdn_redirect: bool = False
-    x_ray_index: bool = False
-
-# Alpine repository
-class AlpineRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    primary_key_pair_ref: Optional[str] = None
-
-# RPM repository
-class RpmRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    primary_key_pair_ref: Optional[str] = None
-    secondary_key_pair_ref: Optional[str] = None
-    yum_root_depth: int = 0
-    yum_group_file_names: Optional[str] = None
-    enable_file_lists_indexing: bool = False
-    calculate_yum_metadata: bool = False
-
-# Debian repository
-class DebianRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    primary_key_pair_ref: Optional[str] = None
-    secondary_key_pair_ref: Optional[str] = None
-    optional_index_compression_formats: List[str] = Field(default_factory=lambda: ["bz2"])
-    trivial_layout: bool = False
-
-# Docker repository
-class DockerRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    block_pushing_schema1: bool = False
-    max_unique_tags: int = 0
-    docker_tag_retention: int = 1
-
-# Generic repository
-class GenericRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-# Maven repository
-class MavenRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "maven-2-default"
-    checksum_policy_type: str = "client-checksums"
-    snapshot_version_behavior: str = "unique"
-    max_unique_snapshots: int = 0
-    handle_releases: bool = True
-    handle_snapshots: bool = True
-    suppress_pom_consistency_checks: bool = False
-
-# NPM repository
-class NpmRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "npm-default"
-
-# NuGet repository
-class NugetRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "nuget-default"
-    max_unique_snapshots: int = 0
-    force_nuget_authentication: bool = False
-
-# PyPI repository
-class PypiRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-# Helm repository
-class HelmRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    force_non_duplicate_chart: bool = False
-    force_metadata_name_version: bool = False
-
-# CRAN repository
-class CranRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-# Composer repository
-class ComposerRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "composer-default"
-
-# Gems repository
-class GemsRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-# Go repository
-class GoRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "go-default"
-
-# Ivy repository
-class IvyRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "ivy-default"
-
-# Chef repository
-class ChefRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-# Cocoapods repository
-class CocoapodsRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-# Terraform Module repository
-class TerraformModuleRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "terraform-module-default"
-
-# Terraform Provider repository
-class TerraformProviderRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "terraform-provider-default"
-
-# Gradle repository
-class GradleRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "gradle-default"
-    checksum_policy_type: str = "client-checksums"
-    snapshot_version_behavior: str = "unique"
-    max_unique_snapshots: int = 0
-    handle_releases: bool = True
-    handle_snapshots: bool = True
-    suppress_pom_consistency_checks: bool = True
-
-# Helm OCI repository
-class HelmochiRepoConfig(BaseRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    docker_tag_retention: int = 1
-    max_unique_tags: int = 0
-
-# Virtual repository base
-class BaseVirtualRepoConfig(BaseModel):
-    key: str
-    repositories: List[str] = Field(default_factory=list)
-    description: str = ""
-    notes: str = ""
-    project_key: Optional[str] = None
-    project_environments: List[str] = Field(default_factory=list)
-    includes_pattern: str = "**/*"
-    excludes_pattern: str = ""
-    artifactory_requests_can_retrieve_remote_artifacts: bool = False
-    default_deployment_repo: Optional[str] = None
-    allow_delete: bool = True
-
-# Virtual repository configurations
-class ChefVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    retrieval_cache_period_seconds: int = 7200
-
-class CranVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    retrieval_cache_period_seconds: int = 7200
-
-class DebianVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    retrieval_cache_period_seconds: int = 7200
-    primary_keypair_ref: Optional[str] = None
-    secondary_keypair_ref: Optional[str] = None
-    optional_index_compression_formats: List[str] = Field(default_factory=lambda: ["bz2"])
-    debian_default_architectures: Optional[str] = None
-
-class DockerVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    resolve_docker_tags_by_timestamp: bool = False
-
-class GemsVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-class GenericVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-class GoVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "go-default"
-    external_dependencies_enabled: bool = False
-    external_dependencies_patterns: List[str] = Field(default_factory=list)
-
-class GradleVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "gradle-default"
-    pom_repository_references_cleanup_policy: Optional[str] = None
-    key_pair: Optional[str] = None
-
-class HelmVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    retrieval_cache_period_seconds: int = 7200
-    use_namespaces: bool = False
-
-class IvyVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "ivy-default"
-    pom_repository_references_cleanup_policy: Optional[str] = None
-    key_pair: Optional[str] = None
-
-class MavenVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "maven-2-default"
-    pom_repository_references_cleanup_policy: Optional[str] = None
-    force_maven_authentication: bool = False
-    key_pair: Optional[str] = None
-
-class NpmVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "npm-default"
-    retrieval_cache_period_seconds: int = 7200
-    external_dependencies_enabled: bool = False
-    external_dependencies_remote_repo: Optional[str] = None
-    external_dependencies_patterns: List[str] = Field(default_factory=lambda: ["**"])
-
-class NugetVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "nuget-default"
-    force_nuget_authentication: bool = False
-
-class PypiVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-
-class RpmVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "simple-default"
-    primary_keypair_ref: Optional[str] = None
-    secondary_keypair_ref: Optional[str] = None
-
-class TerraformVirtualRepoConfig(BaseVirtualRepoConfig):
-    repo_layout_ref: str = "terraform-module-default"
-
-class LocalRepositories(BaseModel):
-    alpine: Dict[str, AlpineRepoConfig] = Field(default_factory=dict)
-    rpm: Dict[str, RpmRepoConfig] = Field(default_factory=dict)
-    debian: Dict[str, DebianRepoConfig] = Field(default_factory=dict)
-    docker: Dict[str, DockerRepoConfig] = Field(default_factory=dict)
-    generic: Dict[str, GenericRepoConfig] = Field(default_factory=dict)
-    maven: Dict[str, MavenRepoConfig] = Field(default_factory=dict)
-    npm: Dict[str, NpmRepoConfig] = Field(default_factory=dict)
-    nuget: Dict[str, NugetRepoConfig] = Field(default_factory=dict)
-    pypi: Dict[str, PypiRepoConfig] = Field(default_factory=dict)
-    helm: Dict[str, HelmRepoConfig] = Field(default_factory=dict)
-    cran: Dict[str, CranRepoConfig] = Field(default_factory=dict)
-    composer: Dict[str, ComposerRepoConfig] = Field(default_factory=dict)
-    gems: Dict[str, GemsRepoConfig] = Field(default_factory=dict)
-    go: Dict[str, GoRepoConfig] = Field(default_factory=dict)
-    ivy: Dict[str, IvyRepoConfig] = Field(default_factory=dict)
-    chef: Dict[str, ChefRepoConfig] = Field(default_factory=dict)
-    cocoapods: Dict[str, CocoapodsRepoConfig] = Field(default_factory=dict)
-    terraform_module: Dict[str, TerraformModuleRepoConfig] = Field(default_factory=dict)
-    terraform_provider: Dict[str, TerraformProviderRepoConfig] = Field(default_factory=dict)
-    gradle: Dict[str, GradleRepoConfig] = Field(default_factory=dict)
-    helmoci: Dict[str, HelmochiRepoConfig] = Field(default_factory=dict)
-
-class VirtualRepositories(BaseModel):
-    chef: Dict[str, ChefVirtualRepoConfig] = Field(default_factory=dict)
-    cran: Dict[str, CranVirtualRepoConfig] = Field(default_factory=dict)
-    debian: Dict[str, DebianVirtualRepoConfig] = Field(default_factory=dict)
-    docker: Dict[str, DockerVirtualRepoConfig] = Field(default_factory=dict)
-    gems: Dict[str, GemsVirtualRepoConfig] = Field(default_factory=dict)
-    generic: Dict[str, GenericVirtualRepoConfig] = Field(default_factory=dict)
-    go: Dict[str, GoVirtualRepoConfig] = Field(default_factory=dict)
-    gradle: Dict[str, GradleVirtualRepoConfig] = Field(default_factory=dict)
-    helm: Dict[str, HelmVirtualRepoConfig] = Field(default_factory=dict)
-    ivy: Dict[str, IvyVirtualRepoConfig] = Field(default_factory=dict)
-    maven: Dict[str, MavenVirtualRepoConfig] = Field(default_factory=dict)
-    npm: Dict[str, NpmVirtualRepoConfig] = Field(default_factory=dict)
-    nuget: Dict[str, NugetVirtualRepoConfig] = Field(default_factory=dict)
-    pypi: Dict[str, PypiVirtualRepoConfig] = Field(default_factory=dict)
-    rpm: Dict[str, RpmVirtualRepoConfig] = Field(default_factory=dict)
-    terraform: Dict[str, TerraformVirtualRepoConfig] = Field(default_factory=dict)
-
-class RepositoryStructure(BaseModel):
-    local_repositories: LocalRepositories = Field(default_factory=LocalRepositories)
-    virtual_repositories: VirtualRepositories = Field(default_factory=VirtualRepositories)
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from structure_models.base import (
+        BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig, ContentSynchronisation,
+    )
+    from structure_models.alpine import AlpineRemoteRepoConfig, AlpineRepoConfig
+    from structure_models.bower import BowerRemoteRepoConfig
+    from structure_models.chef import ChefRemoteRepoConfig, ChefRepoConfig, ChefVirtualRepoConfig
+    from structure_models.cocoapods import CocoapodsRemoteRepoConfig, CocoapodsRepoConfig
+    from structure_models.composer import ComposerRemoteRepoConfig, ComposerRepoConfig
+    from structure_models.conda import CondaRemoteRepoConfig
+    from structure_models.cran import CranRemoteRepoConfig, CranRepoConfig, CranVirtualRepoConfig
+    from structure_models.debian import DebianRemoteRepoConfig, DebianRepoConfig, DebianVirtualRepoConfig
+    from structure_models.docker import DockerRemoteRepoConfig, DockerRepoConfig, DockerVirtualRepoConfig
+    from structure_models.gems import GemsRemoteRepoConfig, GemsRepoConfig, GemsVirtualRepoConfig
+    from structure_models.generic import GenericRemoteRepoConfig, GenericRepoConfig, GenericVirtualRepoConfig
+    from structure_models.go import GoRemoteRepoConfig, GoRepoConfig, GoVirtualRepoConfig
+    from structure_models.gradle import GradleRemoteRepoConfig, GradleRepoConfig, GradleVirtualRepoConfig
+    from structure_models.helm import HelmRemoteRepoConfig, HelmRepoConfig, HelmVirtualRepoConfig
+    from structure_models.helmoci import HelmochiRepoConfig
+    from structure_models.ivy import IvyRepoConfig, IvyVirtualRepoConfig
+    from structure_models.maven import MavenRemoteRepoConfig, MavenRepoConfig, MavenVirtualRepoConfig
+    from structure_models.npm import NpmRemoteRepoConfig, NpmRepoConfig, NpmVirtualRepoConfig
+    from structure_models.nuget import NugetRemoteRepoConfig, NugetRepoConfig, NugetVirtualRepoConfig
+    from structure_models.pypi import PypiRemoteRepoConfig, PypiRepoConfig, PypiVirtualRepoConfig
+    from structure_models.rpm import RpmRemoteRepoConfig, RpmRepoConfig, RpmVirtualRepoConfig
+    from structure_models.terraform import TerraformRemoteRepoConfig, TerraformVirtualRepoConfig
+    from structure_models.terraform_module import TerraformModuleRepoConfig
+    from structure_models.terraform_provider import TerraformProviderRepoConfig
+    from structure_models.vcs import VcsRemoteRepoConfig
+    from structure_models.containers import (
+        LocalRepositories, RemoteRepositories, RepositoryStructure, VirtualRepositories,
+    )
+
+# The model classes live in the structure_models package, one module per
+# package type. __getattr__ imports a class's module the first time the class
+# is looked up here (from structure import X, structure.X,
+# REPO_CONFIGS[section][type]), so importing structure creates no model and
+# touching one package type creates only its classes and the bases.
+# Class -> module; the per-type classes are added from the registries below
+_MODEL_MODULES: Dict[str, str] = {
+    "BaseRepoConfig": "base",
+    "BaseVirtualRepoConfig": "base",
+    "BaseRemoteRepoConfig": "base",
+    "ContentSynchronisation": "base",
+    "LocalRepositories": "containers",
+    "VirtualRepositories": "containers",
+    "RemoteRepositories": "containers",
+    "RepositoryStructure": "containers",
+}
+
+def __getattr__(name: str) -> Any:
+    module = _MODEL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    model_cls = getattr(importlib.import_module(f"structure_models.{module}"), name)
+    globals()[name] = model_cls
+    return model_cls
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_MODEL_MODULES))
+
+# JSON text of a model, serialized by pydantic-core when pydantic 2 is installed
+def to_json(model: BaseModel, indent: Optional[int] = 2) -> str:
+    if hasattr(model, "model_dump_json"):
+        return model.model_dump_json(indent=indent)
+    return json.dumps(model.dict(), indent=indent)
+
+# Field definitions of a model class on both pydantic 1.x and 2.x
+def model_fields(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    fields = getattr(model_cls, "model_fields", None)
+    if fields is None:
+        fields = model_cls.__fields__
+    return fields
+
+def field_is_required(field) -> bool:
+    is_required = getattr(field, "is_required", None)
+    return is_required() if callable(is_required) else field.required
+
+def unknown_fields(model_cls: Type[BaseModel], names: Iterable[str]) -> List[str]:
+    """Names the model declares no field for; pydantic would silently ignore them."""
+    declared = model_fields(model_cls)
+    return [name for name in names if name not in declared]
+
+def build_config(section: str, package_type: str, fields: Mapping[str, Any]) -> BaseModel:
+    """Config model of one repo; fields may use the model or the mappings.json names.
+
+    Raises ValueError, pydantic's ValidationError included, for an unsupported
+    package type, a field the model does not declare or an invalid value.
+    """
+    from translator import MODEL_FIELD_ALIASES
+
+    config_cls = REPO_CONFIGS[section].get(package_type)
+    if config_cls is None:
+        raise ValueError(f"Unsupported {section} package type: {package_type}")
+    declared = model_fields(config_cls)
+    # Like the translator, only names the model does not declare are aliased:
+    # remote models keep xray_index
+    fields = {name if name in declared else MODEL_FIELD_ALIASES.get(name, name): value
+              for name, value in fields.items()}
+    unknown = unknown_fields(config_cls, fields)
+    if unknown:
+        raise ValueError(f"{config_cls.__name__} got unexpected field(s): {', '.join(unknown)}")
+    return config_cls(**fields)
+
+def build_repo(row: Mapping[str, Any]) -> Tuple[str, str, str, BaseModel]:
+    """(section, package_type, repo_name, model) of one RepositoryStructureBuilder.add_rows row.
+
+    rclass defaults to local and repo_name to the key. Raises ValueError like
+    build_config, and for a row without package_type or with an unknown rclass.
+    """
+    from translator import RCLASS_SECTION
+
+    fields = dict(row)
+    rclass = fields.pop("rclass", "local")
+    section = RCLASS_SECTION.get(rclass)
+    if section is None:
+        raise ValueError(f"Unsupported rclass: {rclass}")
+    package_type = fields.pop("package_type", None)
+    if not package_type:
+        raise ValueError("package_type is required")
+    repo_name = fields.pop("repo_name", None)
+    repo = build_config(section, package_type, fields)
+    return section, package_type, repo_name or repo.key, repo
+
+class _LazyConfigs(Mapping):
+    """Package type -> config class, importing structure_models on the first lookup.
+
+    Iterating package types and `in` do not import it.
+    """
+
+    def __init__(self, names: Dict[str, str]):
+        self._names = names
+
+    def __getitem__(self, package_type: str) -> Type[BaseModel]:
+        return __getattr__(self._names[package_type])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, package_type: object) -> bool:
+        return package_type in self._names
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._names!r})"
+
+# Config class for each package type, keyed like the LocalRepositories/VirtualRepositories fields
+LOCAL_REPO_CONFIGS: Mapping[str, Type["BaseRepoConfig"]] = _LazyConfigs({
+    "alpine": "AlpineRepoConfig",
+    "rpm": "RpmRepoConfig",
+    "debian": "DebianRepoConfig",
+    "docker": "DockerRepoConfig",
+    "generic": "GenericRepoConfig",
+    "maven": "MavenRepoConfig",
+    "npm": "NpmRepoConfig",
+    "nuget": "NugetRepoConfig",
+    "pypi": "PypiRepoConfig",
+    "helm": "HelmRepoConfig",
+    "cran": "CranRepoConfig",
+    "composer": "ComposerRepoConfig",
+    "gems": "GemsRepoConfig",
+    "go": "GoRepoConfig",
+    "ivy": "IvyRepoConfig",
+    "chef": "ChefRepoConfig",
+    "cocoapods": "CocoapodsRepoConfig",
+    "terraform_module": "TerraformModuleRepoConfig",
+    "terraform_provider": "TerraformProviderRepoConfig",
+    "gradle": "GradleRepoConfig",
+    "helmoci": "HelmochiRepoConfig",
+})
+
+REMOTE_REPO_CONFIGS: Mapping[str, Type["BaseRemoteRepoConfig"]] = _LazyConfigs({
+    "alpine": "AlpineRemoteRepoConfig",
+    "bower": "BowerRemoteRepoConfig",
+    "chef": "ChefRemoteRepoConfig",
+    "cocoapods": "CocoapodsRemoteRepoConfig",
+    "composer": "ComposerRemoteRepoConfig",
+    "conda": "CondaRemoteRepoConfig",
+    "cran": "CranRemoteRepoConfig",
+    "debian": "DebianRemoteRepoConfig",
+    "docker": "DockerRemoteRepoConfig",
+    "gems": "GemsRemoteRepoConfig",
+    "generic": "GenericRemoteRepoConfig",
+    "go": "GoRemoteRepoConfig",
+    "gradle": "GradleRemoteRepoConfig",
+    "helm": "HelmRemoteRepoConfig",
+    "maven": "MavenRemoteRepoConfig",
+    "npm": "NpmRemoteRepoConfig",
+    "nuget": "NugetRemoteRepoConfig",
+    "pypi": "PypiRemoteRepoConfig",
+    "rpm": "RpmRemoteRepoConfig",
+    "terraform": "TerraformRemoteRepoConfig",
+    "vcs": "VcsRemoteRepoConfig",
+})
+
+VIRTUAL_REPO_CONFIGS: Mapping[str, Type["BaseVirtualRepoConfig"]] = _LazyConfigs({
+    "chef": "ChefVirtualRepoConfig",
+    "cran": "CranVirtualRepoConfig",
+    "debian": "DebianVirtualRepoConfig",
+    "docker": "DockerVirtualRepoConfig",
+    "gems": "GemsVirtualRepoConfig",
+    "generic": "GenericVirtualRepoConfig",
+    "go": "GoVirtualRepoConfig",
+    "gradle": "GradleVirtualRepoConfig",
+    "helm": "HelmVirtualRepoConfig",
+    "ivy": "IvyVirtualRepoConfig",
+    "maven": "MavenVirtualRepoConfig",
+    "npm": "NpmVirtualRepoConfig",
+    "nuget": "NugetVirtualRepoConfig",
+    "pypi": "PypiVirtualRepoConfig",
+    "rpm": "RpmVirtualRepoConfig",
+    "terraform": "TerraformVirtualRepoConfig",
+})
+
+# Config classes per export section
+REPO_CONFIGS: Dict[str, Mapping[str, Type[BaseModel]]] = {
+    "local_repositories": LOCAL_REPO_CONFIGS,
+    "remote_repositories": REMOTE_REPO_CONFIGS,
+    "virtual_repositories": VIRTUAL_REPO_CONFIGS,
+}
+
+# Config classes live in the structure_models module named after their package type
+for _configs in REPO_CONFIGS.values():
+    _MODEL_MODULES.update((name, package_type) for package_type, name in _configs._names.items())
 
 def create_docker_repo_json(
     repo_name: str,
@@ -289,7 +250,10 @@ def create_docker_repo_json(
     download_direct: bool = False,
     cdn_redirect: bool = False,
     x_ray_index: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.docker import DockerRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -344,7 +308,10 @@ def create_maven_repo_json(
     handle_releases: bool = True,
     handle_snapshots: bool = True,
     suppress_pom_consistency_checks: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.maven import MavenRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -396,7 +363,10 @@ def create_npm_repo_json(
     download_direct: bool = False,
     cdn_redirect: bool = False,
     x_ray_index: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.npm import NpmRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -442,7 +412,10 @@ def create_generic_repo_json(
     download_direct: bool = False,
     cdn_redirect: bool = False,
     x_ray_index: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.generic import GenericRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -490,7 +463,10 @@ def create_helm_repo_json(
     x_ray_index: bool = False,
     force_non_duplicate_chart: bool = False,
     force_metadata_name_version: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.helm import HelmRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -538,7 +514,10 @@ def create_pypi_repo_json(
     download_direct: bool = False,
     cdn_redirect: bool = False,
     x_ray_index: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.pypi import PypiRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -586,7 +565,10 @@ def create_nuget_repo_json(
     x_ray_index: bool = False,
     max_unique_snapshots: int = 0,
     force_nuget_authentication: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.nuget import NugetRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -635,7 +617,10 @@ def create_alpine_repo_json(
     cdn_redirect: bool = False,
     x_ray_index: bool = False,
     primary_key_pair_ref: Optional[str] = None,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.alpine import AlpineRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -688,7 +673,10 @@ def create_rpm_repo_json(
     yum_group_file_names: Optional[str] = None,
     enable_file_lists_indexing: bool = False,
     calculate_yum_metadata: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.rpm import RpmRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -744,7 +732,10 @@ def create_debian_repo_json(
     secondary_key_pair_ref: Optional[str] = None,
     optional_index_compression_formats: Optional[List[str]] = None,
     trivial_layout: bool = False,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.debian import DebianRepoConfig
+    from structure_models.containers import LocalRepositories, RepositoryStructure
+
     if project_environments is None:
         project_environments = []
     if property_sets is None:
@@ -795,7 +786,10 @@ def create_chef_virtual_repo_json(
     default_deployment_repo: Optional[str] = None,
     retrieval_cache_period_seconds: int = 7200,
     allow_delete: bool = True,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.chef import ChefVirtualRepoConfig
+    from structure_models.containers import RepositoryStructure, VirtualRepositories
+
     if repositories is None:
         repositories = []
     if project_environments is None:
@@ -837,7 +831,10 @@ def create_docker_virtual_repo_json(
     default_deployment_repo: Optional[str] = None,
     resolve_docker_tags_by_timestamp: bool = False,
     allow_delete: bool = True,
-) -> RepositoryStructure:
+) -> "RepositoryStructure":
+    from structure_models.docker import DockerVirtualRepoConfig
+    from structure_models.containers import RepositoryStructure, VirtualRepositories
+
     if repositories is None:
         repositories = []
     if project_environments is None:
@@ -864,6 +861,68 @@ def create_docker_virtual_repo_json(
     
     return RepositoryStructure(virtual_repositories=virtual_repos)
 
+# Accumulates many repositories into a single RepositoryStructure, instead of
+# one structure per repo from the create_*_repo_json factories
+class RepositoryStructureBuilder:
+    def __init__(self, key_index=None):
+        self._structure = self._new_structure()
+        # Optional key_index.KeyIndex kept in step with every repo added, so
+        # keys stay unique across sections and package types
+        self.key_index = key_index
+
+    @staticmethod
+    def _new_structure() -> "RepositoryStructure":
+        from structure_models.containers import RepositoryStructure
+
+        return RepositoryStructure()
+
+    def _add(self, section: str, package_type: str, repo_name: Optional[str], fields) -> BaseModel:
+        repo = build_config(section, package_type, fields)
+        self._store(section, package_type, repo_name or repo.key, repo)
+        return repo
+
+    def _store(self, section: str, package_type: str, repo_name: str, repo: BaseModel) -> None:
+        repos = getattr(getattr(self._structure, section), package_type)
+        if repo_name in repos:
+            raise ValueError(f"Duplicate {package_type} repository in {section}: {repo_name}")
+        if self.key_index is not None:
+            self.key_index.add(repo.key, section, package_type, repo_name)
+        repos[repo_name] = repo
+
+    def add_local(self, package_type: str, repo_name: Optional[str] = None, **fields) -> "BaseRepoConfig":
+        return self._add("local_repositories", package_type, repo_name, fields)
+
+    def add_virtual(self, package_type: str, repo_name: Optional[str] = None, **fields) -> "BaseVirtualRepoConfig":
+        return self._add("virtual_repositories", package_type, repo_name, fields)
+
+    def add_remote(self, package_type: str, repo_name: Optional[str] = None, **fields) -> "BaseRemoteRepoConfig":
+        return self._add("remote_repositories", package_type, repo_name, fields)
+
+    def add_rows(self, rows) -> int:
+        """Add batch rows of the form {"rclass": "local"|"remote"|"virtual", "package_type": ..., **fields}.
+
+        repo_name may be given per row and defaults to the key; rows are built
+        by build_repo(). Returns the number of rows added.
+        """
+        count = 0
+        for row in rows:
+            self._store(*build_repo(row))
+            count += 1
+        return count
+
+    def build(self) -> "RepositoryStructure":
+        """Return the accumulated structure and start a new, empty one."""
+        structure, self._structure = self._structure, self._new_structure()
+        return structure
+
+# Star imports include the model classes, which imports every one of them
+__all__ = sorted(
+    {name for name, value in globals().items()
+     if not name.startswith("_") and getattr(value, "__module__", None) == __name__}
+    | {"LOCAL_REPO_CONFIGS", "REMOTE_REPO_CONFIGS", "VIRTUAL_REPO_CONFIGS", "REPO_CONFIGS"}
+    | set(_MODEL_MODULES)
+)
+
 # Example usage:
 if __name__ == "__main__":
     # Create a Docker repository
@@ -907,10 +966,10 @@ if __name__ == "__main__":
     
     # Print as JSON
     print("Docker Repository:")
-    print(json.dumps(docker_repo.dict(), indent=2))
+    print(to_json(docker_repo))
     print("\nMaven Repository:")
-    print(json.dumps(maven_repo.dict(), indent=2))
+    print(to_json(maven_repo))
     print("\nNPM Repository:")
-    print(json.dumps(npm_repo.dict(), indent=2))
+    print(to_json(npm_repo))
     print("\nChef Virtual Repository:")
-    print(json.dumps(chef_virtual_repo.dict(), indent=2))
+    print(to_json(chef_virtual_repo))
@@ -0,0 +1,4 @@
+# Model classes of structure.py, one module per package type plus the bases
+# and the section containers. structure's module __getattr__ imports a module
+# the first time one of its classes is looked up, so touching one package
+# type creates only that type's classes. Import the classes from structure.
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig
+
+# Alpine repository
+class AlpineRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    primary_key_pair_ref: Optional[str] = None
+
+# Alpine remote repository
+class AlpineRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
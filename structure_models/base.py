@@ -0,0 +1,86 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# Base repository configuration
+class BaseRepoConfig(BaseModel):
+    key: str
+    project_key: Optional[str] = None
+    description: str = ""
+    notes: str = ""
+    includes_pattern: str = "**/*"
+    excludes_pattern: str = ""
+    priority_resolution: bool = False
+    project_environments: List[str] = Field(default_factory=list)
+    blacked_out: bool = False
+    property_sets: Optional[List[str]] = Field(default_factory=list)
+    archive_browsing_enabled: bool = False
+    download_direct: bool = False
+    cdn_redirect: bool = False
+    x_ray_index: bool = False
+
+# Virtual repository base
+class BaseVirtualRepoConfig(BaseModel):
+    key: str
+    repositories: List[str] = Field(default_factory=list)
+    description: str = ""
+    notes: str = ""
+    project_key: Optional[str] = None
+    project_environments: List[str] = Field(default_factory=list)
+    includes_pattern: str = "**/*"
+    excludes_pattern: str = ""
+    artifactory_requests_can_retrieve_remote_artifacts: bool = False
+    default_deployment_repo: Optional[str] = None
+    allow_delete: bool = True
+
+# Remote repository content synchronisation settings
+class ContentSynchronisation(BaseModel):
+    enabled: bool = False
+    statistics_enabled: bool = False
+    properties_enabled: bool = False
+    source_origin_absence_detection: bool = False
+
+# Remote repository base
+class BaseRemoteRepoConfig(BaseModel):
+    key: str
+    url: str
+    description: str = ""
+    notes: str = ""
+    project_key: Optional[str] = None
+    project_environments: List[str] = Field(default_factory=list)
+    username: str = ""
+    disable_proxy: bool = False
+    includes_pattern: str = "**/*"
+    excludes_pattern: str = ""
+    repo_layout_ref: str = "simple-default"
+    remote_repo_layout_ref: Optional[str] = None
+    hard_fail: bool = False
+    offline: bool = False
+    blacked_out: bool = False
+    xray_index: bool = False
+    store_artifacts_locally: bool = True
+    socket_timeout_millis: int = 15000
+    local_address: str = ""
+    retrieval_cache_period_seconds: int = 7200
+    metadata_retrieval_timeout_secs: int = 60
+    missed_cache_period_seconds: int = 1800
+    unused_artifacts_cleanup_period_hours: int = 0
+    assumed_offline_period_secs: int = 300
+    share_configuration: bool = False
+    synchronize_properties: bool = False
+    block_mismatching_mime_types: bool = True
+    mismatching_mime_types_override_list: str = ""
+    property_sets: Optional[List[str]] = Field(default_factory=list)
+    allow_any_host_auth: bool = False
+    enable_cookie_management: bool = False
+    bypass_head_requests: bool = False
+    priority_resolution: bool = False
+    content_synchronisation: ContentSynchronisation = Field(default_factory=ContentSynchronisation)
+    list_remote_folder_items: bool = False
+    download_direct: bool = False
+    cdn_redirect: bool = False
+    disable_url_normalization: bool = False
+    archive_browsing_enabled: bool = False
+    client_tls_certificate: Optional[str] = None
+    curated: bool = False
+    propagate_query_params: bool = False
+    retrieve_sha256_from_server: bool = False
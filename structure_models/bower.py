@@ -0,0 +1,10 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig
+
+# Bower remote repository
+class BowerRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "bower-default"
+    bower_registry_url: str = "https://registry.bower.io"
+    vcs_git_provider: str = "GITHUB"
+    vcs_git_download_url: Optional[str] = None
@@ -0,0 +1,14 @@
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Chef repository
+class ChefRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# Chef virtual repository
+class ChefVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    retrieval_cache_period_seconds: int = 7200
+
+# Chef remote repository
+class ChefRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig
+
+# Cocoapods repository
+class CocoapodsRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# Cocoapods remote repository
+class CocoapodsRemoteRepoConfig(BaseRemoteRepoConfig):
+    pods_specs_repo_url: str = "https://github.com/CocoaPods/Specs"
+    vcs_git_provider: str = "GITHUB"
+    vcs_git_download_url: Optional[str] = None
+    external_dependencies_enabled: bool = False
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig
+
+# Composer repository
+class ComposerRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "composer-default"
+
+# Composer remote repository
+class ComposerRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "composer-default"
+    composer_registry_url: str = "https://packagist.org"
+    vcs_git_provider: str = "GITHUB"
+    vcs_git_download_url: Optional[str] = None
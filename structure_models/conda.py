@@ -0,0 +1,5 @@
+from structure_models.base import BaseRemoteRepoConfig
+
+# Conda remote repository
+class CondaRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
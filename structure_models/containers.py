@@ -0,0 +1,98 @@
+from typing import Dict
+from pydantic import BaseModel, Field
+
+from structure_models.alpine import AlpineRemoteRepoConfig, AlpineRepoConfig
+from structure_models.bower import BowerRemoteRepoConfig
+from structure_models.chef import ChefRemoteRepoConfig, ChefRepoConfig, ChefVirtualRepoConfig
+from structure_models.cocoapods import CocoapodsRemoteRepoConfig, CocoapodsRepoConfig
+from structure_models.composer import ComposerRemoteRepoConfig, ComposerRepoConfig
+from structure_models.conda import CondaRemoteRepoConfig
+from structure_models.cran import CranRemoteRepoConfig, CranRepoConfig, CranVirtualRepoConfig
+from structure_models.debian import DebianRemoteRepoConfig, DebianRepoConfig, DebianVirtualRepoConfig
+from structure_models.docker import DockerRemoteRepoConfig, DockerRepoConfig, DockerVirtualRepoConfig
+from structure_models.gems import GemsRemoteRepoConfig, GemsRepoConfig, GemsVirtualRepoConfig
+from structure_models.generic import GenericRemoteRepoConfig, GenericRepoConfig, GenericVirtualRepoConfig
+from structure_models.go import GoRemoteRepoConfig, GoRepoConfig, GoVirtualRepoConfig
+from structure_models.gradle import GradleRemoteRepoConfig, GradleRepoConfig, GradleVirtualRepoConfig
+from structure_models.helm import HelmRemoteRepoConfig, HelmRepoConfig, HelmVirtualRepoConfig
+from structure_models.helmoci import HelmochiRepoConfig
+from structure_models.ivy import IvyRepoConfig, IvyVirtualRepoConfig
+from structure_models.maven import MavenRemoteRepoConfig, MavenRepoConfig, MavenVirtualRepoConfig
+from structure_models.npm import NpmRemoteRepoConfig, NpmRepoConfig, NpmVirtualRepoConfig
+from structure_models.nuget import NugetRemoteRepoConfig, NugetRepoConfig, NugetVirtualRepoConfig
+from structure_models.pypi import PypiRemoteRepoConfig, PypiRepoConfig, PypiVirtualRepoConfig
+from structure_models.rpm import RpmRemoteRepoConfig, RpmRepoConfig, RpmVirtualRepoConfig
+from structure_models.terraform import TerraformRemoteRepoConfig, TerraformVirtualRepoConfig
+from structure_models.terraform_module import TerraformModuleRepoConfig
+from structure_models.terraform_provider import TerraformProviderRepoConfig
+from structure_models.vcs import VcsRemoteRepoConfig
+
+# Section containers; importing this module creates every config class
+class LocalRepositories(BaseModel):
+    alpine: Dict[str, AlpineRepoConfig] = Field(default_factory=dict)
+    rpm: Dict[str, RpmRepoConfig] = Field(default_factory=dict)
+    debian: Dict[str, DebianRepoConfig] = Field(default_factory=dict)
+    docker: Dict[str, DockerRepoConfig] = Field(default_factory=dict)
+    generic: Dict[str, GenericRepoConfig] = Field(default_factory=dict)
+    maven: Dict[str, MavenRepoConfig] = Field(default_factory=dict)
+    npm: Dict[str, NpmRepoConfig] = Field(default_factory=dict)
+    nuget: Dict[str, NugetRepoConfig] = Field(default_factory=dict)
+    pypi: Dict[str, PypiRepoConfig] = Field(default_factory=dict)
+    helm: Dict[str, HelmRepoConfig] = Field(default_factory=dict)
+    cran: Dict[str, CranRepoConfig] = Field(default_factory=dict)
+    composer: Dict[str, ComposerRepoConfig] = Field(default_factory=dict)
+    gems: Dict[str, GemsRepoConfig] = Field(default_factory=dict)
+    go: Dict[str, GoRepoConfig] = Field(default_factory=dict)
+    ivy: Dict[str, IvyRepoConfig] = Field(default_factory=dict)
+    chef: Dict[str, ChefRepoConfig] = Field(default_factory=dict)
+    cocoapods: Dict[str, CocoapodsRepoConfig] = Field(default_factory=dict)
+    terraform_module: Dict[str, TerraformModuleRepoConfig] = Field(default_factory=dict)
+    terraform_provider: Dict[str, TerraformProviderRepoConfig] = Field(default_factory=dict)
+    gradle: Dict[str, GradleRepoConfig] = Field(default_factory=dict)
+    helmoci: Dict[str, HelmochiRepoConfig] = Field(default_factory=dict)
+
+class VirtualRepositories(BaseModel):
+    chef: Dict[str, ChefVirtualRepoConfig] = Field(default_factory=dict)
+    cran: Dict[str, CranVirtualRepoConfig] = Field(default_factory=dict)
+    debian: Dict[str, DebianVirtualRepoConfig] = Field(default_factory=dict)
+    docker: Dict[str, DockerVirtualRepoConfig] = Field(default_factory=dict)
+    gems: Dict[str, GemsVirtualRepoConfig] = Field(default_factory=dict)
+    generic: Dict[str, GenericVirtualRepoConfig] = Field(default_factory=dict)
+    go: Dict[str, GoVirtualRepoConfig] = Field(default_factory=dict)
+    gradle: Dict[str, GradleVirtualRepoConfig] = Field(default_factory=dict)
+    helm: Dict[str, HelmVirtualRepoConfig] = Field(default_factory=dict)
+    ivy: Dict[str, IvyVirtualRepoConfig] = Field(default_factory=dict)
+    maven: Dict[str, MavenVirtualRepoConfig] = Field(default_factory=dict)
+    npm: Dict[str, NpmVirtualRepoConfig] = Field(default_factory=dict)
+    nuget: Dict[str, NugetVirtualRepoConfig] = Field(default_factory=dict)
+    pypi: Dict[str, PypiVirtualRepoConfig] = Field(default_factory=dict)
+    rpm: Dict[str, RpmVirtualRepoConfig] = Field(default_factory=dict)
+    terraform: Dict[str, TerraformVirtualRepoConfig] = Field(default_factory=dict)
+
+class RemoteRepositories(BaseModel):
+    alpine: Dict[str, AlpineRemoteRepoConfig] = Field(default_factory=dict)
+    bower: Dict[str, BowerRemoteRepoConfig] = Field(default_factory=dict)
+    chef: Dict[str, ChefRemoteRepoConfig] = Field(default_factory=dict)
+    cocoapods: Dict[str, CocoapodsRemoteRepoConfig] = Field(default_factory=dict)
+    composer: Dict[str, ComposerRemoteRepoConfig] = Field(default_factory=dict)
+    conda: Dict[str, CondaRemoteRepoConfig] = Field(default_factory=dict)
+    cran: Dict[str, CranRemoteRepoConfig] = Field(default_factory=dict)
+    debian: Dict[str, DebianRemoteRepoConfig] = Field(default_factory=dict)
+    docker: Dict[str, DockerRemoteRepoConfig] = Field(default_factory=dict)
+    gems: Dict[str, GemsRemoteRepoConfig] = Field(default_factory=dict)
+    generic: Dict[str, GenericRemoteRepoConfig] = Field(default_factory=dict)
+    go: Dict[str, GoRemoteRepoConfig] = Field(default_factory=dict)
+    gradle: Dict[str, GradleRemoteRepoConfig] = Field(default_factory=dict)
+    helm: Dict[str, HelmRemoteRepoConfig] = Field(default_factory=dict)
+    maven: Dict[str, MavenRemoteRepoConfig] = Field(default_factory=dict)
+    npm: Dict[str, NpmRemoteRepoConfig] = Field(default_factory=dict)
+    nuget: Dict[str, NugetRemoteRepoConfig] = Field(default_factory=dict)
+    pypi: Dict[str, PypiRemoteRepoConfig] = Field(default_factory=dict)
+    rpm: Dict[str, RpmRemoteRepoConfig] = Field(default_factory=dict)
+    terraform: Dict[str, TerraformRemoteRepoConfig] = Field(default_factory=dict)
+    vcs: Dict[str, VcsRemoteRepoConfig] = Field(default_factory=dict)
+
+class RepositoryStructure(BaseModel):
+    local_repositories: LocalRepositories = Field(default_factory=LocalRepositories)
+    remote_repositories: RemoteRepositories = Field(default_factory=RemoteRepositories)
+    virtual_repositories: VirtualRepositories = Field(default_factory=VirtualRepositories)
@@ -0,0 +1,14 @@
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# CRAN repository
+class CranRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# CRAN virtual repository
+class CranVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    retrieval_cache_period_seconds: int = 7200
+
+# CRAN remote repository
+class CranRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
@@ -0,0 +1,25 @@
+from typing import List, Optional
+from pydantic import Field
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Debian repository
+class DebianRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    primary_key_pair_ref: Optional[str] = None
+    secondary_key_pair_ref: Optional[str] = None
+    optional_index_compression_formats: List[str] = Field(default_factory=lambda: ["bz2"])
+    trivial_layout: bool = False
+
+# Debian virtual repository
+class DebianVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    retrieval_cache_period_seconds: int = 7200
+    primary_keypair_ref: Optional[str] = None
+    secondary_keypair_ref: Optional[str] = None
+    optional_index_compression_formats: List[str] = Field(default_factory=lambda: ["bz2"])
+    debian_default_architectures: Optional[str] = None
+
+# Debian remote repository
+class DebianRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
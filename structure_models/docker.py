@@ -0,0 +1,24 @@
+from typing import List, Optional
+from pydantic import Field
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Docker repository
+class DockerRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    block_pushing_schema1: bool = False
+    max_unique_tags: int = 0
+    docker_tag_retention: int = 1
+
+# Docker virtual repository
+class DockerVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    resolve_docker_tags_by_timestamp: bool = False
+
+# Docker remote repository
+class DockerRemoteRepoConfig(BaseRemoteRepoConfig):
+    block_pushing_schema1: bool = False
+    enable_token_authentication: bool = True
+    external_dependencies_enabled: bool = False
+    external_dependencies_patterns: List[str] = Field(default_factory=list)
+    project_id: Optional[str] = None
@@ -0,0 +1,13 @@
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Gems repository
+class GemsRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# Gems virtual repository
+class GemsVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# Gems remote repository
+class GemsRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
@@ -0,0 +1,13 @@
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Generic repository
+class GenericRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# Generic virtual repository
+class GenericVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# Generic remote repository
+class GenericRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
@@ -0,0 +1,19 @@
+from typing import List
+from pydantic import Field
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Go repository
+class GoRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "go-default"
+
+# Go virtual repository
+class GoVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "go-default"
+    external_dependencies_enabled: bool = False
+    external_dependencies_patterns: List[str] = Field(default_factory=list)
+
+# Go remote repository
+class GoRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "go-default"
+    vcs_git_provider: str = "ARTIFACTORY"
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Gradle repository
+class GradleRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "gradle-default"
+    checksum_policy_type: str = "client-checksums"
+    snapshot_version_behavior: str = "unique"
+    max_unique_snapshots: int = 0
+    handle_releases: bool = True
+    handle_snapshots: bool = True
+    suppress_pom_consistency_checks: bool = True
+
+# Gradle virtual repository
+class GradleVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "gradle-default"
+    pom_repository_references_cleanup_policy: Optional[str] = None
+    key_pair: Optional[str] = None
+
+# Gradle remote repository
+class GradleRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "gradle-default"
+    fetch_jars_eagerly: bool = False
+    fetch_sources_eagerly: bool = False
+    handle_releases: bool = True
+    handle_snapshots: bool = True
+    suppress_pom_consistency_checks: bool = True
+    reject_invalid_jars: bool = False
+    max_unique_snapshots: int = 0
+    remote_repo_checksum_policy_type: str = "generate-if-absent"
@@ -0,0 +1,22 @@
+from typing import List, Optional
+from pydantic import Field
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Helm repository
+class HelmRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    force_non_duplicate_chart: bool = False
+    force_metadata_name_version: bool = False
+
+# Helm virtual repository
+class HelmVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    retrieval_cache_period_seconds: int = 7200
+    use_namespaces: bool = False
+
+# Helm remote repository
+class HelmRemoteRepoConfig(BaseRemoteRepoConfig):
+    helm_charts_base_url: Optional[str] = None
+    external_dependencies_enabled: bool = False
+    external_dependencies_patterns: List[str] = Field(default_factory=list)
@@ -0,0 +1,7 @@
+from structure_models.base import BaseRepoConfig
+
+# Helm OCI repository
+class HelmochiRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    docker_tag_retention: int = 1
+    max_unique_tags: int = 0
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from structure_models.base import BaseRepoConfig, BaseVirtualRepoConfig
+
+# Ivy repository
+class IvyRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "ivy-default"
+
+# Ivy virtual repository
+class IvyVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "ivy-default"
+    pom_repository_references_cleanup_policy: Optional[str] = None
+    key_pair: Optional[str] = None
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# Maven repository
+class MavenRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "maven-2-default"
+    checksum_policy_type: str = "client-checksums"
+    snapshot_version_behavior: str = "unique"
+    max_unique_snapshots: int = 0
+    handle_releases: bool = True
+    handle_snapshots: bool = True
+    suppress_pom_consistency_checks: bool = False
+
+# Maven virtual repository
+class MavenVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "maven-2-default"
+    pom_repository_references_cleanup_policy: Optional[str] = None
+    force_maven_authentication: bool = False
+    key_pair: Optional[str] = None
+
+# Maven remote repository
+class MavenRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "maven-2-default"
+    fetch_jars_eagerly: bool = False
+    fetch_sources_eagerly: bool = False
+    handle_releases: bool = True
+    handle_snapshots: bool = True
+    suppress_pom_consistency_checks: bool = False
+    reject_invalid_jars: bool = False
+    max_unique_snapshots: int = 0
+    remote_repo_checksum_policy_type: str = "generate-if-absent"
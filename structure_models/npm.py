@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import Field
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# NPM repository
+class NpmRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "npm-default"
+
+# NPM virtual repository
+class NpmVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "npm-default"
+    retrieval_cache_period_seconds: int = 7200
+    external_dependencies_enabled: bool = False
+    external_dependencies_remote_repo: Optional[str] = None
+    external_dependencies_patterns: List[str] = Field(default_factory=lambda: ["**"])
+
+# NPM remote repository
+class NpmRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "npm-default"
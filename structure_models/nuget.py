@@ -0,0 +1,23 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# NuGet repository
+class NugetRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "nuget-default"
+    max_unique_snapshots: int = 0
+    force_nuget_authentication: bool = False
+
+# NuGet virtual repository
+class NugetVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "nuget-default"
+    force_nuget_authentication: bool = False
+
+# NuGet remote repository
+class NugetRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "nuget-default"
+    feed_context_path: str = "api/v2"
+    download_context_path: str = "api/v2/package"
+    v3_feed_url: Optional[str] = None
+    force_nuget_authentication: bool = False
+    symbol_server_url: Optional[str] = None
@@ -0,0 +1,14 @@
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# PyPI repository
+class PypiRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# PyPI virtual repository
+class PypiVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+
+# PyPI remote repository
+class PypiRemoteRepoConfig(BaseRemoteRepoConfig):
+    pypi_registry_url: str = "https://pypi.org"
+    pypi_repository_suffix: str = "simple"
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig, BaseRepoConfig, BaseVirtualRepoConfig
+
+# RPM repository
+class RpmRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    primary_key_pair_ref: Optional[str] = None
+    secondary_key_pair_ref: Optional[str] = None
+    yum_root_depth: int = 0
+    yum_group_file_names: Optional[str] = None
+    enable_file_lists_indexing: bool = False
+    calculate_yum_metadata: bool = False
+
+# RPM virtual repository
+class RpmVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "simple-default"
+    primary_keypair_ref: Optional[str] = None
+    secondary_keypair_ref: Optional[str] = None
+
+# RPM remote repository
+class RpmRemoteRepoConfig(BaseRemoteRepoConfig):
+    pass
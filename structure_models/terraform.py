@@ -0,0 +1,10 @@
+from structure_models.base import BaseRemoteRepoConfig, BaseVirtualRepoConfig
+
+# Terraform virtual repository
+class TerraformVirtualRepoConfig(BaseVirtualRepoConfig):
+    repo_layout_ref: str = "terraform-module-default"
+
+# Terraform remote repository
+class TerraformRemoteRepoConfig(BaseRemoteRepoConfig):
+    terraform_registry_url: str = "https://registry.terraform.io"
+    terraform_providers_url: str = "https://releases.hashicorp.com"
@@ -0,0 +1,5 @@
+from structure_models.base import BaseRepoConfig
+
+# Terraform Module repository
+class TerraformModuleRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "terraform-module-default"
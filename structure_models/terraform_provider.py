@@ -0,0 +1,5 @@
+from structure_models.base import BaseRepoConfig
+
+# Terraform Provider repository
+class TerraformProviderRepoConfig(BaseRepoConfig):
+    repo_layout_ref: str = "terraform-provider-default"
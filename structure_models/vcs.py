@@ -0,0 +1,10 @@
+from typing import Optional
+
+from structure_models.base import BaseRemoteRepoConfig
+
+# Vcs remote repository
+class VcsRemoteRepoConfig(BaseRemoteRepoConfig):
+    repo_layout_ref: str = "vcs-default"
+    vcs_git_provider: str = "GITHUB"
+    vcs_git_download_url: Optional[str] = None
+    max_unique_snapshots: int = 0
@@ -0,0 +1,96 @@
+import requests
+
+from artifactory_client import ArtifactoryClient
+from benchmarks.stub_artifactory import running_stub
+from structure import GenericRepoConfig, RepositoryStructureBuilder
+
+
+class _Response:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+
+    def close(self):
+        pass
+
+
+class _ScriptedSession(requests.Session):
+    # Answers each request with the next outcome: a status, a (status, text) pair or an exception
+    def __init__(self, outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, tuple):
+            return _Response(*outcome)
+        return _Response(outcome)
+
+
+def _repo(key):
+    return GenericRepoConfig(key=key)
+
+
+def _client(outcomes):
+    return ArtifactoryClient("http://artifactory.invalid", backoff=0, session=_ScriptedSession(outcomes))
+
+
+def test_put_is_not_resent_after_read_timeout():
+    client = _client([requests.ReadTimeout()])
+    [result] = client.push([("local_repositories", "generic", _repo("new"))], existing=set())
+    assert (result.method, result.error, result.attempts) == ("PUT", "ReadTimeout", 1)
+    assert client.session.calls == ["PUT"]
+
+
+def test_connection_errors_report_every_attempt():
+    client = _client([requests.ConnectionError()] * 5)
+    [result] = client.push([("local_repositories", "generic", _repo("new"))], existing=set())
+    assert (result.error, result.attempts) == ("ConnectionError", 5)
+
+
+def test_retry_after_is_capped():
+    client = ArtifactoryClient("http://artifactory.invalid", max_delay=2.0)
+    response = _Response(429)
+    for retry_after, delay in (("86400", 2.0), ("0.5", 0.5), ("-3", 0.0)):
+        response.headers["Retry-After"] = retry_after
+        assert client._delay(0, response) == delay
+    response.headers["Retry-After"] = "Wed, 21 Oct 2026 07:28:00 GMT"
+    assert client._delay(10, response) == 2.0
+
+
+def test_post_is_resent_after_read_timeout():
+    client = _client([requests.ReadTimeout(), 200])
+    [result] = client.push([("local_repositories", "generic", _repo("old"))], existing={"old"})
+    assert result.ok and result.attempts == 2
+    assert client.session.calls == ["POST", "POST"]
+
+
+def test_put_retried_after_server_error_accepts_already_exists():
+    client = _client([503, (400, '{"errors": [{"message": "Repository new already exists"}]}')])
+    [result] = client.push([("local_repositories", "generic", _repo("new"))], existing=set())
+    assert result.ok and result.attempts == 2
+
+
+def test_put_already_exists_on_first_attempt_is_an_error():
+    client = _client([(400, '{"errors": [{"message": "Repository new already exists"}]}')])
+    [result] = client.push([("local_repositories", "generic", _repo("new"))], existing=set())
+    assert not result.ok
+
+
+def test_push_structure_lists_repositories_once(monkeypatch):
+    builder = RepositoryStructureBuilder()
+    builder.add_local("maven", key="libs-local")
+    builder.add_virtual("maven", key="libs", repositories=["libs-local"])
+    with running_stub() as stub, ArtifactoryClient(stub.url, max_workers=2) as client:
+        listings = []
+        listing = client.repository_keys
+        monkeypatch.setattr(client, "repository_keys", lambda: listings.append(1) or listing())
+        results = list(client.push_structure(builder.build()))
+    assert len(listings) == 1
+    assert [(r.key, r.method, r.ok) for r in results] == [("libs-local", "PUT", True), ("libs", "PUT", True)]
+
@@ -0,0 +1,32 @@
+from benchmarks.common import NONPROD_EXPORT
+from compact import CompactInventory
+from loader import load_repository_structure
+from structure import REPO_CONFIGS, DockerRepoConfig, MavenRepoConfig, RpmRepoConfig
+
+
+def test_bool_and_int_values_keep_their_type():
+    inventory = CompactInventory()
+    # False and True are interned before the equal ints 0 and 1
+    inventory.add("local_repositories", "maven", "libs", MavenRepoConfig(key="libs", handle_releases=False))
+    inventory.add("local_repositories", "rpm", "rpms", RpmRepoConfig(key="rpms", calculate_yum_metadata=True))
+    inventory.add("local_repositories", "docker", "images",
+                  DockerRepoConfig(key="images", docker_tag_retention=0, max_unique_tags=1))
+
+    docker = inventory.get("local_repositories", "docker", "images").to_dict()
+    assert type(docker["docker_tag_retention"]) is int and docker["docker_tag_retention"] == 0
+    assert type(docker["max_unique_tags"]) is int and docker["max_unique_tags"] == 1
+    assert inventory.get("local_repositories", "maven", "libs").to_dict()["handle_releases"] is False
+    assert inventory.get("local_repositories", "rpm", "rpms").to_dict()["calculate_yum_metadata"] is True
+
+
+def test_structure_round_trip():
+    with open(NONPROD_EXPORT) as fp:
+        structure = load_repository_structure(fp)
+    inventory = CompactInventory.from_structure(structure)
+    assert len(inventory) == sum(
+        len(getattr(getattr(structure, section), package_type))
+        for section, config_classes in REPO_CONFIGS.items() for package_type in config_classes
+    )
+    assert inventory.to_structure() == structure
+    with open(NONPROD_EXPORT) as fp:
+        assert CompactInventory.from_export(fp).to_structure() == structure
@@ -0,0 +1,53 @@
+import pytest
+import requests
+
+from benchmarks.stub_graph import FakeCredential, running_stub
+from graph_resolver import GraphResolver
+
+
+def _resolver(stub, **options):
+    return GraphResolver(FakeCredential(), base_url=stub.url, **options)
+
+
+def test_throttled_sub_requests_are_retried():
+    with running_stub(users=5, groups=0) as stub, _resolver(stub) as resolver:
+        throttles = iter([True])
+        stub.throttled = lambda: next(throttles, False)
+        users = resolver.resolve_users(["user0@example.com", "user1@example.com"])
+    assert [u["displayName"] for u in users.values()] == ["User 0", "User 1"]
+    assert (stub.requests, stub.sub_requests) == (2, 3)
+
+
+def test_retry_after_is_parsed_defensively():
+    resolver = GraphResolver(FakeCredential(), max_delay=5.0)
+    assert resolver._delay({"Retry-After": "2"}, 1) == 2.0
+    assert resolver._delay({"Retry-After": "3600"}, 1) == 5.0
+    assert resolver._delay({"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}, 1) == 1.0
+    assert resolver._delay({}, 4) == 4.0
+
+
+def test_batch_partial_failure():
+    with running_stub(users=5, groups=2) as stub, _resolver(stub) as resolver:
+        users = resolver.resolve_users(["user0@example.com", "nobody@example.com"])
+        assert users["user0@example.com"]["displayName"] == "User 0"
+        assert users["nobody@example.com"] is None
+        group_id = next(iter(stub.groups))
+        with pytest.raises(requests.HTTPError, match="unknown-group"):
+            resolver.group_members([group_id, "unknown-group"])
+
+
+def test_404_is_cached():
+    with running_stub(users=1, groups=0) as stub, _resolver(stub) as resolver:
+        assert resolver.resolve_users(["nobody@example.com"]) == {"nobody@example.com": None}
+        assert resolver.resolve_users(["NOBODY@example.com"]) == {"NOBODY@example.com": None}
+    assert stub.requests == 1
+    assert resolver.cache.hits == 1
+
+
+def test_ambiguous_group_name():
+    with running_stub(users=0, groups=2) as stub, _resolver(stub) as resolver:
+        first, second = stub.groups.values()
+        second["displayName"] = first["displayName"]
+        with pytest.raises(ValueError, match="ambiguous"):
+            resolver.resolve_groups([first["displayName"]])
+        assert resolver.resolve_groups([first["id"]])[first["id"]]["id"] == first["id"]
@@ -0,0 +1,54 @@
+import io
+import json
+
+import pytest
+
+from benchmarks.common import NONPROD_EXPORT
+from loader import SECTIONS, iter_repositories, load_repository_structure, load_repository_structure_full
+from serialization import dump_json, load_json
+from structure import to_json
+
+
+@pytest.fixture(scope="module")
+def export_text():
+    with open(NONPROD_EXPORT) as fp:
+        return fp.read()
+
+
+@pytest.mark.parametrize("validation", ["full", "sampled", "trusted"])
+def test_stream_matches_whole_document(export_text, validation):
+    # A small chunk size puts chunk boundaries inside keys, strings and numbers
+    streamed = load_repository_structure(io.StringIO(export_text), chunk_size=7, validation=validation, seed=0)
+    whole = load_repository_structure_full(io.StringIO(export_text))
+    assert streamed == whole
+    assert to_json(streamed) == to_json(whole)
+
+
+def test_stream_round_trip(export_text):
+    loaded = load_repository_structure(io.StringIO(export_text))
+    assert load_repository_structure(io.StringIO(to_json(loaded))) == loaded
+    assert load_json(dump_json(loaded)) == loaded
+
+
+def test_untyped_entries_cover_every_section(export_text):
+    data = json.loads(export_text)
+    expected = [
+        (section, package_type, name, config)
+        for section in SECTIONS for package_type, repos in data.get(section, {}).items()
+        for name, config in repos.items()
+    ]
+    entries = list(iter_repositories(io.StringIO(export_text), typed=False, chunk_size=64))
+    assert sorted(map(tuple, entries), key=repr) == sorted(expected, key=repr)
+
+
+def test_escaped_strings_across_chunks():
+    export = {"local_repositories": {"generic": {
+        'quote"d': {"key": 'quote"d', "description": "tab\tnew\nline \\ é中 \U0001f600"},
+    }}}
+    [entry] = iter_repositories(io.StringIO(json.dumps(export)), typed=False, chunk_size=1)
+    assert entry.config == export["local_repositories"]["generic"]['quote"d']
+
+
+def test_data_after_export_is_rejected():
+    with pytest.raises(ValueError):
+        list(iter_repositories(io.StringIO('{"local_repositories": {}} {}'), typed=False))
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from onboard import main
+
+
+def _requests(tmp_path, *rows):
+    path = tmp_path / "requests.jsonl"
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+
+def test_build_writes_output(tmp_path):
+    requests = _requests(tmp_path, {"package_type": "generic", "key": "files-local"})
+    out = tmp_path / "out.tfvars.json"
+    assert main(["build", requests, "--out", str(out)]) == 0
+    assert "files-local" in json.loads(out.read_text())["local_repositories"]["generic"]
+    assert not (tmp_path / "out.tfvars.json.partial").exists()
+
+
+def test_errors_keep_previous_output(tmp_path, capsys):
+    requests = _requests(tmp_path, {"package_type": "generic", "key": "files-local"},
+                         {"package_type": "nosuchtype", "key": "broken"})
+    out = tmp_path / "out.tfvars.json"
+    out.write_text("previous")
+    assert main(["build", requests, "--out", str(out)]) == 1
+    assert out.read_text() == "previous"
+    assert not (tmp_path / "out.tfvars.json.partial").exists()
+    assert "Unsupported local_repositories package type: nosuchtype" in capsys.readouterr().err
+
+
+def test_errors_leave_no_output(tmp_path):
+    requests = _requests(tmp_path, {"package_type": "generic", "key": "dup"}, {"package_type": "npm", "key": "dup"})
+    out = tmp_path / "out.tfvars.json"
+    assert main(["build", requests, "--out", str(out)]) == 1
+    assert list(tmp_path.iterdir()) == [tmp_path / "requests.jsonl"]
+
+
+def test_jsonl_to_stdout(tmp_path, capsys):
+    requests = _requests(tmp_path, {"package_type": "maven", "key": "libs-local", "handle_releases": False})
+    assert main(["build", requests, "--format", "jsonl"]) == 0
+    [line] = capsys.readouterr().out.splitlines()
+    assert json.loads(line) == {"rclass": "local", "package_type": "maven", "key": "libs-local",
+                                "handle_releases": False}
+
+
+@pytest.mark.parametrize("row", [
+    # Field groups are satisfied by the model defaults of the fields left out
+    {"package_type": "maven", "key": "libs-local", "handle_releases": False},
+    {"package_type": "docker", "key": "images-local", "max_unique_tags": 5},
+    {"package_type": "nuget", "key": "packages-local", "force_nuget_authentication": True},
+])
+def test_validate_partial_field_groups(tmp_path, row):
+    assert main(["validate", _requests(tmp_path, row)]) == 0
+
+
+def test_validate_cross_repo_errors(tmp_path):
+    requests = _requests(tmp_path, {"package_type": "maven", "key": "libs-local"},
+                         {"rclass": "virtual", "package_type": "maven", "key": "libs",
+                          "repositories": ["libs-local", "libs-remote"]})
+    assert main(["validate", requests]) == 1
+
+
+def test_unknown_fields_are_row_errors(tmp_path, capsys):
+    requests = _requests(tmp_path, {"package_type": "npm", "key": "npm-local", "trivial_layout": True})
+    assert main(["validate", requests]) == 1
+    assert "NpmRepoConfig got unexpected field(s): trivial_layout" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+from benchmarks.stub_upstream import running_stub
+from prober import RemoteTarget, probe_remotes, recommend
+
+
+def _target(key, url, timeout_ms=2000, **fields):
+    return RemoteTarget(key=key, package_type="generic", url=url, socket_timeout_millis=timeout_ms, **fields)
+
+
+def test_probe_slow_and_failing_hosts():
+    with running_stub() as stub:
+        targets = [
+            _target("healthy", f"{stub.url}/ok/repo"),
+            _target("slow", f"{stub.url}/slow/100/repo"),
+            _target("too-slow", f"{stub.url}/slow/1000/repo", timeout_ms=200),
+            _target("broken", f"{stub.url}/status/503/repo"),
+            _target("missing-path", f"{stub.url}/status/404/repo"),
+            _target("dropped", f"{stub.url}/drop/repo"),
+        ]
+        results = {r.target.key: r for r in probe_remotes(targets, attempts=2, max_workers=8)}
+
+    assert stub.hits["ok"] == stub.hits["drop"] == 2
+    assert results["healthy"].failures == [] and len(results["healthy"].latencies_ms) == 2
+    assert results["slow"].failures == [] and min(results["slow"].latencies_ms) >= 100
+    assert results["too-slow"].failures == ["timeout after 200 ms"] * 2
+    assert results["broken"].failures == ["HTTP 503"] * 2
+    # Any answer below 500 means the upstream is up
+    assert results["missing-path"].failures == []
+    assert len(results["dropped"].failures) == 2 and results["dropped"].latencies_ms == []
+
+
+def test_probe_timeout_is_capped():
+    with running_stub() as stub:
+        [result] = probe_remotes([_target("slow", f"{stub.url}/slow/1000/repo", timeout_ms=15000)],
+                                 attempts=1, timeout_ms=100)
+    assert result.failures == ["timeout after 100 ms"]
+
+
+def test_recommendations():
+    with running_stub() as stub:
+        targets = [
+            _target("dead", f"{stub.url}/status/502/repo"),
+            _target("revived", f"{stub.url}/ok/repo", offline=True),
+            _target("fast", f"{stub.url}/ok/repo", timeout_ms=60000),
+            _target("tight", f"{stub.url}/slow/850/repo", timeout_ms=1000),
+        ]
+        results = probe_remotes(targets, attempts=3)
+    actions = {r.key: r for r in recommend(results, headroom=3.0, min_timeout_ms=2000)}
+    assert actions["dead"].action == "mark_offline"
+    assert actions["revived"].action == "mark_online"
+    assert (actions["fast"].action, actions["fast"].suggested) == ("lower_socket_timeout", 2000)
+    assert actions["tight"].action == "raise_socket_timeout" and actions["tight"].suggested > 1000
@@ -0,0 +1,36 @@
+from resolution_cost import ResolutionCostModel
+from structure import RepositoryStructureBuilder
+
+
+def _model(*remotes, upstream_ms=None):
+    builder = RepositoryStructureBuilder()
+    builder.add_local("maven", key="libs-local")
+    for key, fields in remotes:
+        builder.add_remote("maven", key=key, url=f"https://{key}.invalid", **fields)
+    builder.add_virtual("maven", key="libs", repositories=["libs-local"] + [key for key, _ in remotes])
+    return ResolutionCostModel(builder.build(), upstream_ms=upstream_ms)
+
+
+def test_miss_cost_depends_on_order():
+    model = _model(("slow", {"includes_pattern": "org/**"}), ("fast", {"includes_pattern": "com/**"}),
+                   upstream_ms={"slow": 900.0, "fast": 100.0})
+    cost = model.virtual_cost("libs")
+    assert cost.proposed_order == ["libs-local", "fast", "slow"]
+    assert cost.proposed_cache_miss_ms < cost.cache_miss_ms
+    assert cost.blocked_moves == []
+
+
+def test_overlapping_patterns_block_the_move():
+    model = _model(("slow", {}), ("fast", {}), upstream_ms={"slow": 900.0, "fast": 100.0})
+    cost = model.virtual_cost("libs")
+    assert cost.proposed_order is None and cost.proposed_cache_miss_ms is None
+    assert cost.blocked_moves == [("slow", "fast")]
+
+
+def test_hard_fail_remote_keeps_its_place():
+    model = _model(("slow", {"includes_pattern": "org/**", "hard_fail": True, "socket_timeout_millis": 1000}),
+                   ("fast", {"includes_pattern": "com/**"}), upstream_ms={"slow": 900.0, "fast": 100.0})
+    cost = model.virtual_cost("libs")
+    assert cost.proposed_order is None
+    # The local and both caches, then the hard_fail upstream aborts the lookup
+    assert cost.worst_case_ms == 3 * model.local_ms + 1000
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from structure import RepositoryStructureBuilder, build_repo
+
+
+def test_builder_rejects_unknown_fields_as_row_errors():
+    builder = RepositoryStructureBuilder()
+    with pytest.raises(ValueError, match="trivial_layout"):
+        builder.add_rows([{"package_type": "npm", "key": "npm-local", "trivial_layout": True}])
+    assert builder.build().local_repositories.npm == {}
+
+
+def test_builder_accepts_export_names():
+    builder = RepositoryStructureBuilder()
+    builder.add_rows([
+        {"package_type": "docker", "key": "images-local", "tag_retention": 3, "xray_index": True},
+        {"rclass": "remote", "package_type": "docker", "key": "hub", "url": "https://registry-1.docker.io",
+         "xray_index": True},
+    ])
+    structure = builder.build()
+    local = structure.local_repositories.docker["images-local"]
+    assert (local.docker_tag_retention, local.x_ray_index) == (3, True)
+    assert structure.remote_repositories.docker["hub"].xray_index is True
+
+
+def test_builder_rejects_duplicates():
+    builder = RepositoryStructureBuilder()
+    builder.add_local("generic", key="files")
+    with pytest.raises(ValueError, match="Duplicate"):
+        builder.add_local("generic", key="files")
+
+
+def test_build_repo():
+    section, package_type, name, remote = build_repo(
+        {"rclass": "remote", "package_type": "docker", "key": "hub", "url": "https://registry-1.docker.io",
+         "repo_name": "dockerhub"})
+    assert (section, package_type, name, remote.key) == ("remote_repositories", "docker", "dockerhub", "hub")
+    assert build_repo({"package_type": "generic", "key": "files"})[:3] == ("local_repositories", "generic", "files")
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"key": "files"}, "package_type is required"),
+    ({"rclass": "federated", "package_type": "generic", "key": "files"}, "Unsupported rclass"),
+    ({"package_type": "nosuchtype", "key": "files"}, "Unsupported local_repositories package type"),
+    ({"package_type": "generic", "key": "files", "ddeb_supported": True}, "unexpected field"),
+    ({"package_type": "docker", "key": "images", "max_unique_tags": "many"}, "max_unique_tags"),
+])
+def test_build_repo_errors(row, message):
+    with pytest.raises(ValueError, match=message):
+        build_repo(row)
+
+
+def _fresh(code):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                          check=True).stdout.split()
+
+
+def test_models_are_imported_per_package_type():
+    loaded = _fresh(
+        "import sys, structure\n"
+        "assert not any(m.startswith('structure_models') for m in sys.modules)\n"
+        "structure.REPO_CONFIGS['local_repositories']['maven']\n"
+        "print(*sorted(m for m in sys.modules if m.startswith('structure_models.')))"
+    )
+    assert loaded == ["structure_models.base", "structure_models.maven"]
+
+
+def test_star_import_exports_models():
+    assert _fresh("from structure import *; print(MavenRepoConfig.__name__, RepositoryStructure.__name__)") == [
+        "MavenRepoConfig", "RepositoryStructure",
+    ]
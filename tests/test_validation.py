@@ -0,0 +1,120 @@
+import pytest
+
+from validation import Validator, validate_entries, validate_structure
+
+LOCAL, REMOTE, VIRTUAL = "local_repositories", "remote_repositories", "virtual_repositories"
+
+
+def _rules(*entries):
+    return [(v.rule, v.severity, v.key, v.field) for v in validate_entries(entries)]
+
+
+def test_clean_inventory():
+    assert _rules(
+        (LOCAL, "maven", {"key": "libs-local", "repo_layout_ref": "maven-2-default"}),
+        (REMOTE, "maven", {"key": "central", "url": "https://repo1.maven.org/maven2"}),
+        (VIRTUAL, "maven", {"key": "libs", "repositories": ["libs-local", "central"],
+                            "default_deployment_repo": "libs-local"}),
+        (LOCAL, "debian", {"key": "apt-local", "trivial_layout": True, "ddeb_supported": False,
+                           "index_compression_formats": ["bz2"]}),
+    ) == []
+
+
+def test_layout():
+    assert _rules((LOCAL, "npm", {"key": "npm-local", "repo_layout_ref": "maven-2-default"})) == [
+        ("layout", "warning", "npm-local", "repo_layout_ref"),
+    ]
+
+
+@pytest.mark.parametrize("package_type, field", [
+    ("npm", "max_unique_tags"),
+    ("generic", "handle_releases"),
+    ("pypi", "force_nuget_authentication"),
+    ("rpm", "trivial_layout"),
+    ("alpine", "ddeb_supported"),
+    ("debian", "yum_root_depth"),
+    ("generic", "force_non_duplicate_chart"),
+    ("pypi", "external_dependencies_enabled"),
+    # mappings.json names are checked under their model names
+    ("maven", "tag_retention"),
+])
+def test_type_field(package_type, field):
+    [violation] = validate_entries([(LOCAL, package_type, {"key": "repo", field: True})])
+    assert (violation.rule, violation.severity) == ("type_field", "error")
+
+
+@pytest.mark.parametrize("package_type, fields, missing", [
+    ("maven", {"handle_releases": True}, "handle_snapshots, max_unique_snapshots"),
+    ("nuget", {"max_unique_snapshots": 5}, "force_nuget_authentication"),
+    ("docker", {"max_unique_tags": 5, "tag_retention": 1}, "block_pushing_schema1"),
+])
+def test_field_group(package_type, fields, missing):
+    assert _rules((LOCAL, package_type, dict(fields, key="repo"))) == [("field_group", "error", "repo", missing)]
+
+
+def test_field_group_only_applies_to_locals():
+    assert _rules((REMOTE, "maven", {"key": "central", "handle_releases": True})) == []
+
+
+def test_duplicate_key_and_case_collision():
+    assert _rules(
+        (LOCAL, "generic", {"key": "Files"}),
+        (LOCAL, "generic", {"key": "files"}),
+        (REMOTE, "generic", {"key": "files"}),
+    ) == [
+        ("case_collision", "warning", "files", "key"),
+        ("duplicate_key", "error", "files", "key"),
+    ]
+
+
+def test_missing_member_suggests_a_key():
+    [violation] = validate_entries([
+        (LOCAL, "npm", {"key": "npm-local"}),
+        (VIRTUAL, "npm", {"key": "npm", "repositories": ["npm-locl"]}),
+    ])
+    assert (violation.rule, violation.severity) == ("missing_member", "error")
+    assert violation.message == "member npm-locl does not exist (did you mean npm-local?)"
+
+
+def test_member_type():
+    assert _rules(
+        (LOCAL, "npm", {"key": "npm-local"}),
+        (LOCAL, "gradle", {"key": "gradle-local"}),
+        (VIRTUAL, "maven", {"key": "libs", "repositories": ["npm-local", "gradle-local"]}),
+    ) == [("member_type", "error", "libs", "repositories")]
+
+
+def test_default_deployment_repo():
+    violations = validate_entries([
+        (LOCAL, "maven", {"key": "libs-local"}),
+        (REMOTE, "maven", {"key": "central"}),
+        (VIRTUAL, "maven", {"key": "outside", "repositories": ["libs-local"], "default_deployment_repo": "other"}),
+        (VIRTUAL, "maven", {"key": "remote", "repositories": ["central"], "default_deployment_repo": "central"}),
+    ])
+    assert [(v.rule, v.key, v.message) for v in violations] == [
+        ("default_deployment_repo", "outside", "other is not a member"),
+        ("default_deployment_repo", "remote", "central is a remote repository, not a local one"),
+    ]
+
+
+def test_known_repos_resolve_members():
+    validator = Validator()
+    validator.known(LOCAL, "maven", "libs-local")
+    validator.known(LOCAL, "maven", "libs-local")
+    validator.add(VIRTUAL, "maven", {"key": "libs", "repositories": ["libs-local"]})
+    assert validator.finish() == []
+
+
+def test_sharded_matches_single_process():
+    entries = [(LOCAL, "npm", {"key": f"npm-{i}", "max_unique_tags": 1}) for i in range(20)]
+    entries += [(LOCAL, "maven", {"key": f"mvn-{i}", "handle_releases": True}) for i in range(20)]
+    assert validate_entries(entries, processes=2) == validate_entries(entries)
+
+
+def test_structure_models_satisfy_field_rules():
+    from structure import RepositoryStructureBuilder
+
+    builder = RepositoryStructureBuilder()
+    builder.add_local("maven", key="libs-local", handle_releases=False)
+    builder.add_local("docker", key="images-local", max_unique_tags=5)
+    assert validate_structure(builder.build()) == []
@@ -0,0 +1,116 @@
+import argparse
+import json
+from collections import Counter
+from typing import IO, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from loader import SECTIONS, iter_repositories
+from tfvars import TfvarsWriter, load_tf_schemas, schema_attributes
+from translator import SECTION_RCLASS
+
+# Provider resource types that do not follow artifactory_<rclass>_<package_type>_repository
+RESOURCE_TYPE_OVERRIDES = {
+    ("local_repositories", "docker"): "artifactory_local_docker_v2_repository",
+}
+
+# Address of one repo in the configuration applying the tfvars: a resource per
+# package type, for_each over var.<section>.<package_type>, keyed by repo name
+DEFAULT_ADDRESS = "{resource_type}.{package_type}[{name}]"
+
+
+class SkippedRepo(NamedTuple):
+    section: str
+    package_type: str
+    name: str
+    reason: str
+
+
+class ImportStats(NamedTuple):
+    imports: int
+    skipped: Tuple[SkippedRepo, ...]
+    # (section, package_type) -> export fields the Terraform schema has no attribute for
+    dropped: Dict[Tuple[str, str], Counter]
+
+
+def resource_type(section: str, package_type: str) -> str:
+    override = RESOURCE_TYPE_OVERRIDES.get((section, package_type))
+    if override is not None:
+        return override
+    return f"artifactory_{SECTION_RCLASS[section]}_{package_type}_repository"
+
+
+def resource_address(section: str, package_type: str, name: str, address: str = DEFAULT_ADDRESS,
+                     module: Optional[str] = None) -> str:
+    # json.dumps quotes and escapes the name as an HCL string
+    target = address.format(resource_type=resource_type(section, package_type), package_type=package_type,
+                            section=section, name=json.dumps(name))
+    return f"module.{module}.{target}" if module else target
+
+
+def write_imports(
+    fp: IO[str],
+    imports_out: IO[str],
+    tfvars_out: Optional[IO[str]] = None,
+    address: str = DEFAULT_ADDRESS,
+    module: Optional[str] = None,
+    schemas: Optional[Dict[str, Dict[str, FrozenSet[str]]]] = None,
+) -> ImportStats:
+    """Stream an export to Terraform import blocks and, optionally, the matching tfvars.
+
+    Entries are read as dicts, so package types structure.py does not model
+    (sbt, ...) are handled like the rest. A repo whose package type has no
+    schema in its section's variable gets neither an import block nor a
+    tfvars entry and is reported in `skipped`; sections without a schema
+    (virtual_repositories, for now) are written unfiltered. Planning the
+    blocks with the tfvars adopts the whole inventory in one plan/apply.
+    """
+    if schemas is None:
+        schemas = load_tf_schemas()
+    writer = TfvarsWriter(tfvars_out, schemas=schemas) if tfvars_out is not None else None
+    imports = 0
+    skipped: List[SkippedRepo] = []
+    dropped: Dict[Tuple[str, str], Counter] = {}
+    for entry in iter_repositories(fp, sections=SECTIONS, typed=False):
+        section, package_type, name, config = entry
+        try:
+            schema_attributes(schemas, section, package_type)
+        except ValueError as e:
+            skipped.append(SkippedRepo(section, package_type, name, str(e)))
+            continue
+        if writer is not None:
+            fields = writer.add_export(section, package_type, name, config)
+            if fields:
+                dropped.setdefault((section, package_type), Counter()).update(fields)
+        imports_out.write(
+            "import {\n"
+            f"  to = {resource_address(section, package_type, name, address, module)}\n"
+            f"  id = {json.dumps(config['key'])}\n"
+            "}\n\n"
+        )
+        imports += 1
+    if writer is not None:
+        writer.finish()
+    return ImportStats(imports, tuple(skipped), dropped)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Terraform import blocks and tfvars for an existing inventory")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--imports", default="imports.tf", help="import blocks output (default imports.tf)")
+    parser.add_argument("--tfvars", help="also write the matching .tfvars.json here")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS,
+                        help="resource address template; fields: resource_type, package_type, section, name")
+    parser.add_argument("--module", help="module the resources live in")
+    args = parser.parse_args()
+
+    with open(args.export) as fp, open(args.imports, "w") as imports_fp:
+        if args.tfvars:
+            with open(args.tfvars, "w") as tfvars_fp:
+                stats = write_imports(fp, imports_fp, tfvars_fp, args.address, args.module)
+        else:
+            stats = write_imports(fp, imports_fp, address=args.address, module=args.module)
+    print(f"{stats.imports} import blocks written to {args.imports}")
+    for repo in stats.skipped:
+        print(f"skipped {repo.section} {repo.package_type} {repo.name}: {repo.reason}")
+    for (section, package_type), fields in sorted(stats.dropped.items()):
+        names = ", ".join(f"{field} ({count})" for field, count in fields.most_common())
+        print(f"{section} {package_type}: no Terraform attribute for {names}")
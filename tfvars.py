@@ -0,0 +1,275 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import IO, TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from compact import class_defaults, class_field_names
+from structure import REPO_CONFIGS
+from translator import MODEL_FIELD_ALIASES
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TF_VARIABLE_FILES = (
+    "repos_local_variables.tf",
+    "repos_remote_variables.tf",
+    "repos_virtual_variables.tf",
+)
+
+# Model field -> Terraform attribute, where the variable schemas name a field differently
+TF_ATTRIBUTE_RENAMES: Dict[str, Dict[str, Dict[str, str]]] = {
+    "local_repositories": {
+        "alpine": {"primary_key_pair_ref": "primary_keypair_ref"},
+        "rpm": {"primary_key_pair_ref": "primary_keypair_ref"},
+        "debian": {"primary_key_pair_ref": "primary_keypair_ref"},
+    },
+}
+
+_VARIABLE = re.compile(r'^variable "(\w+)" \{')
+_PACKAGE_TYPE = re.compile(r"^    (\w+)\s*= optional\(map\(object\(\{")
+_ATTRIBUTE = re.compile(r"^      (\w+)\s*=")
+
+
+def load_tf_schemas(directory: str = HERE) -> Dict[str, Dict[str, FrozenSet[str]]]:
+    """Read the attribute names of every package type from the *_repositories variables.
+
+    Returns {variable: {package_type: attributes}}. Variables the .tf files do
+    not declare (there is no virtual_repositories schema yet) are absent.
+    """
+    schemas: Dict[str, Dict[str, FrozenSet[str]]] = {}
+    for filename in TF_VARIABLE_FILES:
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            continue
+        variable = package_type = None
+        attributes: Dict[str, Dict[str, list]] = {}
+        with open(path) as fp:
+            for line in fp:
+                match = _VARIABLE.match(line)
+                if match:
+                    variable, package_type = match.group(1), None
+                    continue
+                if variable is None or not variable.endswith("_repositories"):
+                    continue
+                match = _PACKAGE_TYPE.match(line)
+                if match:
+                    package_type = match.group(1)
+                    attributes.setdefault(variable, {})[package_type] = []
+                    continue
+                match = _ATTRIBUTE.match(line)
+                if match and package_type is not None:
+                    attributes[variable][package_type].append(match.group(1))
+        for variable, types in attributes.items():
+            schemas[variable] = {t: frozenset(names) for t, names in types.items()}
+    return schemas
+
+
+def schema_attributes(
+    schemas: Dict[str, Dict[str, FrozenSet[str]]], section: str, package_type: str
+) -> Optional[FrozenSet[str]]:
+    """Attributes of one package type, or None for a section without a schema.
+
+    Raises ValueError for a package type the section's schema does not declare.
+    """
+    section_schema = schemas.get(section)
+    if section_schema is None:
+        return None
+    allowed = section_schema.get(package_type)
+    if allowed is None:
+        raise ValueError(f"{section} has no Terraform schema for package type {package_type}")
+    return allowed
+
+
+def export_attribute(field: str, renames: Dict[str, str], allowed: Optional[FrozenSet[str]]) -> Optional[str]:
+    """Terraform attribute of an export (mappings.json) field name, or None if the schema has none.
+
+    The export name, the model name and its Terraform rename are tried in
+    turn, since the local and remote variables name some fields differently.
+    Without a schema the model name is used, as write_tfvars does.
+    """
+    model_name = MODEL_FIELD_ALIASES.get(field, field)
+    if allowed is None:
+        return renames.get(model_name, model_name)
+    for candidate in (field, model_name, renames.get(model_name)):
+        if candidate in allowed:
+            return candidate
+    return None
+
+
+def _write_repo(out: IO[str], repo, renames: Dict[str, str], allowed: Optional[FrozenSet[str]],
+                drop_nulls: bool, drop_defaults: bool) -> None:
+    config_cls = type(repo)
+    defaults = class_defaults(config_cls) if drop_defaults else {}
+    out.write("{")
+    first = True
+    for name in class_field_names(config_cls):
+        value = getattr(repo, name)
+        if name != "key":
+            if value is None and drop_nulls:
+                continue
+            if name in defaults and value == defaults[name]:
+                continue
+        attribute = renames.get(name, name)
+        if allowed is not None and attribute not in allowed:
+            continue
+        if isinstance(value, BaseModel):
+            # Nested settings such as content_synchronisation
+            value = dict(value.__dict__)
+        out.write(("" if first else ",") + json.dumps(attribute) + ":" + json.dumps(value))
+        first = False
+    out.write("}")
+
+
+def write_tfvars(
+    structure: "RepositoryStructure",
+    out: IO[str],
+    drop_nulls: bool = True,
+    drop_defaults: bool = True,
+    schemas: Optional[Dict[str, Dict[str, FrozenSet[str]]]] = None,
+) -> int:
+    """Stream a RepositoryStructure to `out` as .tfvars.json and return the repo count.
+
+    Each repo is written as it is read, without building the document as a
+    dict. Every Terraform attribute is optional(..., null), so null values and,
+    with drop_defaults, values equal to the model defaults are left out and the
+    provider defaults apply. Field names are renamed to the Terraform attribute
+    names, and attributes a schema does not declare are dropped.
+    """
+    if schemas is None:
+        schemas = load_tf_schemas()
+    count = 0
+    out.write("{")
+    first_section = True
+    for section in REPO_CONFIGS:
+        container = getattr(structure, section)
+        section_schema = schemas.get(section)
+        section_renames = TF_ATTRIBUTE_RENAMES.get(section, {})
+        first_type = True
+        for package_type in REPO_CONFIGS[section]:
+            repos = getattr(container, package_type)
+            if not repos:
+                continue
+            allowed = None
+            if section_schema is not None:
+                allowed = section_schema.get(package_type)
+                if allowed is None:
+                    raise ValueError(f"{section} has no Terraform schema for package type {package_type}")
+            if first_type:
+                out.write(("" if first_section else ",") + "\n" + json.dumps(section) + ":{")
+                first_section = first_type = False
+            else:
+                out.write(",")
+            out.write("\n" + json.dumps(package_type) + ":{")
+            renames = section_renames.get(package_type, {})
+            for i, (name, repo) in enumerate(repos.items()):
+                out.write(("," if i else "") + "\n" + json.dumps(name) + ":")
+                _write_repo(out, repo, renames, allowed, drop_nulls, drop_defaults)
+                count += 1
+            out.write("}")
+        if not first_type:
+            out.write("}")
+    out.write("\n}\n")
+    return count
+
+
+class TfvarsWriter:
+    """Writes .tfvars.json from repos added one at a time, in any order.
+
+    Each (section, package type) is spooled to its own temporary file as its
+    repos arrive, and finish() copies them to `out` in REPO_CONFIGS order, so
+    memory stays flat however many repos are added. The output is the same as
+    write_tfvars for a structure holding the same repos in the same order.
+    """
+
+    def __init__(
+        self,
+        out: IO[str],
+        drop_nulls: bool = True,
+        drop_defaults: bool = True,
+        schemas: Optional[Dict[str, Dict[str, FrozenSet[str]]]] = None,
+    ):
+        self.out = out
+        self.drop_nulls = drop_nulls
+        self.drop_defaults = drop_defaults
+        self.schemas = load_tf_schemas() if schemas is None else schemas
+        self._spools: Dict[Tuple[str, str], IO[str]] = {}
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def _spool(self, section: str, package_type: str, name: str) -> IO[str]:
+        group = (section, package_type)
+        spool = self._spools.get(group)
+        if spool is None:
+            spool = self._spools[group] = tempfile.TemporaryFile("w+")
+            self._counts[group] = 0
+        spool.write(("," if self._counts[group] else "") + "\n" + json.dumps(name) + ":")
+        self._counts[group] += 1
+        return spool
+
+    def add(self, section: str, package_type: str, name: str, repo: BaseModel) -> None:
+        allowed = schema_attributes(self.schemas, section, package_type)
+        renames = TF_ATTRIBUTE_RENAMES.get(section, {}).get(package_type, {})
+        spool = self._spool(section, package_type, name)
+        _write_repo(spool, repo, renames, allowed, self.drop_nulls, self.drop_defaults)
+
+    def add_export(self, section: str, package_type: str, name: str, config: Dict[str, Any]) -> List[str]:
+        """Add one repo as read from an export, with no model; returns the fields the schema has no attribute for.
+
+        Works for package types structure.py does not model. Every value is
+        kept as exported (only nulls are dropped with drop_nulls), so the
+        state of an imported repo matches its configuration.
+        """
+        allowed = schema_attributes(self.schemas, section, package_type)
+        renames = TF_ATTRIBUTE_RENAMES.get(section, {}).get(package_type, {})
+        attributes = {}
+        dropped = []
+        for field, value in config.items():
+            if value is None and self.drop_nulls and field != "key":
+                continue
+            attribute = export_attribute(field, renames, allowed)
+            if attribute is None:
+                dropped.append(field)
+            else:
+                attributes[attribute] = value
+        self._spool(section, package_type, name).write(json.dumps(attributes, separators=(",", ":")))
+        return dropped
+
+    def finish(self) -> int:
+        """Write the document and return the repo count."""
+        out = self.out
+        out.write("{")
+        first_section = True
+        # REPO_CONFIGS order, then sections and package types it does not model in the order added
+        sections = list(REPO_CONFIGS) + [s for s, _ in self._spools if s not in REPO_CONFIGS]
+        for section in dict.fromkeys(sections):
+            first_type = True
+            modelled = REPO_CONFIGS.get(section, {})
+            package_types = list(modelled) + [t for s, t in self._spools if s == section and t not in modelled]
+            for package_type in package_types:
+                spool = self._spools.pop((section, package_type), None)
+                if spool is None:
+                    continue
+                if first_type:
+                    out.write(("" if first_section else ",") + "\n" + json.dumps(section) + ":{")
+                    first_section = first_type = False
+                else:
+                    out.write(",")
+                out.write("\n" + json.dumps(package_type) + ":{")
+                spool.seek(0)
+                shutil.copyfileobj(spool, out)
+                spool.close()
+                out.write("}")
+            if not first_type:
+                out.write("}")
+        out.write("\n}\n")
+        return sum(self._counts.values())
+
+
+def write_tfvars_file(structure: "RepositoryStructure", path: str, **options: Any) -> int:
+    with open(path, "w") as out:
+        return write_tfvars(structure, out, **options)
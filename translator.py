@@ -0,0 +1,192 @@
+import json
+import os
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from structure import REPO_CONFIGS, model_fields
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MAPPINGS_PATH = os.path.join(HERE, "mappings.json")
+
+# mappings.json target -> model field, where the models name a field differently
+MODEL_FIELD_ALIASES = {
+    "xray_index": "x_ray_index",
+    "primary_keypair_ref": "primary_key_pair_ref",
+    "secondary_keypair_ref": "secondary_key_pair_ref",
+    "index_compression_formats": "optional_index_compression_formats",
+    "tag_retention": "docker_tag_retention",
+}
+
+# Keys of a REST payload that select the repo class rather than carry a field
+META_KEYS = frozenset({"rclass", "packageType", "terraformType"})
+
+SECTION_RCLASS = {
+    "local_repositories": "local",
+    "remote_repositories": "remote",
+    "virtual_repositories": "virtual",
+}
+RCLASS_SECTION = {rclass: section for section, rclass in SECTION_RCLASS.items()}
+
+
+def _content_sync_to_rest(value: Any) -> Dict[str, Any]:
+    value = value.__dict__ if isinstance(value, BaseModel) else value
+    return {
+        "enabled": value.get("enabled", False),
+        "statistics": {"enabled": value.get("statistics_enabled", False)},
+        "properties": {"enabled": value.get("properties_enabled", False)},
+        "source": {"originAbsenceDetection": value.get("source_origin_absence_detection", False)},
+    }
+
+
+def _content_sync_to_model(value: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "enabled": value.get("enabled", False),
+        "statistics_enabled": (value.get("statistics") or {}).get("enabled", False),
+        "properties_enabled": (value.get("properties") or {}).get("enabled", False),
+        "source_origin_absence_detection": (value.get("source") or {}).get("originAbsenceDetection", False),
+    }
+
+
+# Model field -> (to REST, to model) converters for nested REST objects
+NESTED_FIELDS = {
+    "content_synchronisation": (_content_sync_to_rest, _content_sync_to_model),
+}
+
+
+# Key tables of one repo class, compiled once from mappings.json
+class KeyTable(NamedTuple):
+    to_model: Dict[str, str]
+    rest_keys: FrozenSet[str]
+    to_rest: Dict[str, str]
+    # Model fields with no REST key, reported on every model -> REST translation
+    unmapped_fields: Tuple[str, ...]
+
+
+class Translation(NamedTuple):
+    section: str
+    package_type: str
+    values: Dict[str, Any]
+    unmapped: Tuple[str, ...]
+
+
+def _compile(mapping: Dict[str, str], fields: Optional[Tuple[str, ...]]) -> KeyTable:
+    to_model = {}
+    to_rest = {}
+    for rest_key, target in mapping.items():
+        field = target
+        if fields is not None and field not in fields:
+            field = MODEL_FIELD_ALIASES.get(target)
+            if field not in fields:
+                continue
+        to_model[rest_key] = field
+        to_rest[field] = rest_key
+        # Exports use the mappings.json names, so accept those too
+        to_rest.setdefault(target, rest_key)
+    unmapped = tuple(f for f in fields if f not in to_rest) if fields is not None else ()
+    return KeyTable(to_model, frozenset(to_model), to_rest, unmapped)
+
+
+class Translator:
+    """Converts Artifactory REST payloads to model input and models back to REST payloads.
+
+    Key tables are compiled once per repo class from mappings.json, so each
+    translation is a single pass over the payload with one table lookup per
+    key. Keys without a mapping are returned in Translation.unmapped.
+    """
+
+    def __init__(self, mappings: Dict[str, Dict[str, str]]):
+        self._tables: Dict[Tuple[str, Optional[str]], KeyTable] = {}
+        for section, mapping in mappings.items():
+            # Package types without a model (remotes, sbt, ...) use the mappings.json names as fields
+            self._tables[(section, None)] = _compile(mapping, None)
+            for package_type, config_cls in REPO_CONFIGS.get(section, {}).items():
+                self._tables[(section, package_type)] = _compile(mapping, tuple(model_fields(config_cls)))
+
+    @classmethod
+    def from_file(cls, path: str = MAPPINGS_PATH) -> "Translator":
+        with open(path) as fp:
+            return cls(json.load(fp))
+
+    def table(self, section: str, package_type: str) -> KeyTable:
+        table = self._tables.get((section, package_type)) or self._tables.get((section, None))
+        if table is None:
+            raise ValueError(f"No mapping for {section} package type {package_type}")
+        return table
+
+    @staticmethod
+    def classify(payload: Dict[str, Any]) -> Tuple[str, str]:
+        """Section and package type of a REST payload from its rclass/packageType."""
+        section = RCLASS_SECTION[payload["rclass"]]
+        package_type = payload["packageType"].lower()
+        if package_type == "terraform" and section == "local_repositories":
+            package_type = f"terraform_{payload.get('terraformType', 'module')}"
+        return section, package_type
+
+    def rest_to_model(
+        self,
+        payload: Dict[str, Any],
+        section: Optional[str] = None,
+        package_type: Optional[str] = None,
+    ) -> Translation:
+        if section is None or package_type is None:
+            section, package_type = self.classify(payload)
+        to_model, rest_keys, _, _ = self.table(section, package_type)
+        values = {to_model[k]: v for k, v in payload.items() if k in rest_keys}
+        for field, (_, to_model_value) in NESTED_FIELDS.items():
+            if isinstance(values.get(field), dict):
+                values[field] = to_model_value(values[field])
+        unmapped = tuple(payload.keys() - rest_keys - META_KEYS)
+        return Translation(section, package_type, values, unmapped)
+
+    def rest_to_export(self, payload: Dict[str, Any]) -> Translation:
+        """Like rest_to_model, but keyed by the mappings.json names that exports use, in mapping order."""
+        section, package_type = self.classify(payload)
+        to_model, rest_keys, _, _ = self._tables[(section, None)]
+        values = {field: payload[k] for k, field in to_model.items() if k in payload}
+        for field, (_, to_model_value) in NESTED_FIELDS.items():
+            if isinstance(values.get(field), dict):
+                values[field] = to_model_value(values[field])
+        unmapped = tuple(payload.keys() - rest_keys - META_KEYS)
+        return Translation(section, package_type, values, unmapped)
+
+    def model_to_rest(
+        self,
+        repo: Union[BaseModel, Dict[str, Any]],
+        section: str,
+        package_type: str,
+    ) -> Translation:
+        """REST payload of a model, or of an export dict keyed by field names."""
+        table = self.table(section, package_type)
+        to_rest = table.to_rest
+        if isinstance(repo, dict):
+            # Export dicts may carry fields the model of their type lacks (ivy's maven settings, ...)
+            raw_to_rest = self._tables[(section, None)].to_rest
+            values = {}
+            unmapped = []
+            for k, v in repo.items():
+                rest_key = to_rest.get(k) or raw_to_rest.get(k)
+                if rest_key is None:
+                    unmapped.append(k)
+                else:
+                    values[rest_key] = v
+            unmapped = tuple(unmapped)
+        else:
+            values = {to_rest[k]: v for k, v in repo.__dict__.items() if k in to_rest}
+            unmapped = table.unmapped_fields
+        for field, (to_rest_value, _) in NESTED_FIELDS.items():
+            rest_key = to_rest.get(field)
+            if values.get(rest_key) is not None:
+                values[rest_key] = to_rest_value(values[rest_key])
+        values["rclass"] = SECTION_RCLASS[section]
+        if package_type.startswith("terraform_"):
+            values["packageType"] = "terraform"
+            values["terraformType"] = package_type[len("terraform_"):]
+        else:
+            values["packageType"] = package_type
+        return Translation(section, package_type, values, unmapped)
+
+    def rest_batch(self, payloads: Iterable[Dict[str, Any]]) -> Iterator[Translation]:
+        rest_to_model = self.rest_to_model
+        for payload in payloads:
+            yield rest_to_model(payload)
@@ -0,0 +1,311 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from compact import class_defaults, class_field_names
+from key_index import KeyIndex
+from structure import REPO_CONFIGS
+from translator import MODEL_FIELD_ALIASES
+from virtual_graph import types_compatible
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+# repo_layout_ref per package type, as listed under "repo_layout_ref is dictated by repository
+# type" in param-analysis.txt; everything else is simple-default
+LAYOUTS = {
+    "maven": "maven-2-default",
+    "gradle": "gradle-default",
+    "ivy": "ivy-default",
+    "sbt": "sbt-default",
+    "go": "go-default",
+    "nuget": "nuget-default",
+    "composer": "composer-default",
+    "terraform_module": "terraform-module-default",
+    "npm": "npm-default",
+    "vcs": "vcs-default",
+    # Artifactory's own defaults for types the export has no repos of
+    "terraform_provider": "terraform-provider-default",
+    "bower": "bower-default",
+}
+DEFAULT_LAYOUT = "simple-default"
+
+_MAVEN_FAMILY = frozenset({"maven", "gradle", "ivy", "sbt"})
+
+
+class FieldRule(NamedTuple):
+    # Fields only valid for the given package types
+    fields: FrozenSet[str]
+    package_types: FrozenSet[str]
+
+
+class FieldGroup(NamedTuple):
+    # Fields that are set all together or not at all, in these sections and types
+    fields: FrozenSet[str]
+    sections: FrozenSet[str]
+    package_types: FrozenSet[str]
+
+
+TYPE_SPECIFIC_FIELDS = (
+    FieldRule(frozenset({"block_pushing_schema1", "max_unique_tags", "docker_tag_retention"}),
+              frozenset({"docker", "helmoci"})),
+    FieldRule(frozenset({"checksum_policy_type", "handle_releases", "handle_snapshots", "snapshot_version_behavior",
+                         "suppress_pom_consistency_checks"}), _MAVEN_FAMILY),
+    FieldRule(frozenset({"max_unique_snapshots"}), _MAVEN_FAMILY | {"nuget"}),
+    FieldRule(frozenset({"force_nuget_authentication"}), frozenset({"nuget"})),
+    FieldRule(frozenset({"trivial_layout", "ddeb_supported", "optional_index_compression_formats"}),
+              frozenset({"debian"})),
+    FieldRule(frozenset({"calculate_yum_metadata", "enable_file_lists_indexing", "yum_root_depth",
+                         "yum_group_file_names"}), frozenset({"rpm"})),
+    FieldRule(frozenset({"force_non_duplicate_chart", "force_metadata_name_version"}), frozenset({"helm"})),
+    FieldRule(frozenset({"external_dependencies_enabled", "external_dependencies_patterns"}), frozenset({"go", "npm"})),
+)
+
+# The groups were observed on local repositories; remotes and virtuals carry subsets
+FIELD_GROUPS = (
+    FieldGroup(frozenset({"handle_releases", "handle_snapshots", "max_unique_snapshots"}),
+               frozenset({"local_repositories"}), frozenset({"maven", "gradle"})),
+    FieldGroup(frozenset({"force_nuget_authentication", "max_unique_snapshots"}),
+               frozenset({"local_repositories"}), frozenset({"nuget"})),
+    FieldGroup(frozenset({"block_pushing_schema1", "max_unique_tags", "docker_tag_retention"}),
+               frozenset({"local_repositories"}), frozenset({"docker", "helmoci"})),
+)
+
+
+class Violation(NamedTuple):
+    rule: str
+    # "error" breaks an apply or a lookup; "warning" departs from the usual configuration
+    severity: str
+    section: str
+    package_type: str
+    key: str
+    field: Optional[str]
+    message: str
+
+
+class _TypeRules(NamedTuple):
+    # Rules of one (section, package type), compiled once
+    layouts: FrozenSet[str]
+    foreign: Dict[str, FrozenSet[str]]
+    groups: Tuple[FrozenSet[str], ...]
+
+
+def compile_rules(section: str, package_type: str) -> _TypeRules:
+    """Rules for one section and package type, narrowed by the fields its model declares.
+
+    A type-specific field the model declares anyway is allowed, and a group
+    only asks for the fields the model has, so the rules never contradict
+    structure.py.
+    """
+    config_cls = REPO_CONFIGS.get(section, {}).get(package_type)
+    declared = frozenset(class_field_names(config_cls)) if config_cls is not None else None
+    layouts = {LAYOUTS.get(package_type, DEFAULT_LAYOUT)}
+    if config_cls is not None and "repo_layout_ref" in declared:
+        layouts.add(class_defaults(config_cls)["repo_layout_ref"])
+    foreign: Dict[str, FrozenSet[str]] = {}
+    for rule in TYPE_SPECIFIC_FIELDS:
+        if package_type in rule.package_types:
+            continue
+        for field in rule.fields:
+            if declared is None or field not in declared:
+                foreign[field] = rule.package_types
+    groups = []
+    for group in FIELD_GROUPS:
+        if section in group.sections and package_type in group.package_types:
+            fields = group.fields if declared is None else group.fields & declared
+            if len(fields) > 1:
+                groups.append(fields)
+    return _TypeRules(frozenset(layouts), foreign, tuple(groups))
+
+
+class _Virtual(NamedTuple):
+    package_type: str
+    key: str
+    members: Tuple[str, ...]
+    default_deployment_repo: Optional[str]
+
+
+def check_repo(section: str, package_type: str, key: str, config: Dict[str, Any],
+               rules: _TypeRules) -> List[Violation]:
+    """Violations of the rules that need nothing but the repo itself."""
+    found = []
+    layout = config.get("repo_layout_ref")
+    if layout is not None and layout not in rules.layouts:
+        expected = " or ".join(sorted(rules.layouts))
+        found.append(Violation("layout", "warning", section, package_type, key, "repo_layout_ref",
+                               f"{layout} for a {package_type} repository, expected {expected}"))
+    present = {MODEL_FIELD_ALIASES.get(field, field) for field in config}
+    for field in present.intersection(rules.foreign):
+        allowed = ", ".join(sorted(rules.foreign[field]))
+        found.append(Violation("type_field", "error", section, package_type, key, field,
+                               f"{field} only applies to {allowed} repositories"))
+    for group in rules.groups:
+        have = group & present
+        if have and have != group:
+            missing = ", ".join(sorted(group - have))
+            found.append(Violation("field_group", "error", section, package_type, key, missing,
+                                   f"{', '.join(sorted(have))} set without {missing}"))
+    return found
+
+
+def _check_shard(items: List[Tuple[str, str, str, Dict[str, Any]]]) -> List[Violation]:
+    # Worker entry point: per-repo rules over one shard of package types
+    compiled: Dict[Tuple[str, str], _TypeRules] = {}
+    found = []
+    for section, package_type, key, config in items:
+        rules = compiled.get((section, package_type))
+        if rules is None:
+            rules = compiled[(section, package_type)] = compile_rules(section, package_type)
+        found.extend(check_repo(section, package_type, key, config, rules))
+    return found
+
+
+class Validator:
+    """Checks a whole inventory in one pass over its repositories.
+
+    Per-repo rules run as each repo is added, against rules compiled once per
+    (section, package type). Cross-repo rules only need the KeyIndex built
+    along the way: the references of each virtual are recorded and resolved
+    by dict lookups in finish(), so the total cost is linear in repos plus
+    virtual members. With `shard=True`, per-repo rules are deferred and
+    grouped by package type so finish() can spread them over processes.
+    """
+
+    def __init__(self, shard: bool = False):
+        # Resolves members case-sensitively and finds case variants of a key;
+        # a missing member is reported with the closest existing keys
+        self.keys = KeyIndex(max_distance=1)
+        self._virtuals: List[_Virtual] = []
+        self._compiled: Dict[Tuple[str, str], _TypeRules] = {}
+        self._shards: Optional[Dict[str, List[Tuple[str, str, str, Dict[str, Any]]]]] = {} if shard else None
+        self.violations: List[Violation] = []
+        self.repos = 0
+
+    def known(self, section: str, package_type: str, key: str) -> None:
+        """Register a repo that already exists, e.g. in Artifactory, without checking it."""
+        if key not in self.keys:
+            self.keys.add(key, section, package_type)
+
+    def add(self, section: str, package_type: str, config: Dict[str, Any]) -> None:
+        """Add one repo as an export dict (mappings.json or model field names)."""
+        self.repos += 1
+        key = config["key"]
+        seen = self.keys.get(key)
+        if seen is not None:
+            self.violations.append(Violation("duplicate_key", "error", section, package_type, key, "key",
+                                             f"key already used by a {seen[1]} repository in {seen[0]}"))
+        else:
+            others = self.keys.case_collisions(key)
+            self.keys.add(key, section, package_type)
+            if others:
+                self.violations.append(Violation("case_collision", "warning", section, package_type, key, "key",
+                                                 f"differs only in case from {others[0]}"))
+        if section == "virtual_repositories":
+            self._virtuals.append(_Virtual(package_type, key, tuple(config.get("repositories") or ()),
+                                           config.get("default_deployment_repo")))
+        if self._shards is not None:
+            self._shards.setdefault(package_type, []).append((section, package_type, key, config))
+            return
+        rules = self._compiled.get((section, package_type))
+        if rules is None:
+            rules = self._compiled[(section, package_type)] = compile_rules(section, package_type)
+        self.violations.extend(check_repo(section, package_type, key, config, rules))
+
+    def _check_virtual(self, virtual: _Virtual) -> List[Violation]:
+        found = []
+        section = "virtual_repositories"
+        for member in virtual.members:
+            location = self.keys.get(member)
+            if location is None:
+                similar = self.keys.similar(member, limit=1)
+                hint = f" (did you mean {similar[0][0]}?)" if similar else ""
+                found.append(Violation("missing_member", "error", section, virtual.package_type, virtual.key,
+                                       "repositories", f"member {member} does not exist{hint}"))
+            elif not types_compatible(virtual.package_type, location[1]):
+                found.append(Violation("member_type", "error", section, virtual.package_type, virtual.key,
+                                       "repositories", f"member {member} is a {location[1]} repository"))
+        target = virtual.default_deployment_repo
+        if target:
+            location = self.keys.get(target)
+            if target not in virtual.members:
+                found.append(Violation("default_deployment_repo", "error", section, virtual.package_type,
+                                       virtual.key, "default_deployment_repo", f"{target} is not a member"))
+            elif location is not None and location[0] != "local_repositories":
+                found.append(Violation("default_deployment_repo", "error", section, virtual.package_type,
+                                       virtual.key, "default_deployment_repo",
+                                       f"{target} is a {location[0].split('_')[0]} repository, not a local one"))
+        return found
+
+    def finish(self, processes: int = 1) -> List[Violation]:
+        """Resolve the cross-repo rules and return every violation, sorted.
+
+        Sharded per-repo rules run in `processes` worker processes, each
+        taking whole package types, largest first onto the lightest worker.
+        """
+        if self._shards:
+            bins: List[List[Tuple[str, str, str, Dict[str, Any]]]] = [[] for _ in range(max(processes, 1))]
+            for items in sorted(self._shards.values(), key=len, reverse=True):
+                min(bins, key=len).extend(items)
+            bins = [items for items in bins if items]
+            if len(bins) > 1:
+                with ProcessPoolExecutor(max_workers=len(bins)) as pool:
+                    for found in pool.map(_check_shard, bins):
+                        self.violations.extend(found)
+            else:
+                self.violations.extend(_check_shard(bins[0]))
+            self._shards = {}
+        for virtual in self._virtuals:
+            self.violations.extend(self._check_virtual(virtual))
+        self._virtuals = []
+        self.violations.sort(key=lambda v: (v.section, v.package_type, v.key, v.rule, v.field or ""))
+        return self.violations
+
+
+def validate_entries(entries: Iterable[Tuple[str, str, Dict[str, Any]]], processes: int = 1) -> List[Violation]:
+    """Validate (section, package_type, config) triples, sharding per-repo rules when processes > 1."""
+    validator = Validator(shard=processes > 1)
+    for section, package_type, config in entries:
+        validator.add(section, package_type, config)
+    return validator.finish(processes)
+
+
+def validate_export(fp: IO[str], processes: int = 1) -> List[Violation]:
+    """Validate an export, streamed, without building models, so unmodelled package types are included."""
+    from loader import SECTIONS, iter_repositories
+
+    entries = iter_repositories(fp, sections=SECTIONS, typed=False)
+    return validate_entries(((e.section, e.package_type, e.config) for e in entries), processes)
+
+
+def validate_structure(structure: "RepositoryStructure") -> List[Violation]:
+    """Validate a structure; its models carry every declared field, so the field rules always hold."""
+    def entries():
+        for section, config_classes in REPO_CONFIGS.items():
+            container = getattr(structure, section)
+            for package_type in config_classes:
+                for repo in getattr(container, package_type).values():
+                    dump = repo.model_dump if hasattr(repo, "model_dump") else repo.dict
+                    yield section, package_type, dump()
+
+    return validate_entries(entries())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate an export against the param-analysis rules")
+    parser.add_argument("export", help="repository export, e.g. repos_data_full_nonprod.json")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes for the per-repo rules")
+    parser.add_argument("--json", action="store_true", help="print violations as JSON lines")
+    args = parser.parse_args()
+
+    with open(args.export) as fp:
+        violations = validate_export(fp, processes=args.processes)
+    for violation in violations:
+        if args.json:
+            print(json.dumps(violation._asdict()))
+        else:
+            print(f"{violation.severity:<7} {violation.rule:<23} {violation.key}: {violation.message}")
+    errors = sum(1 for v in violations if v.severity == "error")
+    if not args.json:
+        print(f"{errors} errors, {len(violations) - errors} warnings")
+    raise SystemExit(1 if errors else 0)
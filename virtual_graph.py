@@ -0,0 +1,254 @@
+from collections import deque
+from typing import IO, TYPE_CHECKING, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from loader import SECTIONS, iter_repositories
+from structure import REPO_CONFIGS
+
+if TYPE_CHECKING:
+    from structure import RepositoryStructure
+
+# Package types that may be aggregated by a virtual of another type in the same group
+COMPATIBLE_TYPES = (
+    frozenset({"maven", "gradle", "ivy", "sbt"}),
+    frozenset({"terraform", "terraform_module", "terraform_provider"}),
+)
+_TYPE_GROUP = {package_type: group for group in COMPATIBLE_TYPES for package_type in group}
+
+
+def types_compatible(virtual_type: str, member_type: str) -> bool:
+    return virtual_type == member_type or member_type in _TYPE_GROUP.get(virtual_type, ())
+
+
+class TypeMismatch(NamedTuple):
+    virtual: str
+    member: str
+    virtual_type: str
+    member_type: str
+
+
+class VirtualIssues(NamedTuple):
+    key: str
+    missing_members: Tuple[str, ...]
+    type_mismatches: Tuple[TypeMismatch, ...]
+    in_cycle: bool
+
+
+class VirtualGraphIndex:
+    """Forward and reverse membership index over every virtual repository.
+
+    Built once from a RepositoryStructure or an export. Editing one virtual
+    with set_virtual only touches that virtual's edges, and only the cached
+    transitive closures of the virtuals that can reach it are dropped, so
+    onboarding checks cost O(affected) rather than a scan of the inventory.
+    """
+
+    def __init__(self):
+        # repo key -> (section, package_type), for every local/remote/virtual repo
+        self.repo_types: Dict[str, Tuple[str, str]] = {}
+        # virtual key -> members in resolution order
+        self.members: Dict[str, Tuple[str, ...]] = {}
+        # repo key -> virtuals listing it as a direct member
+        self.included_by: Dict[str, Set[str]] = {}
+        self._closures: Dict[str, FrozenSet[str]] = {}
+
+    @classmethod
+    def from_structure(cls, structure: "RepositoryStructure") -> "VirtualGraphIndex":
+        index = cls()
+        for section, config_classes in REPO_CONFIGS.items():
+            container = getattr(structure, section)
+            for package_type in config_classes:
+                for repo in getattr(container, package_type).values():
+                    if section == "virtual_repositories":
+                        index.set_virtual(package_type, repo.key, repo.repositories)
+                    else:
+                        index.add_repo(section, package_type, repo.key)
+        return index
+
+    @classmethod
+    def from_export(cls, fp: IO[str]) -> "VirtualGraphIndex":
+        """Index an export without building models, so unmodelled package types are included."""
+        index = cls()
+        for entry in iter_repositories(fp, sections=SECTIONS, typed=False):
+            if entry.section == "virtual_repositories":
+                index.set_virtual(entry.package_type, entry.config["key"], entry.config.get("repositories") or [])
+            else:
+                index.add_repo(entry.section, entry.package_type, entry.config["key"])
+        return index
+
+    def add_repo(self, section: str, package_type: str, key: str) -> None:
+        self.repo_types[key] = (section, package_type)
+
+    def set_virtual(self, package_type: str, key: str, members: Iterable[str]) -> None:
+        """Add or replace one virtual and its member list."""
+        members = tuple(members)
+        for old in self.members.get(key, ()):
+            parents = self.included_by.get(old)
+            if parents is not None:
+                parents.discard(key)
+                if not parents:
+                    del self.included_by[old]
+        self.repo_types[key] = ("virtual_repositories", package_type)
+        self.members[key] = members
+        for member in members:
+            self.included_by.setdefault(member, set()).add(key)
+        self._invalidate(key)
+
+    def remove_virtual(self, key: str) -> None:
+        for old in self.members.pop(key, ()):
+            parents = self.included_by.get(old)
+            if parents is not None:
+                parents.discard(key)
+                if not parents:
+                    del self.included_by[old]
+        self.repo_types.pop(key, None)
+        self._invalidate(key)
+
+    def _invalidate(self, key: str) -> None:
+        # Drop the cached closures of `key` and of every virtual that reaches it
+        queue = deque([key])
+        seen = {key}
+        while queue:
+            node = queue.popleft()
+            self._closures.pop(node, None)
+            for parent in self.included_by.get(node, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    queue.append(parent)
+
+    def virtuals_including(self, key: str, transitive: bool = False) -> Set[str]:
+        """Virtuals that list `key` directly or, with transitive=True, resolve through it."""
+        direct = self.included_by.get(key, set())
+        if not transitive:
+            return set(direct)
+        found: Set[str] = set()
+        queue = deque(direct)
+        while queue:
+            node = queue.popleft()
+            if node in found:
+                continue
+            found.add(node)
+            queue.extend(self.included_by.get(node, ()))
+        return found
+
+    def closure(self, key: str) -> FrozenSet[str]:
+        """Every repo `key` resolves through, nested virtuals included."""
+        cached = self._closures.get(key)
+        if cached is not None:
+            return cached
+        reached: Set[str] = set()
+        stack = list(self.members.get(key, ()))
+        while stack:
+            node = stack.pop()
+            if node in reached:
+                continue
+            reached.add(node)
+            nested = self._closures.get(node)
+            if nested is not None and node != key:
+                reached.update(nested)
+            else:
+                stack.extend(self.members.get(node, ()))
+        result = frozenset(reached)
+        self._closures[key] = result
+        return result
+
+    def resolution_order(self, key: str) -> List[str]:
+        """Non-virtual repos in the order a lookup through `key` tries them, depth first."""
+        order: List[str] = []
+        seen: Set[str] = {key}
+
+        def walk(virtual: str) -> None:
+            for member in self.members.get(virtual, ()):
+                if member in seen:
+                    continue
+                seen.add(member)
+                if member in self.members:
+                    walk(member)
+                else:
+                    order.append(member)
+
+        walk(key)
+        return order
+
+    def in_cycle(self, key: str) -> bool:
+        return key in self.closure(key)
+
+    def cycles(self) -> List[List[str]]:
+        """Strongly connected groups of virtuals that include each other (Tarjan)."""
+        index_of: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        groups: List[List[str]] = []
+        counter = 0
+        for root in self.members:
+            if root in index_of:
+                continue
+            work = [(root, iter(self.members[root]))]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in self.members:
+                        continue
+                    if child not in index_of:
+                        index_of[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.members[child])))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index_of[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1 or node in self.members[node]:
+                        groups.append(sorted(group))
+        return groups
+
+    def type_mismatches(self, key: str) -> List[TypeMismatch]:
+        virtual_type = self.repo_types[key][1]
+        mismatches = []
+        for member in self.members.get(key, ()):
+            member_type = self.repo_types.get(member)
+            if member_type is not None and not types_compatible(virtual_type, member_type[1]):
+                mismatches.append(TypeMismatch(key, member, virtual_type, member_type[1]))
+        return mismatches
+
+    def missing_members(self, key: str) -> List[str]:
+        return [member for member in self.members.get(key, ()) if member not in self.repo_types]
+
+    def check_virtual(self, key: str) -> VirtualIssues:
+        """Issues of one virtual, in time proportional to its members and closure."""
+        return VirtualIssues(
+            key,
+            tuple(self.missing_members(key)),
+            tuple(self.type_mismatches(key)),
+            self.in_cycle(key),
+        )
+
+    def check_all(self) -> List[VirtualIssues]:
+        return [
+            issues for issues in (self.check_virtual(key) for key in self.members)
+            if issues.missing_members or issues.type_mismatches or issues.in_cycle
+        ]
+
+    def package_type(self, key: str) -> Optional[str]:
+        found = self.repo_types.get(key)
+        return found[1] if found else None